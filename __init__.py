@@ -8,6 +8,8 @@ from typing import Sequence
 import bpy
 
 from . import operators, properties, ui
+from .batch import watch
+from .utils import bounds_cache
 
 bl_info = {
     "name": "Cube Capture",
@@ -20,7 +22,13 @@ bl_info = {
 }
 
 
-_modules: Sequence[object] = (properties, operators.render_views, ui.panel)  # type: ignore[attr-defined]
+_modules: Sequence[object] = (  # type: ignore[attr-defined]
+    bounds_cache,
+    properties,
+    operators.render_views,
+    watch,
+    ui.panel,
+)
 
 
 def _reload_modules() -> None:
@@ -30,6 +38,7 @@ def _reload_modules() -> None:
 
 classes = (
     operators.render_views.CUBECAPTURE_OT_render,
+    operators.render_views.CUBECAPTURE_OT_render_async,
     ui.panel.CUBECAPTURE_PT_panel,
 )
 
@@ -41,9 +50,13 @@ def register() -> None:
     properties.register_properties()
     for cls in classes:
         bpy.utils.register_class(cls)
+    bounds_cache.register_handlers()
+    watch.register_handlers()
 
 
 def unregister() -> None:
+    watch.unregister_handlers()
+    bounds_cache.unregister_handlers()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     properties.unregister_properties()
@@ -0,0 +1,4 @@
+"""Headless batch capture across ``.blend`` files.
+
+Entry point: ``blender -b --python batch/cli.py -- farm jobs.json --workers 8``.
+"""
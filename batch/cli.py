@@ -0,0 +1,138 @@
+"""Command-line entry point for headless Cube Capture runs.
+
+Run inside Blender so worker processes can be launched with the same binary::
+
+    blender -b --python batch/cli.py -- farm jobs.json --workers 8 --report report.json
+
+The ``worker`` command is what the farm runs in each child process; it expects the job's
+``.blend`` file to be loaded already.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+
+def _load_package():
+    """Import the add-on package, also when this file is run as a plain script."""
+
+    if __package__:
+        return importlib.import_module(__package__.rpartition(".")[0])
+    addon_dir = Path(__file__).resolve().parents[1]
+    if str(addon_dir.parent) not in sys.path:
+        sys.path.insert(0, str(addon_dir.parent))
+    return importlib.import_module(addon_dir.name)
+
+
+def _script_args(argv: Sequence[str]) -> List[str]:
+    return list(argv[argv.index("--") + 1 :]) if "--" in argv else []
+
+
+def _ensure_registered(package) -> None:
+    import bpy
+
+    if not hasattr(bpy.types.Scene, package.properties.PROPERTY_NAME):
+        package.register()
+
+
+def _command_worker(package, args: argparse.Namespace) -> int:
+    import bpy
+
+    _ensure_registered(package)
+    jobs = importlib.import_module(f"{package.__name__}.batch.jobs")
+    worker = importlib.import_module(f"{package.__name__}.batch.worker")
+
+    with open(args.job, "r", encoding="utf-8") as handle:
+        job = jobs.CaptureJob.from_dict(json.load(handle))
+    result = worker.run_job(job)
+    if args.publish:
+        watch = importlib.import_module(f"{package.__name__}.batch.watch")
+        staging_dir = bpy.path.abspath(job.settings["output_directory"])
+        # A failed run leaves the previous outputs in place rather than a partial set.
+        if result["status"] == "ok":
+            result["published"] = watch.publish_outputs(staging_dir, args.publish)
+        else:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    with open(args.result, "w", encoding="utf-8") as handle:
+        json.dump(result, handle, indent=2)
+    return 0 if result["status"] == "ok" else 1
+
+
+def _command_farm(package, args: argparse.Namespace) -> int:
+    import bpy
+
+    jobs = importlib.import_module(f"{package.__name__}.batch.jobs")
+    farm = importlib.import_module(f"{package.__name__}.batch.farm")
+
+    job_list = jobs.split_frame_jobs(jobs.load_job_spec(args.spec), args.frame_chunks)
+    threads = args.threads if args.threads is not None else farm.default_threads_per_worker(args.workers)
+    config = farm.FarmConfig(
+        blender_binary=args.blender or bpy.app.binary_path,
+        workers=args.workers,
+        max_retries=args.retries,
+        timeout=args.timeout,
+        threads_per_worker=threads,
+        extra_args=("--factory-startup",) if args.factory_startup else (),
+    )
+
+    def on_outcome(outcome) -> None:
+        print(f"[{outcome.status:>7}] {outcome.job_id} ({outcome.attempts} attempt(s), {outcome.duration:.1f}s)")
+
+    print(f"Cube Capture farm: {len(job_list)} job(s) on {config.workers} worker(s), {threads} thread(s) each")
+    start = time.perf_counter()
+    outcomes = farm.run_farm(job_list, config, work_dir=args.work_dir, on_outcome=on_outcome)
+    summary = farm.summarize(outcomes, time.perf_counter() - start, config)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2)
+    print(
+        f"Finished {summary['jobs']} job(s) in {summary['wall_time']:.1f}s: {summary['status_counts']}, "
+        f"{summary['retries']} retr(y/ies), {summary['outputs']} output(s)"
+    )
+    return 0 if all(outcome.status == "ok" for outcome in outcomes) else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cube_capture", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    farm = commands.add_parser("farm", help="Run a job spec on a pool of background Blender workers")
+    farm.add_argument("spec", help="Path to the JSON job spec")
+    farm.add_argument("--workers", "-j", type=int, default=1, help="Number of concurrent Blender processes")
+    farm.add_argument("--retries", type=int, default=2, help="Retries for a job whose worker crashed")
+    farm.add_argument("--timeout", type=float, default=None, help="Seconds before a worker is killed")
+    farm.add_argument("--threads", type=int, default=None, help="Render threads per worker (default: cores/workers)")
+    farm.add_argument("--blender", default=None, help="Blender binary for workers (default: this Blender)")
+    farm.add_argument("--work-dir", default=None, help="Directory for job files, results and worker logs")
+    farm.add_argument("--report", default=None, help="Write the JSON summary report to this path")
+    farm.add_argument(
+        "--frame-chunks", type=int, default=1, help="Split each job's frame range across this many workers"
+    )
+    farm.add_argument("--factory-startup", action="store_true", help="Start workers without user preferences")
+    farm.set_defaults(handler=_command_farm)
+
+    worker = commands.add_parser("worker", help="Capture one job in the currently loaded file")
+    worker.add_argument("--job", required=True, help="Path to the job JSON written by the farm")
+    worker.add_argument("--result", required=True, help="Path for the result JSON")
+    worker.add_argument(
+        "--publish", default=None, help="Move the job's outputs into this directory once it succeeded"
+    )
+    worker.set_defaults(handler=_command_worker)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(_script_args(sys.argv if argv is None else argv))
+    return args.handler(_load_package(), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
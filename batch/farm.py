@@ -0,0 +1,151 @@
+"""Shard capture jobs across a pool of background Blender worker processes."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from .jobs import CaptureJob
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+
+
+@dataclass
+class JobOutcome:
+    """Final state of one job after all attempts."""
+
+    job_id: str
+    file: str
+    status: str = "pending"
+    attempts: int = 0
+    duration: float = 0.0
+    outputs: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+
+
+@dataclass(frozen=True)
+class FarmConfig:
+    blender_binary: str
+    workers: int = 1
+    max_retries: int = 2
+    timeout: Optional[float] = None
+    threads_per_worker: int = 0
+    extra_args: Sequence[str] = ()
+
+
+def default_threads_per_worker(workers: int) -> int:
+    """Split the machine's cores between workers so renders do not oversubscribe the CPU."""
+
+    return max((os.cpu_count() or 1) // max(workers, 1), 1)
+
+
+def worker_command(config: FarmConfig, job_path: str, result_path: str, blend_file: str) -> List[str]:
+    command = [config.blender_binary, "-b", blend_file]
+    if config.threads_per_worker > 0:
+        command += ["--threads", str(config.threads_per_worker)]
+    command += [*config.extra_args, "--python-exit-code", "1", "--python", CLI_PATH, "--"]
+    command += ["worker", "--job", job_path, "--result", result_path]
+    return command
+
+
+def _run_attempt(config: FarmConfig, job: CaptureJob, work_dir: str, attempt: int) -> Dict[str, Any]:
+    """Run one worker process; crashes and timeouts come back as ``{"status": "crashed"}``."""
+
+    job_path = os.path.join(work_dir, f"{job.job_id}.job.json")
+    result_path = os.path.join(work_dir, f"{job.job_id}.{attempt}.result.json")
+    with open(job_path, "w", encoding="utf-8") as handle:
+        json.dump(job.to_dict(), handle)
+
+    log_path = os.path.join(work_dir, f"{job.job_id}.{attempt}.log")
+    with open(log_path, "w", encoding="utf-8") as log:
+        try:
+            process = subprocess.run(
+                worker_command(config, job_path, result_path, job.file),
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                timeout=config.timeout,
+                check=False,
+            )
+            returncode = process.returncode
+        except subprocess.TimeoutExpired:
+            return {"status": "crashed", "error": f"timed out after {config.timeout}s", "log": log_path}
+
+    if os.path.exists(result_path):
+        with open(result_path, "r", encoding="utf-8") as handle:
+            result = json.load(handle)
+        result["log"] = log_path
+        return result
+    return {"status": "crashed", "error": f"worker exited with code {returncode}", "log": log_path}
+
+
+def _run_job(config: FarmConfig, job: CaptureJob, work_dir: str) -> JobOutcome:
+    outcome = JobOutcome(job_id=job.job_id, file=job.file)
+    start = time.perf_counter()
+    # Only crashes are retried; a worker that reports an error would fail the same way again.
+    while outcome.attempts <= config.max_retries:
+        outcome.attempts += 1
+        result = _run_attempt(config, job, work_dir, outcome.attempts)
+        outcome.result = result
+        if result.get("status") != "crashed":
+            break
+        outcome.errors.append(result.get("error", "worker crashed"))
+    outcome.duration = time.perf_counter() - start
+
+    result = outcome.result or {}
+    outcome.status = result.get("status", "crashed")
+    for record in result.get("collections", []):
+        outcome.outputs.extend(record.get("outputs", []))
+        outcome.errors.extend(record.get("errors", []))
+    if result.get("error") and outcome.status != "crashed":
+        outcome.errors.append(result["error"])
+    return outcome
+
+
+def run_farm(
+    jobs: Sequence[CaptureJob],
+    config: FarmConfig,
+    work_dir: Optional[str] = None,
+    on_outcome=None,
+) -> List[JobOutcome]:
+    """Run ``jobs`` on ``config.workers`` concurrent Blender processes and return their outcomes.
+
+    Outcomes are returned, and passed to ``on_outcome``, in completion order.
+    """
+
+    work_dir = work_dir or tempfile.mkdtemp(prefix="cube_capture_farm_")
+    os.makedirs(work_dir, exist_ok=True)
+    outcomes: List[JobOutcome] = []
+    with ThreadPoolExecutor(max_workers=max(config.workers, 1)) as pool:
+        futures = [pool.submit(_run_job, config, job, work_dir) for job in jobs]
+        for future in as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+            if on_outcome is not None:
+                on_outcome(outcome)
+    return outcomes
+
+
+def summarize(outcomes: Sequence[JobOutcome], wall_time: float, config: FarmConfig) -> Dict[str, Any]:
+    counts: Dict[str, int] = {}
+    for outcome in outcomes:
+        counts[outcome.status] = counts.get(outcome.status, 0) + 1
+    job_time = sum(outcome.duration for outcome in outcomes)
+    return {
+        "workers": config.workers,
+        "threads_per_worker": config.threads_per_worker,
+        "jobs": len(outcomes),
+        "status_counts": counts,
+        "retries": sum(max(outcome.attempts - 1, 0) for outcome in outcomes),
+        "outputs": sum(len(outcome.outputs) for outcome in outcomes),
+        "wall_time": wall_time,
+        "job_time": job_time,
+        "parallel_efficiency": job_time / (wall_time * max(config.workers, 1)) if wall_time > 0 else 0.0,
+        "results": [asdict(outcome) for outcome in outcomes],
+    }
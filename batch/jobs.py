@@ -0,0 +1,124 @@
+"""Job spec parsing for headless batch captures."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ..utils.capture import VIEW_ORDER
+
+
+@dataclass(frozen=True)
+class CaptureJob:
+    """One worker invocation: a ``.blend`` file and the collections to capture from it.
+
+    An empty ``collections`` tuple captures the file's active collection. ``settings`` holds
+    ``CubeCaptureSettings`` overrides applied on top of the values saved in the file.
+    ``frame_chunk`` is ``(index, count)``: with a frame range, the worker renders only the
+    ``index``-th of ``count`` contiguous slices of it, framed for the whole range.
+    """
+
+    job_id: str
+    file: str
+    collections: Tuple[str, ...] = ()
+    views: Tuple[str, ...] = VIEW_ORDER
+    settings: Dict[str, Any] = field(default_factory=dict)
+    frame_chunk: Tuple[int, int] = (0, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["collections"] = list(self.collections)
+        data["views"] = list(self.views)
+        data["frame_chunk"] = list(self.frame_chunk)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CaptureJob":
+        return cls(
+            job_id=data["job_id"],
+            file=data["file"],
+            collections=tuple(data.get("collections", ())),
+            views=tuple(data.get("views", VIEW_ORDER)),
+            settings=dict(data.get("settings", {})),
+            frame_chunk=tuple(data.get("frame_chunk", (0, 1))),
+        )
+
+
+def _validate_views(views: Tuple[str, ...], source: str) -> Tuple[str, ...]:
+    unknown = [view for view in views if view not in VIEW_ORDER]
+    if unknown:
+        raise ValueError(f"{source}: unsupported views {', '.join(unknown)}")
+    return views
+
+
+def frame_chunk(frames: Sequence[int], index: int, count: int) -> Tuple[int, ...]:
+    """Return the ``index``-th of ``count`` contiguous, near-equal slices of ``frames``."""
+
+    total = len(frames)
+    return tuple(frames[total * index // count : total * (index + 1) // count])
+
+
+def split_frame_jobs(jobs: Sequence[CaptureJob], chunks: int) -> List[CaptureJob]:
+    """Split every job that is not split yet into ``chunks`` jobs rendering part of its frame range.
+
+    Jobs without a frame range get empty chunks after the first, which finish immediately.
+    """
+
+    if chunks <= 1:
+        return list(jobs)
+    split: List[CaptureJob] = []
+    for job in jobs:
+        if job.frame_chunk[1] > 1:
+            split.append(job)
+            continue
+        split.extend(
+            replace(job, job_id=f"{job.job_id}_f{index:03d}", frame_chunk=(index, chunks)) for index in range(chunks)
+        )
+    return split
+
+
+def load_job_spec(path: str) -> List[CaptureJob]:
+    """Load a job spec file.
+
+    The spec is JSON of the form::
+
+        {
+          "defaults": {"views": ["FRONT", "TOP"], "settings": {"resolution_x": 1024}},
+          "jobs": [
+            {"file": "assets/chair.blend", "collections": ["Chair"]},
+            {"file": "assets/table.blend", "settings": {"padding_ratio": 0.1}},
+            {"file": "assets/walk.blend", "settings": {"use_frame_range": true}, "frame_chunks": 4}
+          ]
+        }
+
+    Relative ``file`` paths are resolved against the spec's directory, and per-job ``settings``
+    are merged over the defaults. ``frame_chunks``, per job or in the defaults, splits a job's
+    frame range across that many workers.
+    """
+
+    with open(path, "r", encoding="utf-8") as handle:
+        spec = json.load(handle)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = spec.get("defaults", {})
+    default_views = tuple(defaults.get("views", VIEW_ORDER))
+    default_settings = dict(defaults.get("settings", {}))
+    default_chunks = int(defaults.get("frame_chunks", 1))
+
+    jobs: List[CaptureJob] = []
+    for index, entry in enumerate(spec.get("jobs", [])):
+        source = f"jobs[{index}]"
+        if "file" not in entry:
+            raise ValueError(f"{source}: missing 'file'")
+        settings = {**default_settings, **entry.get("settings", {})}
+        job = CaptureJob(
+            job_id=entry.get("id", f"{index:05d}_{os.path.splitext(os.path.basename(entry['file']))[0]}"),
+            file=os.path.normpath(os.path.join(base_dir, entry["file"])),
+            collections=tuple(entry.get("collections", ())),
+            views=_validate_views(tuple(entry.get("views", default_views)), source),
+            settings=settings,
+        )
+        jobs.extend(split_frame_jobs([job], int(entry.get("frame_chunks", default_chunks))))
+    return jobs
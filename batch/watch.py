@@ -0,0 +1,224 @@
+"""Recapture the active collection in a background Blender process whenever the file is saved.
+
+Saves are coalesced: each one restarts the ``watch_delay`` timer, and a refresh only starts
+once the saves have settled and no earlier refresh is still running. The refresh is an ordinary
+batch worker run against the saved file, detached from the artist's session, that renders into a
+staging directory next to the outputs and renames the finished files into place, so a reader of
+``output_directory`` never sees a partly written image.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import bpy
+from bpy.app.handlers import persistent
+
+from ..operators.render_views import resolve_view_keys
+from ..properties import PROPERTY_NAME
+from .farm import FarmConfig, default_threads_per_worker, worker_command
+from .jobs import CaptureJob
+
+_POLL_INTERVAL = 1.0
+# Staging directories are created inside the output directory, so renaming out of them is atomic.
+_STAGING_PREFIX = ".cube_capture_staging_"
+
+
+@dataclass
+class WatchStatus:
+    """State of watch mode in this session, shown in the panel."""
+
+    state: str = "IDLE"  # IDLE, WAITING, RUNNING, OK or FAILED
+    message: str = ""
+    last_refresh: float | None = None
+    outputs: int = 0
+
+
+@dataclass
+class _Refresh:
+    process: subprocess.Popen
+    work_dir: str
+    result_path: str
+    log_path: str
+
+
+_STATUS = WatchStatus()
+# (file, views, output directory) of the latest save not yet captured.
+_PENDING: Tuple[str, Tuple[str, ...], str] | None = None
+_RUNNING: _Refresh | None = None
+
+
+def get_watch_status() -> WatchStatus:
+    return _STATUS
+
+
+def publish_outputs(staging_dir: str, target_dir: str) -> List[str]:
+    """Move every file under ``staging_dir`` to the same place under ``target_dir`` and remove it.
+
+    Each file is renamed over its destination, so readers see either the old or the new file.
+    """
+
+    published = []
+    for root, _dirs, files in os.walk(staging_dir):
+        for name in files:
+            source = os.path.join(root, name)
+            destination = os.path.join(target_dir, os.path.relpath(source, staging_dir))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(source, destination)
+            published.append(destination)
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    return published
+
+
+def launch_refresh(filepath: str, views: Tuple[str, ...], output_directory: str) -> _Refresh:
+    """Start a detached background Blender capturing ``filepath``'s active collection."""
+
+    target_dir = os.path.abspath(output_directory)
+    os.makedirs(target_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=_STAGING_PREFIX, dir=target_dir)
+    work_dir = tempfile.mkdtemp(prefix="cube_capture_watch_")
+    job = CaptureJob(
+        job_id="watch",
+        file=filepath,
+        views=views,
+        # Timing logs and manifests would be replaced, not updated, when the staged files are moved.
+        settings={"output_directory": staging_dir, "skip_unchanged": False, "timing_log": False},
+    )
+    job_path = os.path.join(work_dir, "watch.job.json")
+    result_path = os.path.join(work_dir, "watch.result.json")
+    log_path = os.path.join(work_dir, "watch.log")
+    with open(job_path, "w", encoding="utf-8") as handle:
+        json.dump(job.to_dict(), handle)
+
+    # Half the cores, so the artist's session stays responsive while the refresh renders.
+    config = FarmConfig(blender_binary=bpy.app.binary_path, threads_per_worker=default_threads_per_worker(2))
+    command = worker_command(config, job_path, result_path, filepath) + ["--publish", target_dir]
+    if sys.platform == "win32":
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **detach)
+    return _Refresh(process=process, work_dir=work_dir, result_path=result_path, log_path=log_path)
+
+
+def _tag_redraw() -> None:
+    window_manager = bpy.context.window_manager
+    if window_manager is None:
+        return
+    for window in window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+
+
+def _watch_refresh() -> None:
+    # Persistent, so loading another file while a refresh runs does not orphan it in RUNNING.
+    if not bpy.app.timers.is_registered(_poll_refresh):
+        bpy.app.timers.register(_poll_refresh, first_interval=_POLL_INTERVAL, persistent=True)
+
+
+def _launch_pending() -> Optional[float]:
+    global _PENDING, _RUNNING
+
+    if _PENDING is None:
+        return None
+    if _RUNNING is not None:
+        # Captured once the running refresh finishes, from the latest save.
+        _watch_refresh()
+        return _POLL_INTERVAL
+    filepath, views, output_directory = _PENDING
+    _PENDING = None
+    try:
+        _RUNNING = launch_refresh(filepath, views, output_directory)
+    except OSError as error:
+        _STATUS.state = "FAILED"
+        _STATUS.last_refresh = time.time()
+        _STATUS.message = f"Could not start Blender: {error}"
+        _tag_redraw()
+        return None
+    _STATUS.state = "RUNNING"
+    _STATUS.message = ""
+    _watch_refresh()
+    _tag_redraw()
+    return None
+
+
+def _poll_refresh() -> Optional[float]:
+    global _RUNNING
+
+    refresh = _RUNNING
+    if refresh is None:
+        return None
+    returncode = refresh.process.poll()
+    if returncode is None:
+        return _POLL_INTERVAL
+    _RUNNING = None
+
+    result = {"status": "crashed", "error": f"worker exited with code {returncode}"}
+    if os.path.exists(refresh.result_path):
+        with open(refresh.result_path, "r", encoding="utf-8") as handle:
+            result = json.load(handle)
+    _STATUS.last_refresh = time.time()
+    _STATUS.outputs = len(result.get("published", []))
+    if result.get("status") == "ok":
+        _STATUS.state = "OK"
+        _STATUS.message = ""
+        shutil.rmtree(refresh.work_dir, ignore_errors=True)
+    else:
+        errors = [record_error for record in result.get("collections", []) for record_error in record.get("errors", [])]
+        reason = errors[0] if errors else result.get("error") or result.get("status", "failed")
+        _STATUS.state = "FAILED"
+        # The worker log is kept for diagnosis.
+        _STATUS.message = f"{reason.strip().splitlines()[-1]} (log: {refresh.log_path})"
+    _tag_redraw()
+    return None
+
+
+@persistent
+def _on_save_post(*_args) -> None:
+    global _PENDING
+
+    # Workers load the add-on too; only interactive sessions watch.
+    if bpy.app.background or not bpy.data.filepath:
+        return
+    scene = bpy.context.scene
+    settings = getattr(scene, PROPERTY_NAME, None) if scene is not None else None
+    if settings is None or not settings.watch_mode:
+        return
+    views = resolve_view_keys(settings)
+    if not views:
+        return
+    _PENDING = (bpy.data.filepath, views, bpy.path.abspath(settings.output_directory))
+    # Every save restarts the delay, so a burst of saves triggers one refresh.
+    if bpy.app.timers.is_registered(_launch_pending):
+        bpy.app.timers.unregister(_launch_pending)
+    bpy.app.timers.register(_launch_pending, first_interval=settings.watch_delay, persistent=True)
+    if _RUNNING is None:
+        _STATUS.state = "WAITING"
+    _tag_redraw()
+
+
+def register_handlers() -> None:
+    if _on_save_post not in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.append(_on_save_post)
+
+
+def unregister_handlers() -> None:
+    global _PENDING
+
+    if _on_save_post in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.remove(_on_save_post)
+    _PENDING = None
+    # A running refresh is detached and still publishes its outputs; only stop watching it.
+    for timer in (_launch_pending, _poll_refresh):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
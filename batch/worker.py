@@ -0,0 +1,112 @@
+"""Capture jobs inside a background Blender process that has the job's file loaded."""
+
+from __future__ import annotations
+
+import time
+import traceback
+from dataclasses import replace
+from typing import Any, Dict, List
+
+import bpy
+
+from ..properties import PROPERTY_NAME, apply_settings_overrides
+from ..utils.capture import CaptureOptions, CaptureSession
+from .jobs import CaptureJob, frame_chunk
+
+
+def _capture_collection(
+    collection: bpy.types.Collection,
+    options: CaptureOptions,
+    views,
+) -> Dict[str, Any]:
+    scene = bpy.context.scene
+    view_layer = bpy.context.view_layer
+    session = CaptureSession(scene, view_layer, collection, options)
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    if options.batch_children:
+        if not session.compute_targets(depsgraph):
+            return {"collection": collection.name, "status": "skipped", "reason": "no child with renderable geometry"}
+    elif session.compute_bounds(depsgraph) is None:
+        return {"collection": collection.name, "status": "skipped", "reason": "no renderable geometry"}
+    if options.skip_unchanged and not options.batch_children:
+        session.load_manifest(depsgraph, views)
+
+    try:
+        session.begin()
+        if not session.render_to_files(views):
+            return {"collection": collection.name, "status": "cancelled", "outputs": session.output_filepaths}
+    finally:
+        session.end()
+
+    cubemap_filepaths = session.write_cubemap()
+    pyramid_filepaths = session.write_pyramid()
+    index_filepath = session.write_index(views)
+    session.write_profile(views)
+    status = "failed" if session.errors else "ok"
+    return {
+        "collection": collection.name,
+        "status": status,
+        "outputs": (
+            session.output_filepaths
+            + cubemap_filepaths
+            + pyramid_filepaths
+            + ([index_filepath] if index_filepath else [])
+        ),
+        "passes": session.pass_filepaths,
+        "unchanged": session.skipped_views,
+        "warnings": session.warnings,
+        "errors": session.errors,
+        "timings": {name: round(seconds, 6) for name, seconds, _count in session.profile.breakdown()},
+    }
+
+
+def run_job(job: CaptureJob) -> Dict[str, Any]:
+    """Capture every collection of ``job`` from the currently loaded file and return a result record."""
+
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"job_id": job.job_id, "file": job.file, "collections": []}
+    try:
+        scene = bpy.context.scene
+        settings = getattr(scene, PROPERTY_NAME)
+        apply_settings_overrides(settings, job.settings)
+        base_options = CaptureOptions.from_settings(settings)
+        index, count = job.frame_chunk
+        if count > 1 and (base_options.frames or index > 0):
+            # Every chunk frames the whole range, so the slices line up as one sequence.
+            base_options = replace(
+                base_options,
+                frames=frame_chunk(base_options.frames, index, count),
+                framing_frames=base_options.frames,
+            )
+            if not base_options.frames:
+                # Nothing left for this chunk: a still job, or more chunks than frames.
+                result["status"] = "ok"
+                result["duration"] = time.perf_counter() - start
+                return result
+
+        if job.collections:
+            names = list(job.collections)
+        else:
+            names = [bpy.context.view_layer.active_layer_collection.collection.name]
+
+        records: List[Dict[str, Any]] = []
+        for name in names:
+            collection = bpy.data.collections.get(name)
+            if collection is None and name == scene.collection.name:
+                collection = scene.collection
+            if collection is None:
+                records.append({"collection": name, "status": "failed", "errors": ["collection not found"]})
+                continue
+            options = base_options
+            if len(names) > 1:
+                options = replace(base_options, base_filename=f"{base_options.base_filename}_{name}")
+            records.append(_capture_collection(collection, options, job.views))
+
+        result["collections"] = records
+        failed = any(record["status"] in {"failed", "cancelled"} for record in records)
+        result["status"] = "failed" if failed else "ok"
+    except Exception:  # noqa: BLE001 - reported back to the farm instead of crashing the worker
+        result["status"] = "error"
+        result["error"] = traceback.format_exc()
+    result["duration"] = time.perf_counter() - start
+    return result
@@ -0,0 +1,114 @@
+"""Shared helpers for Cube Capture benchmarks run under ``blender -b --python``."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+
+import bpy
+
+ADDON_DIR = Path(__file__).resolve().parents[1]
+
+
+def load_addon():
+    """Import the add-on package from this checkout, independent of installed extensions."""
+
+    parent = str(ADDON_DIR.parent)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    return importlib.import_module(ADDON_DIR.name)
+
+
+def script_args(argv: Sequence[str] | None = None) -> List[str]:
+    """Return the arguments passed after ``--`` on the Blender command line."""
+
+    argv = list(sys.argv if argv is None else argv)
+    return argv[argv.index("--") + 1 :] if "--" in argv else []
+
+
+def build_synthetic_collection(name: str, count: int, spacing: float = 3.0) -> bpy.types.Collection:
+    """Create ``count`` cubes sharing one mesh, laid out on a grid inside a new collection."""
+
+    collection = bpy.data.collections.new(name)
+    bpy.context.scene.collection.children.link(collection)
+
+    mesh = bpy.data.meshes.new(f"{name}_mesh")
+    mesh.from_pydata(
+        [(x, y, z) for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)],
+        [],
+        [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)],
+    )
+
+    side = max(int(round(count ** (1.0 / 3.0))), 1)
+    for index in range(count):
+        obj = bpy.data.objects.new(f"{name}_{index:06d}", mesh)
+        obj.location = (
+            (index % side) * spacing,
+            ((index // side) % side) * spacing,
+            (index // (side * side)) * spacing,
+        )
+        obj.rotation_euler = (index * 0.1, index * 0.2, index * 0.3)
+        collection.objects.link(obj)
+    bpy.context.view_layer.update()
+    return collection
+
+
+def build_instanced_collection(name: str, count: int, spacing: float = 3.0) -> bpy.types.Collection:
+    """Create one vertex-instancing object that places a cube at each of ``count`` grid points.
+
+    The collection holds two objects regardless of ``count``; the cubes only exist as depsgraph
+    instances, which exercises the instance bounds path instead of per-object reads.
+    """
+
+    collection = bpy.data.collections.new(name)
+    bpy.context.scene.collection.children.link(collection)
+
+    side = max(int(round(count ** (1.0 / 3.0))), 1)
+    points = bpy.data.meshes.new(f"{name}_points")
+    points.from_pydata(
+        [
+            ((index % side) * spacing, ((index // side) % side) * spacing, (index // (side * side)) * spacing)
+            for index in range(count)
+        ],
+        [],
+        [],
+    )
+    instancer = bpy.data.objects.new(f"{name}_instancer", points)
+    instancer.instance_type = "VERTS"
+    collection.objects.link(instancer)
+
+    cube = bpy.data.meshes.new(f"{name}_cube")
+    cube.from_pydata(
+        [(x, y, z) for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)],
+        [],
+        [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)],
+    )
+    prototype = bpy.data.objects.new(f"{name}_prototype", cube)
+    prototype.parent = instancer
+    collection.objects.link(prototype)
+    bpy.context.view_layer.update()
+    return collection
+
+
+def remove_collection(collection: bpy.types.Collection) -> None:
+    """Delete ``collection`` with its objects and meshes, so the next scene starts empty."""
+
+    objects = list(collection.objects)
+    meshes = {obj.data for obj in objects if obj.type == "MESH"}
+    bpy.data.batch_remove(objects + list(meshes) + [collection])
+    bpy.context.view_layer.update()
+
+
+def time_call(func: Callable[[], object], repeat: int = 3) -> Tuple[float, object]:
+    """Return the best wall time in seconds over ``repeat`` runs and the last result."""
+
+    best = float("inf")
+    result = None
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,51 @@
+"""Compare vectorized and per-object collection bounds.
+
+Run with::
+
+    blender -b --factory-startup --python benchmarks/bench_bounds.py -- 1000 10000 30000
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bpy  # noqa: E402
+
+from _common import build_synthetic_collection, load_addon, script_args, time_call  # noqa: E402
+
+
+def main() -> None:
+    addon = load_addon()
+    bounding_box = addon.utils.bounding_box
+    counts = [int(arg) for arg in script_args()] or [1000, 10000, 30000]
+
+    print(f"{'objects':>10} {'per-object (s)':>16} {'vectorized (s)':>16} {'speedup':>9}")
+    for count in counts:
+        collection = build_synthetic_collection(f"BenchBounds{count}", count)
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        view_layer = bpy.context.view_layer
+
+        reference_time, reference = time_call(
+            lambda: bounding_box._compute_collection_bounds_per_object(collection, depsgraph, view_layer)
+        )
+        vectorized_time, vectorized = time_call(
+            lambda: bounding_box.compute_collection_bounds(collection, depsgraph, view_layer)
+        )
+
+        assert reference is not None and vectorized is not None
+        error = max(
+            max(abs(a - b) for a, b in zip(reference.minimum, vectorized.minimum)),
+            max(abs(a - b) for a, b in zip(reference.maximum, vectorized.maximum)),
+        )
+        if error > 1e-3:
+            raise SystemExit(f"Bounds mismatch for {count} objects: max error {error}")
+
+        speedup = reference_time / vectorized_time if vectorized_time > 0 else float("inf")
+        print(f"{count:>10} {reference_time:>16.4f} {vectorized_time:>16.4f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmark the capture pipeline on synthetic scenes and check for regressions.
+
+Run with::
+
+    blender -b --factory-startup --python benchmarks/bench_suite.py -- \\
+        --counts 10 1000 100000 --output results.json [--baseline baseline.json --threshold 0.15]
+
+Every case builds a grid of cubes, either as separate objects (``plain``) or as vertex instances
+of one cube (``instanced``), and times collection bounds, scene backup and restore, camera setup
+and one render per view for each engine. Results are written as JSON; with ``--baseline`` any
+phase slower than the baseline by more than ``--threshold`` (and ``--min-delta`` seconds) is
+reported and Blender exits with status 1.
+
+Workbench and Eevee need a GPU context even in background mode. On machines without a GPU, run
+Blender against Mesa's software renderer, e.g. with ``LIBGL_ALWAYS_SOFTWARE=1``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bpy  # noqa: E402
+
+from _common import (  # noqa: E402
+    build_instanced_collection,
+    build_synthetic_collection,
+    load_addon,
+    remove_collection,
+    script_args,
+    time_call,
+)
+
+_BUILDERS = {"plain": build_synthetic_collection, "instanced": build_instanced_collection}
+# Each engine is reached through the quality tier that selects it.
+_ENGINE_QUALITY = {"WORKBENCH": "DRAFT", "EEVEE": "STANDARD"}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="bench_suite.py", description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 1000, 10000, 100000])
+    parser.add_argument("--variants", nargs="+", choices=sorted(_BUILDERS), default=sorted(_BUILDERS))
+    parser.add_argument("--engines", nargs="*", choices=sorted(_ENGINE_QUALITY), default=["WORKBENCH"])
+    parser.add_argument("--resolution", type=int, default=256, help="Render size of each view in pixels.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per phase; the best time is kept.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against the results stored in this JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown as a fraction.")
+    parser.add_argument("--min-delta", type=float, default=0.002, help="Ignore slowdowns below this many seconds.")
+    return parser.parse_args(script_args())
+
+
+def _bench_case(addon, collection: bpy.types.Collection, args: argparse.Namespace) -> Dict[str, float]:
+    capture = addon.utils.capture
+    render_setup = addon.utils.render_setup
+    scene = bpy.context.scene
+    view_layer = bpy.context.view_layer
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    timings: Dict[str, float] = {}
+
+    timings["bounds"], bounds = time_call(
+        lambda: addon.utils.bounding_box.compute_collection_bounds(collection, depsgraph, view_layer), args.repeat
+    )
+
+    def backup_restore() -> None:
+        backup = render_setup.backup_scene_settings(scene, view_layer, isolate=collection)
+        render_setup.isolate_collection_for_render(scene, view_layer, collection)
+        render_setup.restore_scene_settings(scene, backup)
+
+    timings["backup_restore"], _ = time_call(backup_restore, args.repeat)
+
+    def camera_setup() -> None:
+        camera = render_setup.acquire_capture_camera(scene)
+        for view_key in capture.VIEW_ORDER:
+            render_setup.configure_camera_for_view(camera, bounds, view_key, 0.05)
+            view_layer.update()
+        render_setup.release_capture_camera(scene)
+
+    timings["camera"], _ = time_call(camera_setup, args.repeat)
+
+    for engine in args.engines:
+        options = capture.CaptureOptions(
+            resolution=(args.resolution, args.resolution),
+            quality=_ENGINE_QUALITY[engine],
+        )
+        session = capture.CaptureSession(scene, view_layer, collection, options)
+        session.compute_bounds(depsgraph)
+        try:
+            session.begin(readback=True)
+            # Untimed warm-up, so shader compilation is not charged to the first view.
+            session.prepare_view(capture.VIEW_ORDER[0])
+            session.render_pixels()
+            for view_key in capture.VIEW_ORDER:
+                session.prepare_view(view_key)
+                timings[f"render.{engine.lower()}.{view_key.lower()}"], _ = time_call(session.render_pixels, 1)
+        finally:
+            session.end()
+    return timings
+
+
+def _compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], args) -> List[str]:
+    """Return a description of every phase that regressed beyond the allowed threshold."""
+
+    regressions = []
+    for case, phases in sorted(results.items()):
+        for phase, seconds in sorted(phases.items()):
+            reference = baseline.get(case, {}).get(phase)
+            if reference is None:
+                continue
+            if seconds > reference * (1.0 + args.threshold) and seconds - reference > args.min_delta:
+                change = (seconds / reference - 1.0) * 100.0 if reference > 0 else float("inf")
+                regressions.append(f"{case} {phase}: {reference:.4f}s -> {seconds:.4f}s (+{change:.0f}%)")
+    return regressions
+
+
+def main() -> None:
+    args = _parse_args()
+    addon = load_addon()
+    results: Dict[str, Dict[str, float]] = {}
+
+    print(f"{'case':>18} {'phase':>24} {'seconds':>10}")
+    for variant in args.variants:
+        for count in args.counts:
+            case = f"{variant}/{count}"
+            collection = _BUILDERS[variant](f"Bench_{variant}_{count}", count)
+            try:
+                results[case] = _bench_case(addon, collection, args)
+            finally:
+                remove_collection(collection)
+            for phase, seconds in results[case].items():
+                print(f"{case:>18} {phase:>24} {seconds:>10.4f}")
+
+    report = {
+        "blender": bpy.app.version_string,
+        "platform": platform.platform(),
+        "resolution": args.resolution,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = _compare(results, baseline.get("results", {}), args)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No phase regressed by more than {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
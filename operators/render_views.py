@@ -2,25 +2,105 @@
 
 from __future__ import annotations
 
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Sequence, Tuple
+
 import bpy
 
 from ..properties import CubeCaptureSettings, PROPERTY_NAME
-from ..utils.bounding_box import compute_collection_bounds
-from ..utils.render_setup import (
-    apply_render_resolution,
-    backup_scene_settings,
-    configure_camera_for_view,
-    create_temporary_camera,
-    ensure_flat_lighting,
-    prepare_output_path,
-    restore_scene_settings,
-)
+from ..utils.capture import VIEW_ORDER, CaptureOptions, CaptureSession
+from ..utils.profiling import CaptureProfile
+from ..utils.tiling import Tile
+
+
+def resolve_view_keys(settings: CubeCaptureSettings) -> Tuple[str, ...]:
+    """Return the views selected by ``settings`` in ``VIEW_ORDER`` order."""
+
+    if settings.view_set == "ALL":
+        return VIEW_ORDER
+    if settings.view_set == "CUSTOM":
+        selected = set(settings.custom_views)
+    else:
+        selected = {settings.view_direction}
+    return tuple(view_key for view_key in VIEW_ORDER if view_key in selected)
+
+
+def resolve_target_collection(context: bpy.types.Context) -> Optional[bpy.types.Collection]:
+    layer_collection = context.view_layer.active_layer_collection if context.view_layer else None
+    if layer_collection:
+        return layer_collection.collection
+    return context.collection
+
+
+def _start_session(
+    operator: bpy.types.Operator,
+    context: bpy.types.Context,
+) -> Tuple[Optional[CaptureSession], Tuple[str, ...]]:
+    """Validate the context and return a session with bounds computed, or report why not."""
+
+    settings: CubeCaptureSettings = getattr(context.scene, PROPERTY_NAME)
+    target_collection = resolve_target_collection(context)
+    if target_collection is None:
+        operator.report({"ERROR"}, "No active collection found.")
+        return None, ()
 
-VIEW_ORDER = ("FRONT", "BACK", "RIGHT", "LEFT", "TOP", "BOTTOM")
-EXTENSION_MAP = {
-    "PNG": ".png",
-    "OPEN_EXR": ".exr",
-}
+    view_keys = resolve_view_keys(settings)
+    if not view_keys:
+        operator.report({"ERROR"}, "No supported views selected.")
+        return None, ()
+
+    options = CaptureOptions.from_settings(settings)
+    session = CaptureSession(context.scene, context.view_layer, target_collection, options)
+    depsgraph = context.evaluated_depsgraph_get()
+    if options.batch_children:
+        if not session.compute_targets(depsgraph):
+            operator.report({"ERROR"}, "No child of the active collection contains renderable geometry.")
+            return None, ()
+    elif session.compute_bounds(depsgraph) is None:
+        operator.report({"ERROR"}, "Active collection does not contain renderable geometry.")
+        return None, ()
+    # Batch captures load each child's manifest when they reach it.
+    if options.skip_unchanged and not options.batch_children:
+        session.load_manifest(depsgraph, view_keys)
+    return session, view_keys
+
+
+def _report_outputs(operator: bpy.types.Operator, session: CaptureSession, view_keys: Sequence[str]) -> None:
+    global _LAST_PROFILE
+
+    cubemap_filepaths = session.write_cubemap()
+    pyramid_filepaths = session.write_pyramid()
+    index_filepath = session.write_index(view_keys)
+    session.write_profile(view_keys)
+    _LAST_PROFILE = session.profile
+    for warning in session.warnings:
+        operator.report({"WARNING"}, warning)
+    for error in session.errors:
+        operator.report({"ERROR"}, error)
+    output_filepaths = session.output_filepaths
+    if session.culled_objects:
+        operator.report({"INFO"}, f"Hid {len(session.culled_objects)} sub-pixel object(s).")
+    if session.skipped_views:
+        operator.report({"INFO"}, f"Skipped {len(session.skipped_views)} unchanged view(s).")
+    if len(output_filepaths) == 1:
+        operator.report({"INFO"}, f"Render saved to {output_filepaths[0]}.")
+    elif output_filepaths:
+        output_dir = bpy.path.abspath(session.options.output_directory)
+        operator.report({"INFO"}, f"Rendered {len(output_filepaths)} views to {output_dir}.")
+    if session.pass_filepaths:
+        operator.report({"INFO"}, f"Wrote {len(session.pass_filepaths)} pass map(s).")
+    if pyramid_filepaths:
+        operator.report({"INFO"}, f"Wrote {len(pyramid_filepaths)} downsampled image(s).")
+    if len(cubemap_filepaths) == 1:
+        operator.report({"INFO"}, f"Cube map saved to {cubemap_filepaths[0]}.")
+    elif cubemap_filepaths:
+        operator.report({"INFO"}, f"Wrote {len(cubemap_filepaths)} cube maps.")
+    if index_filepath:
+        operator.report(
+            {"INFO"}, f"Captured {len(session.targets)} child collection(s); index saved to {index_filepath}."
+        )
 
 
 class CUBECAPTURE_OT_render(bpy.types.Operator):
@@ -29,89 +109,321 @@ class CUBECAPTURE_OT_render(bpy.types.Operator):
     bl_idname = "cube_capture.render"
     bl_label = "Cube Capture Views"
     bl_description = "Captures six orthographic views of the Blender scene."
-    bl_options = {"REGISTER", "UNDO"}
+    # No UNDO: the scene is restored on completion, so an undo step would only snapshot the capture rig.
+    bl_options = {"REGISTER"}
 
     @staticmethod
-    def _show_save_alert(context: bpy.types.Context, filepath: str) -> None:
-        """Display a popup informing the user where the render was saved."""
+    def _show_save_alert(context: bpy.types.Context, filepaths: Sequence[str]) -> None:
+        """Display a popup informing the user where the renders were saved."""
 
         window_manager = context.window_manager if context else None
-        if window_manager is None:
+        if window_manager is None or not filepaths:
             return
 
         def draw(self, _context):  # type: ignore[override]
-            self.layout.label(text=filepath)
+            for filepath in filepaths:
+                self.layout.label(text=filepath)
 
-        window_manager.popup_menu(draw, title="Render Saved", icon="FILE_TICK")
+        title = "Render Saved" if len(filepaths) == 1 else "Renders Saved"
+        window_manager.popup_menu(draw, title=title, icon="FILE_TICK")
 
     @classmethod
     def poll(cls, context: bpy.types.Context) -> bool:
         scene = context.scene
-        return bool(scene and getattr(scene, PROPERTY_NAME, None))
+        return bool(scene and getattr(scene, PROPERTY_NAME, None)) and _ACTIVE_PROGRESS is None
 
     def execute(self, context: bpy.types.Context):
-        scene = context.scene
-        settings: CubeCaptureSettings = getattr(scene, PROPERTY_NAME)
+        session, view_keys = _start_session(self, context)
+        if session is None:
+            return {"CANCELLED"}
 
-        layer_collection = context.view_layer.active_layer_collection if context.view_layer else None
-        target_collection = None
-        if layer_collection:
-            target_collection = layer_collection.collection
-        elif context.collection:
-            target_collection = context.collection
+        try:
+            session.begin()
+            if not session.render_to_files(view_keys):
+                self.report({"INFO"}, "Render cancelled.")
+                return {"CANCELLED"}
+        finally:
+            session.end()
 
-        if target_collection is None:
-            self.report({"ERROR"}, "No active collection found.")
-            return {"CANCELLED"}
+        _report_outputs(self, session, view_keys)
+        self._show_save_alert(context, session.output_filepaths)
+        return {"FINISHED"}
 
-        depsgraph = context.evaluated_depsgraph_get() if hasattr(context, "evaluated_depsgraph_get") else None
-        bounds = compute_collection_bounds(target_collection, depsgraph=depsgraph, view_layer=context.view_layer)
-        if bounds is None:
-            self.report({"ERROR"}, "Active collection does not contain renderable geometry.")
-            return {"CANCELLED"}
 
-        view_key = settings.view_direction
-        if view_key not in VIEW_ORDER:
-            self.report({"ERROR"}, "Selected view is not supported.")
+@dataclass
+class CaptureProgress:
+    """Progress of the running background capture, shared with render handlers and the panel."""
+
+    views: Tuple[str, ...]
+    frames: int = 1
+    collections: int = 1
+    completed: int = 0
+    current: str | None = None
+    frame: int | None = None
+    collection: str | None = None
+    view_finished: bool = False
+    render_cancelled: bool = False
+    cancel_requested: bool = False
+
+    @property
+    def total(self) -> int:
+        return len(self.views) * self.frames * self.collections
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self.views else 1.0
+
+
+_ACTIVE_PROGRESS: CaptureProgress | None = None
+_LAST_PROFILE: CaptureProfile | None = None
+
+
+def get_capture_progress() -> Optional[CaptureProgress]:
+    """Return the progress of the running background capture, if any."""
+
+    return _ACTIVE_PROGRESS
+
+
+def get_last_profile() -> Optional[CaptureProfile]:
+    """Return the phase timings of the last capture that finished in this session, if any."""
+
+    return _LAST_PROFILE
+
+
+# Render handlers may run on the render job thread, so they only flip flags on the progress.
+def _on_render_pre(*_args) -> None:
+    if _ACTIVE_PROGRESS is not None:
+        _ACTIVE_PROGRESS.view_finished = False
+
+
+def _on_render_post(*_args) -> None:
+    if _ACTIVE_PROGRESS is not None:
+        _ACTIVE_PROGRESS.view_finished = True
+
+
+def _on_render_cancel(*_args) -> None:
+    if _ACTIVE_PROGRESS is not None:
+        _ACTIVE_PROGRESS.render_cancelled = True
+
+
+_RENDER_HANDLERS = (
+    (bpy.app.handlers.render_pre, _on_render_pre),
+    (bpy.app.handlers.render_post, _on_render_post),
+    (bpy.app.handlers.render_cancel, _on_render_cancel),
+)
+
+
+def _tag_panel_redraw(context: bpy.types.Context) -> None:
+    screen = context.screen
+    if screen is None:
+        return
+    for area in screen.areas:
+        if area.type == "VIEW_3D":
+            area.tag_redraw()
+
+
+class CUBECAPTURE_OT_render_async(bpy.types.Operator):
+    """Render orthographic views for the active collection without blocking the interface."""
+
+    bl_idname = "cube_capture.render_async"
+    bl_label = "Cube Capture Views (Background)"
+    bl_description = "Captures the selected views one render job at a time; press Esc to cancel."
+    bl_options = {"REGISTER"}
+
+    _session: CaptureSession | None = None
+    # (batch child, frame, view); the child is ``None`` outside batch captures and the frame
+    # outside frame-range captures.
+    _queue: Deque[Tuple[Optional[int], Optional[int], str]]
+    _tiles: Deque[Tile]
+    _current_filepath: str | None = None
+    _current_tile: Tile | None = None
+    _atlas_views: Tuple[str, ...] = ()
+    _view_keys: Tuple[str, ...] = ()
+    _render_started = 0.0
+    _timer = None
+
+    @classmethod
+    def poll(cls, context: bpy.types.Context) -> bool:
+        return CUBECAPTURE_OT_render.poll(context)
+
+    def execute(self, context: bpy.types.Context):
+        return self.invoke(context, None)
+
+    def invoke(self, context: bpy.types.Context, _event):
+        global _ACTIVE_PROGRESS
+
+        session, view_keys = _start_session(self, context)
+        if session is None:
             return {"CANCELLED"}
+        try:
+            session.begin()
+        except Exception:
+            session.end()
+            raise
 
-        backup = backup_scene_settings(scene)
-        camera = create_temporary_camera(scene)
-        camera_data = camera.data
-        padding = max(settings.padding_ratio, 0.0)
+        self._session = session
+        frames = session.options.frames
+        targets = range(len(session.targets)) if session.targets else (None,)
+        self._queue = deque(
+            (target, frame, view_key) for target in targets for frame in frames or (None,) for view_key in view_keys
+        )
+        self._tiles = deque()
+        self._current_filepath = None
+        self._current_tile = None
+        self._atlas_views = ()
+        self._view_keys = view_keys
+        _ACTIVE_PROGRESS = CaptureProgress(
+            views=view_keys, frames=len(frames) or 1, collections=len(session.targets) or 1
+        )
+        for handler_list, callback in _RENDER_HANDLERS:
+            handler_list.append(callback)
 
-        output_filepath = ""
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(0.1, window=context.window)
+        window_manager.modal_handler_add(self)
+        _tag_panel_redraw(context)
+        return {"RUNNING_MODAL"}
 
+    def modal(self, context: bpy.types.Context, event):
+        # Blender drops a modal handler that raises without calling cancel(), so restore the scene here.
         try:
-            if not settings.use_scene_lighting:
-                ensure_flat_lighting(scene)
-            apply_render_resolution(scene, settings.resolution_x, settings.resolution_y)
-            scene.render.image_settings.file_format = settings.image_format
-            scene.render.image_settings.color_mode = "RGBA"
-            scene.render.image_settings.color_depth = "16" if settings.image_format == "OPEN_EXR" else "8"
-            scene.camera = camera
-
-            configure_camera_for_view(camera, bounds, view_key, padding)
-            context.view_layer.update()
-
-            filename = f"{settings.base_filename}_{view_key.lower()}"
-            target_path = prepare_output_path(settings.output_directory, filename)
-            extension = EXTENSION_MAP.get(settings.image_format, "")
-            output_filepath = bpy.path.ensure_ext(target_path, extension)
-            scene.render.filepath = output_filepath
-
-            render_call = bpy.ops.render.render(animation=False, write_still=True, use_viewport=False)
-            render_result = render_call if isinstance(render_call, set) else {render_call}
-            if "CANCELLED" in render_result:
-                self.report({"INFO"}, "Render cancelled.")
-                return {"CANCELLED"}
-        finally:
-            restore_scene_settings(scene, backup)
-            if camera.name in bpy.data.objects:
-                bpy.data.objects.remove(camera, do_unlink=True)
-            if camera_data and camera_data.name in bpy.data.cameras:
-                bpy.data.cameras.remove(camera_data, do_unlink=True)
-
-        self.report({"INFO"}, f"Render saved to {output_filepath}.")
-        self._show_save_alert(context, output_filepath)
+            return self._step(context, event)
+        except Exception as error:
+            self._finish(context, cancelled=True)
+            self.report({"ERROR"}, f"Cube Capture failed: {error}")
+            raise
+
+    def _step(self, context: bpy.types.Context, event):
+        progress = _ACTIVE_PROGRESS
+        if progress is None:
+            return self._finish(context, cancelled=True)
+        if event.type == "ESC" and event.value == "PRESS":
+            progress.cancel_requested = True
+            self.report({"INFO"}, "Cube Capture will stop after the current view.")
+        if event.type != "TIMER" or bpy.app.is_job_running("RENDER"):
+            return {"PASS_THROUGH"}
+
+        if progress.render_cancelled:
+            return self._finish(context, cancelled=True)
+        if self._current_filepath is not None:
+            if not progress.view_finished:
+                return self._finish(context, cancelled=True)
+            # Includes up to one timer interval of polling latency.
+            self._session.profile.add("render", time.perf_counter() - self._render_started)
+            if self._atlas_views:
+                self._session.complete_atlas(self._atlas_views)
+                progress.completed += len(self._atlas_views)
+                self._atlas_views = ()
+                self._current_filepath = None
+            elif self._current_tile is not None:
+                self._session.store_tile(self._current_tile)
+                self._current_tile = None
+                if not self._tiles:
+                    self._session.finish_tiled_view(progress.current)
+                    self._current_filepath = None
+                    progress.completed += 1
+            else:
+                self._session.complete_view(self._current_filepath, progress.current)
+                self._current_filepath = None
+                progress.completed += 1
+        if progress.cancel_requested:
+            return self._finish(context, cancelled=True)
+        if self._tiles:
+            return self._render_tile(context, self._tiles.popleft())
+        while self._queue:
+            self._select_target(self._queue[0][0], progress)
+            if not self._session.is_up_to_date(self._queue[0][2]):
+                break
+            self._session.skipped_views.append(self._queue.popleft()[2])
+            progress.completed += 1
+        if not self._queue:
+            return self._finish(context, cancelled=False)
+        if self._session.atlas:
+            return self._render_atlas(context, progress)
+
+        _target, frame, view_key = self._queue.popleft()
+        if frame is not None and frame != self._session.frame:
+            self._session.set_frame(frame)
+        progress.current = view_key
+        progress.frame = frame
+        if self._session.uses_tiles(view_key):
+            self._tiles = deque(self._session.begin_tiled_view(view_key))
+            self._current_filepath = self._session.output_filepath(view_key)
+            return self._render_tile(context, self._tiles.popleft())
+
+        self._session.prepare_view(view_key)
+        output_filepath = self._session.target_filepath(view_key)
+        progress.view_finished = False
+        render_call = bpy.ops.render.render(
+            "INVOKE_DEFAULT", animation=False, write_still=self._session.write_still, use_viewport=False
+        )
+        render_result = render_call if isinstance(render_call, set) else {render_call}
+        if "CANCELLED" in render_result:
+            return self._finish(context, cancelled=True)
+        self._render_started = time.perf_counter()
+        self._current_filepath = output_filepath
+        _tag_panel_redraw(context)
+        return {"PASS_THROUGH"}
+
+    def _select_target(self, target: Optional[int], progress: CaptureProgress) -> None:
+        if target is not None and target != self._session.target_index:
+            self._session.select_target(target, self._view_keys)
+            progress.collection = self._session.collection.name
+
+    def _render_atlas(self, context: bpy.types.Context, progress: CaptureProgress):
+        # One multiview render covers the remaining views of the current batch child.
+        target = self._queue[0][0]
+        pending = []
+        while self._queue and self._queue[0][0] == target:
+            pending.append(self._queue.popleft()[2])
+        view_keys = tuple(pending)
+        self._session.prepare_atlas(view_keys)
+        progress.current = "atlas"
+        progress.view_finished = False
+        render_call = bpy.ops.render.render("INVOKE_DEFAULT", animation=False, write_still=True, use_viewport=False)
+        render_result = render_call if isinstance(render_call, set) else {render_call}
+        if "CANCELLED" in render_result:
+            return self._finish(context, cancelled=True)
+        self._render_started = time.perf_counter()
+        self._atlas_views = view_keys
+        self._current_filepath = self._session.scene.render.filepath
+        _tag_panel_redraw(context)
+        return {"PASS_THROUGH"}
+
+    def _render_tile(self, context: bpy.types.Context, tile: Tile):
+        self._session.prepare_tile(tile)
+        _ACTIVE_PROGRESS.view_finished = False
+        render_call = bpy.ops.render.render("INVOKE_DEFAULT", animation=False, write_still=False, use_viewport=False)
+        render_result = render_call if isinstance(render_call, set) else {render_call}
+        if "CANCELLED" in render_result:
+            return self._finish(context, cancelled=True)
+        self._render_started = time.perf_counter()
+        self._current_tile = tile
+        _tag_panel_redraw(context)
+        return {"PASS_THROUGH"}
+
+    def cancel(self, context: bpy.types.Context) -> None:
+        self._finish(context, cancelled=True)
+
+    def _finish(self, context: bpy.types.Context, cancelled: bool):
+        global _ACTIVE_PROGRESS
+
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        for handler_list, callback in _RENDER_HANDLERS:
+            if callback in handler_list:
+                handler_list.remove(callback)
+        _ACTIVE_PROGRESS = None
+
+        session = self._session
+        self._session = None
+        if session is not None:
+            session.end()
+        _tag_panel_redraw(context)
+
+        if cancelled:
+            self.report({"INFO"}, "Render cancelled.")
+            return {"CANCELLED"}
+        _report_outputs(self, session, self._view_keys)
         return {"FINISHED"}
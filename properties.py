@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any, Mapping
+
 import bpy
 from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, StringProperty
 from bpy.types import PropertyGroup
@@ -19,9 +21,52 @@ VIEW_ITEMS = (
 )
 
 
+VIEW_SET_ITEMS = (
+    ("SINGLE", "Single View", "Render only the selected view"),
+    ("ALL", "All Views", "Render all six orthographic views in one session"),
+    ("CUSTOM", "Custom", "Render the views enabled in the view list in one session"),
+)
+
+
+FRAMING_MODE_ITEMS = (
+    ("FIXED", "Fixed Resolution", "Render every view at the same resolution, framed square around the collection"),
+    ("DENSITY", "Pixel Density", "Size each view to its projected bounds at a fixed number of pixels per unit"),
+    ("CUBE", "Cube", "Frame every view as a square face of one cube around the collection, as cube maps need"),
+)
+
+
+CUBEMAP_LAYOUT_ITEMS = (
+    ("NONE", "None", "Only write the individual views"),
+    ("HORIZONTAL_CROSS", "Horizontal Cross", "Also write the six views as a 4x3 unfolded cube"),
+    ("VERTICAL_CROSS", "Vertical Cross", "Also write the six views as a 3x4 unfolded cube"),
+    ("STRIP", "Strip", "Also write the six views side by side in capture order"),
+    ("EQUIRECT", "Equirectangular", "Also write a 2:1 equirectangular projection usable as an environment texture"),
+)
+
+
+SEQUENCE_FRAMING_ITEMS = (
+    ("UNION", "Stable", "Frame every view around the bounds of the whole range, so the camera never moves"),
+    ("PER_FRAME", "Per Frame", "Refit every view to the bounds of each frame"),
+)
+
+
+QUALITY_ITEMS = (
+    ("DRAFT", "Draft", "Workbench flat shading with FXAA and simplified geometry, for fast thumbnails"),
+    ("STANDARD", "Standard", "Eevee with a moderate sample count"),
+    ("FINAL", "Final", "Eevee with full sample counts for publication-quality sheets"),
+)
+
+
+PYRAMID_FILTER_ITEMS = (
+    ("BOX", "Box", "Average the covered pixels; fastest, slightly soft"),
+    ("LANCZOS", "Lanczos", "Three-lobe Lanczos filter; sharper edges at a small extra cost"),
+)
+
+
 IMAGE_FORMAT_ITEMS = (
     ("PNG", "PNG", "Lossless 8-bit RGBA PNG"),
     ("OPEN_EXR", "OpenEXR", "High dynamic range OpenEXR"),
+    ("OPEN_EXR_MULTILAYER", "OpenEXR Multilayer", "OpenEXR with the enabled passes as extra layers of one file"),
 )
 
 
@@ -39,12 +84,38 @@ class CubeCaptureSettings(PropertyGroup):
         default="cube_capture",
     )
 
+    use_atlas: BoolProperty(
+        name="Single-Render Atlas",
+        description=(
+            "Render all selected views in one multiview render, so scene sync and shader compilation "
+            "happen once per capture; every view shares the same resolution"
+        ),
+        default=False,
+    )
+
+    framing_mode: EnumProperty(
+        name="Framing",
+        description="How the render size of each view is chosen",
+        items=FRAMING_MODE_ITEMS,
+        default="FIXED",
+    )
+
+    pixels_per_unit: FloatProperty(
+        name="Pixels per Unit",
+        description="Render density in pixels per scene unit; each view's resolution follows its projected bounds",
+        default=256.0,
+        min=0.001,
+        soft_min=1.0,
+        soft_max=4096.0,
+    )
+
     resolution_x: IntProperty(
         name="Width",
         description="Render width in pixels",
         default=2048,
         min=64,
-        soft_max=8192,
+        max=65536,
+        soft_max=32768,
     )
 
     resolution_y: IntProperty(
@@ -52,7 +123,8 @@ class CubeCaptureSettings(PropertyGroup):
         description="Render height in pixels",
         default=2048,
         min=64,
-        soft_max=8192,
+        max=65536,
+        soft_max=32768,
     )
 
     view_direction: EnumProperty(
@@ -62,6 +134,21 @@ class CubeCaptureSettings(PropertyGroup):
         default="FRONT",
     )
 
+    view_set: EnumProperty(
+        name="Views",
+        description="Which orthographic views to render in a single capture",
+        items=VIEW_SET_ITEMS,
+        default="SINGLE",
+    )
+
+    custom_views: EnumProperty(
+        name="Custom Views",
+        description="Views rendered when the view set is Custom",
+        items=VIEW_ITEMS,
+        options={"ENUM_FLAG"},
+        default={"FRONT", "RIGHT", "TOP"},
+    )
+
     image_format: EnumProperty(
         name="Format",
         description="Image file format for outputs",
@@ -69,6 +156,137 @@ class CubeCaptureSettings(PropertyGroup):
         default="PNG",
     )
 
+    use_pyramid: BoolProperty(
+        name="Downsampled Copies",
+        description="Also write smaller copies of every view, filtered from the single full-size render",
+        default=False,
+    )
+
+    pyramid_sizes: StringProperty(
+        name="Sizes",
+        description="Longest side in pixels of each copy, separated by commas",
+        default="512, 128",
+    )
+
+    pyramid_filter: EnumProperty(
+        name="Filter",
+        description="Filter used to shrink the full-size render",
+        items=PYRAMID_FILTER_ITEMS,
+        default="LANCZOS",
+    )
+
+    pass_depth: BoolProperty(
+        name="Depth",
+        description="Also write the depth pass; PNG maps the view's clip range to 0-1",
+        default=False,
+    )
+
+    pass_normal: BoolProperty(
+        name="Normal",
+        description="Also write world-space normals; PNG encodes them as n * 0.5 + 0.5",
+        default=False,
+    )
+
+    pass_object_id: BoolProperty(
+        name="Object ID",
+        description=(
+            "Also write per-object IDs: the Object Index pass with Cycles, or Cryptomatte in OpenEXR Multilayer; "
+            "indices are listed in <prefix>_object_ids.json"
+        ),
+        default=False,
+    )
+
+    pass_mask: BoolProperty(
+        name="Mask",
+        description="Also write the coverage mask (alpha) as a separate grayscale image",
+        default=False,
+    )
+
+    cubemap_layout: EnumProperty(
+        name="Cube Map",
+        description="Assemble the six views into a single cube-map image after capturing all views",
+        items=CUBEMAP_LAYOUT_ITEMS,
+        default="NONE",
+    )
+
+    async_write: BoolProperty(
+        name="Write in Background",
+        description="Encode and save images on worker threads so the next view renders while the last one is written",
+        default=False,
+    )
+
+    write_threads: IntProperty(
+        name="Writer Threads",
+        description="Number of threads encoding and writing images in the background",
+        default=2,
+        min=1,
+        max=16,
+    )
+
+    use_tiled_render: BoolProperty(
+        name="Tiled Rendering",
+        description="Render large views in tiles stitched on disk, so memory use is bounded by the tile size",
+        default=False,
+    )
+
+    tile_size: IntProperty(
+        name="Tile Size",
+        description="Largest tile edge in pixels; views no larger than this render in one piece",
+        default=4096,
+        min=256,
+        soft_max=8192,
+    )
+
+    skip_unchanged: BoolProperty(
+        name="Skip Unchanged Views",
+        description="Only render views whose geometry, materials, settings or direction changed since the last capture",
+        default=False,
+    )
+
+    timing_log: BoolProperty(
+        name="Timing Log",
+        description="Append the time spent in each capture phase to a JSON-lines log next to the outputs",
+        default=True,
+    )
+
+    python_profile: BoolProperty(
+        name="cProfile Dump",
+        description="Profile the add-on's Python code during the capture and write the stats next to the outputs",
+        default=False,
+    )
+
+    use_frame_range: BoolProperty(
+        name="Frame Range",
+        description="Render every selected view for each frame of the range into numbered files",
+        default=False,
+    )
+
+    frame_start: IntProperty(
+        name="Start",
+        description="First frame of the captured range",
+        default=1,
+    )
+
+    frame_end: IntProperty(
+        name="End",
+        description="Last frame of the captured range",
+        default=250,
+    )
+
+    frame_step: IntProperty(
+        name="Step",
+        description="Number of frames to advance between captured frames",
+        default=1,
+        min=1,
+    )
+
+    sequence_framing: EnumProperty(
+        name="Sequence Framing",
+        description="How the views are fitted to an animated collection",
+        items=SEQUENCE_FRAMING_ITEMS,
+        default="UNION",
+    )
+
     padding_ratio: FloatProperty(
         name="Padding",
         description="Extra framing around the collection as a fraction of the largest dimension",
@@ -78,12 +296,83 @@ class CubeCaptureSettings(PropertyGroup):
         subtype="FACTOR",
     )
 
+    isolate_collection: BoolProperty(
+        name="Render Collection Only",
+        description="Temporarily exclude every other collection so only the captured one is synced and rendered",
+        default=False,
+    )
+
+    watch_mode: BoolProperty(
+        name="Recapture on Save",
+        description=(
+            "After each save, capture the active collection again in a background Blender process "
+            "and replace the outputs once they are complete"
+        ),
+        default=False,
+    )
+
+    watch_delay: FloatProperty(
+        name="Save Delay",
+        description="Seconds to wait after a save, so a burst of saves triggers a single refresh",
+        default=2.0,
+        min=0.0,
+        soft_max=30.0,
+        subtype="TIME_ABSOLUTE",
+    )
+
+    batch_children: BoolProperty(
+        name="Capture Child Collections",
+        description=(
+            "Capture each child of the active collection on its own, sharing one scene setup, and write "
+            "<base>_<child>_<view> files plus an index"
+        ),
+        default=False,
+    )
+
+    quality: EnumProperty(
+        name="Quality",
+        description="Render engine, samples, filter size and simplification used for the capture",
+        items=QUALITY_ITEMS,
+        default="STANDARD",
+    )
+
     use_scene_lighting: BoolProperty(
         name="Use Scene Lighting",
         description="Render with the scene's existing lights and world instead of the add-on's flat setup",
         default=False,
     )
 
+    use_screen_size_culling: BoolProperty(
+        name="Sub-Pixel Culling",
+        description=(
+            "Hide objects smaller than the threshold in every view and cap subdivision at the level "
+            "where faces reach about one pixel"
+        ),
+        default=False,
+    )
+
+    cull_threshold: FloatProperty(
+        name="Cull Below",
+        description="Largest projected size, in pixels, of objects hidden during the capture",
+        default=1.0,
+        min=0.0,
+        soft_max=16.0,
+        subtype="PIXEL",
+    )
+
+
+def apply_settings_overrides(settings: CubeCaptureSettings, overrides: Mapping[str, Any]) -> None:
+    """Assign ``overrides`` to ``settings`` by property name, e.g. from a batch job spec."""
+
+    properties = settings.bl_rna.properties
+    for name, value in overrides.items():
+        prop = properties.get(name)
+        if prop is None or name == "rna_type":
+            raise KeyError(f"Unknown Cube Capture setting: {name}")
+        if prop.type == "ENUM" and prop.is_enum_flag:
+            value = set(value)
+        setattr(settings, name, value)
+
 
 def register_properties() -> None:
     bpy.utils.register_class(CubeCaptureSettings)
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import time
+
 import bpy
 
+from ..batch.watch import get_watch_status
+from ..operators.render_views import get_capture_progress, get_last_profile
 from ..properties import CubeCaptureSettings, PROPERTY_NAME
 
 
@@ -18,6 +22,40 @@ class CUBECAPTURE_PT_panel(bpy.types.Panel):
     def poll(cls, context: bpy.types.Context) -> bool:
         return bool(context.scene and getattr(context.scene, PROPERTY_NAME, None))
 
+    @staticmethod
+    def _draw_profile(layout: bpy.types.UILayout) -> None:
+        profile = get_last_profile()
+        if profile is None:
+            return
+        header, body = layout.panel("cube_capture_timings", default_closed=True)
+        header.label(text=f"Last Capture: {profile.wall:.2f} s", icon="TIME")
+        if body is None:
+            return
+        for name, seconds, count in profile.breakdown():
+            row = body.row()
+            row.label(text=name.title() if count == 1 else f"{name.title()} ({count}x)")
+            row.label(text=f"{seconds:.3f} s")
+
+    @staticmethod
+    def _draw_watch(layout: bpy.types.UILayout, settings: CubeCaptureSettings) -> None:
+        row = layout.row(align=True)
+        row.prop(settings, "watch_mode")
+        if settings.watch_mode:
+            row.prop(settings, "watch_delay", text="")
+        status = get_watch_status()
+        if status.state == "WAITING":
+            layout.label(text="Waiting for saves to settle", icon="TIME")
+        elif status.state == "RUNNING":
+            layout.label(text="Refreshing in the background", icon="SORTTIME")
+        if status.last_refresh is None:
+            return
+        refreshed = time.strftime("%H:%M:%S", time.localtime(status.last_refresh))
+        if status.message:
+            layout.label(text=f"Refresh failed at {refreshed}", icon="ERROR")
+            layout.label(text=status.message)
+        else:
+            layout.label(text=f"Refreshed {status.outputs} file(s) at {refreshed}", icon="CHECKMARK")
+
     def draw(self, context: bpy.types.Context) -> None:
         layout = self.layout
         scene = context.scene
@@ -28,16 +66,82 @@ class CUBECAPTURE_PT_panel(bpy.types.Panel):
 
         col = layout.column()
         col.label(text=f"Active Collection: {collection_name}")
-        col.prop(settings, "view_direction")
-        col.prop(settings, "resolution_x")
-        col.prop(settings, "resolution_y")
+        col.prop(settings, "view_set")
+        if settings.view_set == "SINGLE":
+            col.prop(settings, "view_direction")
+        elif settings.view_set == "CUSTOM":
+            col.prop(settings, "custom_views", expand=True)
+        if settings.view_set != "SINGLE":
+            col.prop(settings, "use_atlas")
+        col.prop(settings, "framing_mode")
+        if settings.framing_mode == "DENSITY":
+            col.prop(settings, "pixels_per_unit")
+        elif settings.framing_mode == "CUBE":
+            col.prop(settings, "resolution_x", text="Face Size")
+        else:
+            col.prop(settings, "resolution_x")
+            col.prop(settings, "resolution_y")
+        col.prop(settings, "use_frame_range")
+        if settings.use_frame_range:
+            row = col.row(align=True)
+            row.prop(settings, "frame_start")
+            row.prop(settings, "frame_end")
+            row.prop(settings, "frame_step")
+            col.prop(settings, "sequence_framing")
+        col.prop(settings, "use_tiled_render")
+        if settings.use_tiled_render:
+            col.prop(settings, "tile_size")
         col.prop(settings, "padding_ratio")
+        col.prop(settings, "isolate_collection")
+        col.prop(settings, "batch_children")
+        col.prop(settings, "quality")
         col.prop(settings, "use_scene_lighting")
+        col.prop(settings, "use_screen_size_culling")
+        if settings.use_screen_size_culling:
+            col.prop(settings, "cull_threshold")
 
         col.separator()
         col.prop(settings, "output_directory")
         col.prop(settings, "base_filename")
         col.prop(settings, "image_format")
+        if settings.view_set == "ALL":
+            col.prop(settings, "cubemap_layout")
+        col.prop(settings, "use_pyramid")
+        if settings.use_pyramid:
+            row = col.row(align=True)
+            row.prop(settings, "pyramid_sizes")
+            row.prop(settings, "pyramid_filter", text="")
+        col.label(text="Extra Passes:")
+        row = col.row(align=True)
+        row.prop(settings, "pass_depth", toggle=True)
+        row.prop(settings, "pass_normal", toggle=True)
+        row.prop(settings, "pass_object_id", toggle=True)
+        row.prop(settings, "pass_mask", toggle=True)
+        col.prop(settings, "skip_unchanged")
+        col.prop(settings, "async_write")
+        if settings.async_write:
+            col.prop(settings, "write_threads")
+        row = col.row(align=True)
+        row.prop(settings, "timing_log", toggle=True)
+        row.prop(settings, "python_profile", toggle=True)
+        self._draw_watch(col, settings)
 
         col.separator()
-        col.operator("cube_capture.render", icon="RENDER_STILL")
+        progress = get_capture_progress()
+        if progress is None:
+            col.operator("cube_capture.render", icon="RENDER_STILL")
+            col.operator("cube_capture.render_async", icon="RENDER_ANIMATION")
+            self._draw_profile(layout)
+            return
+
+        current = progress.current.title() if progress.current else "Preparing"
+        if progress.frame is not None:
+            current = f"{current}, Frame {progress.frame}"
+        if progress.collection is not None:
+            current = f"{progress.collection}: {current}"
+        col.progress(
+            factor=progress.fraction,
+            type="BAR",
+            text=f"{current} ({progress.completed}/{progress.total})",
+        )
+        col.label(text="Press Esc to cancel after the current view", icon="INFO")
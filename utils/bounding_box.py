@@ -4,12 +4,20 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import bpy
+import numpy as np
 from bpy.types import Depsgraph, ViewLayer
 from mathutils import Vector
 
+RENDERABLE_TYPES = frozenset({"MESH", "CURVE", "SURFACE", "META", "FONT", "VOLUME", "GPENCIL"})
+
+# Below this many objects, per-object reads beat a bulk read of the whole source collection.
+_BULK_READ_THRESHOLD = 64
+# Instances are buffered in fixed-size batches so memory stays flat for any instance count.
+INSTANCE_BATCH_SIZE = 16384
+
 
 @dataclass(frozen=True)
 class Bounds:
@@ -33,13 +41,293 @@ def _iter_world_corners(obj: bpy.types.Object) -> Iterable[Vector]:
         yield matrix @ Vector(corner)
 
 
+def _is_visible(obj: bpy.types.Object, view_layer: ViewLayer | None) -> bool:
+    if obj.hide_render:
+        return False
+    return view_layer is None or obj.visible_get(view_layer=view_layer)
+
+
+def _is_renderable(obj: bpy.types.Object, view_layer: ViewLayer | None) -> bool:
+    return obj.type in RENDERABLE_TYPES and _is_visible(obj, view_layer)
+
+
+def _gather_arrays(objects, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bulk-read session ids, world matrices and local bound boxes from an RNA collection."""
+
+    uids = np.empty(count, dtype=np.int32)
+    matrices = np.empty(count * 16, dtype=np.float32)
+    corners = np.empty(count * 24, dtype=np.float32)
+    objects.foreach_get("session_uid", uids)
+    # ``matrix_world`` is stored column-major, so each reshaped block is the transposed matrix.
+    objects.foreach_get("matrix_world", matrices)
+    objects.foreach_get("bound_box", corners)
+    return uids, matrices.reshape(count, 4, 4), corners.reshape(count, 8, 3)
+
+
+def transform_corner_aabbs(matrices: np.ndarray, corners: np.ndarray) -> np.ndarray:
+    """Return ``(N, 2, 3)`` world-space min/max boxes for ``(N, 8, 3)`` local corners.
+
+    ``matrices`` holds column-major (transposed) world matrices as returned by ``foreach_get``,
+    so all corners are transformed with a single batched row-vector matmul.
+    """
+
+    count = corners.shape[0]
+    homogeneous = np.ones((count, 8, 4), dtype=np.float64)
+    homogeneous[:, :, :3] = corners
+    world = np.matmul(homogeneous, matrices.astype(np.float64, copy=False))[:, :, :3]
+    return np.stack((world.min(axis=1), world.max(axis=1)), axis=1)
+
+
+def renderable_objects(
+    collection: bpy.types.Collection,
+    view_layer: ViewLayer | None = None,
+) -> List[bpy.types.Object]:
+    """Return the visible, renderable objects of a collection and its children."""
+
+    return [obj for obj in collection.all_objects if _is_renderable(obj, view_layer)]  # type: ignore[attr-defined]
+
+
+def instancer_objects(
+    collection: bpy.types.Collection,
+    depsgraph: Depsgraph,
+    view_layer: ViewLayer | None = None,
+) -> List[bpy.types.Object]:
+    """Return visible objects of a collection that generate depsgraph instances.
+
+    This covers collection instances, particle instances and geometry-nodes instance output.
+    """
+
+    return [
+        obj
+        for obj in collection.all_objects  # type: ignore[attr-defined]
+        if _is_visible(obj, view_layer) and obj.evaluated_get(depsgraph).is_instancer
+    ]
+
+
+def _empty_aabbs() -> Tuple[np.ndarray, np.ndarray]:
+    return np.empty(0, dtype=np.int32), np.empty((0, 2, 3), dtype=np.float64)
+
+
+def object_aabbs(
+    objects: Sequence[bpy.types.Object],
+    depsgraph: Depsgraph | None = None,
+    source=None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(session_uids, aabbs)`` world-space boxes for ``objects``.
+
+    ``source`` is an RNA collection containing the objects (``depsgraph.objects`` or
+    ``collection.all_objects``). Large batches are bulk-read from it with ``foreach_get``;
+    small batches, or calls without a source, read each object directly.
+    """
+
+    if not objects:
+        return _empty_aabbs()
+
+    if source is None or len(objects) <= _BULK_READ_THRESHOLD:
+        count = len(objects)
+        uids = np.empty(count, dtype=np.int32)
+        matrices = np.empty((count, 4, 4), dtype=np.float32)
+        corners = np.empty((count, 8, 3), dtype=np.float32)
+        for index, obj in enumerate(objects):
+            evaluated = obj.evaluated_get(depsgraph) if depsgraph is not None else obj
+            uids[index] = obj.session_uid
+            matrices[index] = np.asarray(evaluated.matrix_world, dtype=np.float32).T
+            corners[index] = evaluated.bound_box
+        return uids, transform_corner_aabbs(matrices, corners)
+
+    wanted = np.fromiter((obj.session_uid for obj in objects), dtype=np.int32, count=len(objects))
+    uids, matrices, corners = _gather_arrays(source, len(source))
+    mask = np.isin(uids, wanted)
+    if not mask.any():
+        return _empty_aabbs()
+    return uids[mask], transform_corner_aabbs(matrices[mask], corners[mask])
+
+
+class _InstanceAccumulator:
+    """Reduce batches of instance matrices and prototype boxes into per-instancer AABBs."""
+
+    def __init__(self, slot_count: int) -> None:
+        self.minimum = np.full((slot_count, 3), np.inf)
+        self.maximum = np.full((slot_count, 3), -np.inf)
+        self.prototype_keys: Dict[int, int] = {}
+        self.prototype_corners: List[np.ndarray] = []
+        self.matrices = np.empty((INSTANCE_BATCH_SIZE, 4, 4), dtype=np.float32)
+        self.prototypes = np.empty(INSTANCE_BATCH_SIZE, dtype=np.int32)
+        self.slots = np.empty(INSTANCE_BATCH_SIZE, dtype=np.int32)
+        self.fill = 0
+
+    def prototype_index(self, obj: bpy.types.Object) -> int:
+        # Instances sharing evaluated data share their local bounding box.
+        key = (obj.data or obj).as_pointer()
+        index = self.prototype_keys.get(key)
+        if index is None:
+            index = len(self.prototype_corners)
+            self.prototype_keys[key] = index
+            self.prototype_corners.append(np.asarray(obj.bound_box, dtype=np.float32))
+        return index
+
+    def add(self, slot: int, obj: bpy.types.Object, matrix) -> None:
+        fill = self.fill
+        self.matrices[fill] = matrix
+        self.prototypes[fill] = self.prototype_index(obj)
+        self.slots[fill] = slot
+        self.fill = fill + 1
+        if self.fill == INSTANCE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        fill = self.fill
+        if fill == 0:
+            return
+        corners = np.stack(self.prototype_corners)[self.prototypes[:fill]]
+        # Matrices were copied row-major; transpose to the column-major layout used for matmul.
+        aabbs = transform_corner_aabbs(self.matrices[:fill].transpose(0, 2, 1), corners)
+        np.minimum.at(self.minimum, self.slots[:fill], aabbs[:, 0, :])
+        np.maximum.at(self.maximum, self.slots[:fill], aabbs[:, 1, :])
+        self.fill = 0
+
+
+def instance_aabbs(
+    instancers: Sequence[bpy.types.Object],
+    depsgraph: Depsgraph,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(session_uids, aabbs)`` covering the depsgraph instances of each instancer.
+
+    ``depsgraph.object_instances`` is streamed once; instance matrices are copied into fixed-size
+    NumPy batches and reduced per instancer, so no per-instance ``Vector`` is ever created.
+    Instancers that produced no renderable instances are omitted.
+    """
+
+    if not instancers:
+        return _empty_aabbs()
+
+    uids = [obj.session_uid for obj in instancers]
+    slot_of = {uid: slot for slot, uid in enumerate(uids)}
+    accumulator = _InstanceAccumulator(len(uids))
+    for instance in depsgraph.object_instances:
+        if not instance.is_instance:
+            continue
+        slot = slot_of.get(instance.parent.original.session_uid)
+        if slot is None:
+            continue
+        instance_obj = instance.object
+        if instance_obj.type not in RENDERABLE_TYPES:
+            continue
+        accumulator.add(slot, instance_obj, instance.matrix_world)
+    accumulator.flush()
+
+    found = np.isfinite(accumulator.minimum).all(axis=1)
+    aabbs = np.stack((accumulator.minimum, accumulator.maximum), axis=1)
+    return np.asarray(uids, dtype=np.int32)[found], aabbs[found]
+
+
+def merge_aabbs(
+    first: Tuple[np.ndarray, np.ndarray],
+    second: Tuple[np.ndarray, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Combine two ``(session_uids, aabbs)`` pairs, taking the union of boxes sharing a uid."""
+
+    uids = np.concatenate((first[0], second[0]))
+    aabbs = np.concatenate((first[1], second[1]))
+    if uids.size == 0:
+        return _empty_aabbs()
+    unique, inverse = np.unique(uids, return_inverse=True)
+    merged = np.empty((unique.size, 2, 3), dtype=np.float64)
+    merged[:, 0, :] = np.inf
+    merged[:, 1, :] = -np.inf
+    np.minimum.at(merged[:, 0, :], inverse, aabbs[:, 0, :])
+    np.maximum.at(merged[:, 1, :], inverse, aabbs[:, 1, :])
+    return unique.astype(np.int32), merged
+
+
+def compute_object_aabbs(
+    collection: bpy.types.Collection,
+    depsgraph: Depsgraph | None = None,
+    view_layer: ViewLayer | None = None,
+    include_instances: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(session_uids, aabbs)`` for visible, renderable objects in a collection.
+
+    ``aabbs`` has shape ``(N, 2, 3)`` holding per-object world-space minimum and maximum
+    corners. When a depsgraph is given, matrices and bound boxes are read from the evaluated
+    objects so modifiers are taken into account, and instancers also cover their instances.
+    """
+
+    source = depsgraph.objects if depsgraph is not None else collection.all_objects  # type: ignore[attr-defined]
+    result = object_aabbs(renderable_objects(collection, view_layer), depsgraph=depsgraph, source=source)
+    if depsgraph is None or not include_instances:
+        return result
+    instancers = instancer_objects(collection, depsgraph, view_layer)
+    if not instancers:
+        return result
+    return merge_aabbs(result, instance_aabbs(instancers, depsgraph))
+
+
+def bounds_from_aabbs(aabbs: np.ndarray) -> Optional[Bounds]:
+    """Reduce ``(N, 2, 3)`` per-object boxes to a single :class:`Bounds`."""
+
+    if aabbs.shape[0] == 0:
+        return None
+    minimum = aabbs[:, 0, :].min(axis=0)
+    maximum = aabbs[:, 1, :].max(axis=0)
+    return Bounds(minimum=Vector(minimum.tolist()), maximum=Vector(maximum.tolist()))
+
+
+def union_bounds(bounds: Iterable[Optional[Bounds]]) -> Optional[Bounds]:
+    """Return the box enclosing every non-empty entry of ``bounds``."""
+
+    boxes = [box for box in bounds if box is not None]
+    if not boxes:
+        return None
+    return Bounds(
+        minimum=Vector([min(box.minimum[axis] for box in boxes) for axis in range(3)]),
+        maximum=Vector([max(box.maximum[axis] for box in boxes) for axis in range(3)]),
+    )
+
+
+def split_bounds(
+    uids: np.ndarray,
+    aabbs: np.ndarray,
+    collections: Sequence[bpy.types.Collection],
+) -> List[Optional[Bounds]]:
+    """Reduce the boxes of one pass over a parent collection to the bounds of each of ``collections``.
+
+    ``uids`` and ``aabbs`` come from :func:`compute_object_aabbs` on a collection containing all of
+    ``collections``; instanced geometry is already merged into its instancer's box.
+    """
+
+    row_of = {uid: row for row, uid in enumerate(uids.tolist())}
+    result = []
+    for collection in collections:
+        rows = [row_of[obj.session_uid] for obj in collection.all_objects if obj.session_uid in row_of]
+        result.append(bounds_from_aabbs(aabbs[rows]) if rows else None)
+    return result
+
+
 def compute_collection_bounds(
     collection: bpy.types.Collection,
     depsgraph: Depsgraph | None = None,
     view_layer: ViewLayer | None = None,
+    include_instances: bool = True,
 ) -> Optional[Bounds]:
     """Compute tight world-space bounds for visible, renderable objects in a collection."""
 
+    _uids, aabbs = compute_object_aabbs(
+        collection,
+        depsgraph=depsgraph,
+        view_layer=view_layer,
+        include_instances=include_instances,
+    )
+    return bounds_from_aabbs(aabbs)
+
+
+def _compute_collection_bounds_per_object(
+    collection: bpy.types.Collection,
+    depsgraph: Depsgraph | None = None,
+    view_layer: ViewLayer | None = None,
+) -> Optional[Bounds]:
+    """Reference per-object implementation, kept for benchmarks and validation."""
+
     minimum = Vector((math.inf, math.inf, math.inf))
     maximum = Vector((-math.inf, -math.inf, -math.inf))
     found_geometry = False
@@ -51,7 +339,7 @@ def compute_collection_bounds(
             continue
 
         source_obj = obj.evaluated_get(depsgraph) if depsgraph is not None else obj
-        if source_obj.type in {"MESH", "CURVE", "SURFACE", "META", "FONT", "VOLUME", "GPENCIL"}:
+        if source_obj.type in RENDERABLE_TYPES:
             for world_corner in _iter_world_corners(source_obj):
                 minimum.x = min(minimum.x, world_corner.x)
                 minimum.y = min(minimum.y, world_corner.y)
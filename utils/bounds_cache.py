@@ -0,0 +1,147 @@
+"""Persistent per-collection bounds cache with depsgraph-driven invalidation."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.types import Depsgraph, ViewLayer
+
+from .bounding_box import (
+    Bounds,
+    bounds_from_aabbs,
+    instance_aabbs,
+    instancer_objects,
+    merge_aabbs,
+    object_aabbs,
+    renderable_objects,
+)
+
+# Updates to these object types never change what a capture frames.
+_IGNORED_UPDATE_TYPES = frozenset({"CAMERA", "LIGHT", "LIGHT_PROBE", "SPEAKER"})
+
+
+class BoundsCache:
+    """Per-object world AABBs keyed by collection and object session id.
+
+    Entries stay valid until the depsgraph reports a transform or geometry update for the
+    object, so repeated captures of an unchanged collection only re-check membership and
+    visibility before re-reducing the cached boxes. Instance bounds are cached per collection
+    as a whole, because instances can depend on objects outside the collection, and are
+    dropped on any relevant update.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, Dict[int, np.ndarray]] = {}
+        self._instance_entries: Dict[int, Tuple[Tuple[int, ...], Tuple[np.ndarray, np.ndarray]]] = {}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._instance_entries.clear()
+
+    def invalidate_objects(self, uids: Iterable[int]) -> None:
+        uids = set(uids)
+        if not uids:
+            return
+        for entry in self._entries.values():
+            for uid in uids:
+                entry.pop(uid, None)
+        self._instance_entries.clear()
+
+    def collection_aabbs(
+        self,
+        collection: bpy.types.Collection,
+        depsgraph: Depsgraph | None = None,
+        view_layer: ViewLayer | None = None,
+        include_instances: bool = True,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(session_uids, aabbs)`` for the collection, refreshing only stale objects."""
+
+        entry = self._entries.setdefault(collection.session_uid, {})
+        objects = renderable_objects(collection, view_layer)
+        stale = [obj for obj in objects if obj.session_uid not in entry]
+        if stale:
+            source = collection.all_objects if depsgraph is None else depsgraph.objects  # type: ignore[attr-defined]
+            uids, aabbs = object_aabbs(stale, depsgraph=depsgraph, source=source)
+            entry.update(zip(uids.tolist(), aabbs))
+
+        uids = [obj.session_uid for obj in objects if obj.session_uid in entry]
+        if uids:
+            result = (np.asarray(uids, dtype=np.int32), np.stack([entry[uid] for uid in uids]))
+        else:
+            result = (np.empty(0, dtype=np.int32), np.empty((0, 2, 3), dtype=np.float64))
+        if depsgraph is None or not include_instances:
+            return result
+
+        instancers = instancer_objects(collection, depsgraph, view_layer)
+        if not instancers:
+            return result
+        key = tuple(obj.session_uid for obj in instancers)
+        cached = self._instance_entries.get(collection.session_uid)
+        if cached is None or cached[0] != key:
+            cached = (key, instance_aabbs(instancers, depsgraph))
+            self._instance_entries[collection.session_uid] = cached
+        return merge_aabbs(result, cached[1])
+
+    def collection_bounds(
+        self,
+        collection: bpy.types.Collection,
+        depsgraph: Depsgraph | None = None,
+        view_layer: ViewLayer | None = None,
+        include_instances: bool = True,
+    ) -> Optional[Bounds]:
+        _uids, aabbs = self.collection_aabbs(
+            collection,
+            depsgraph=depsgraph,
+            view_layer=view_layer,
+            include_instances=include_instances,
+        )
+        return bounds_from_aabbs(aabbs)
+
+
+# Callers read it as ``bounds_cache.BOUNDS_CACHE``: reloading the add-on replaces the instance the handlers clear.
+BOUNDS_CACHE = BoundsCache()
+
+
+def _updated_object_uids(depsgraph: Depsgraph) -> Set[int]:
+    uids: Set[int] = set()
+    for update in depsgraph.updates:
+        if not (update.is_updated_transform or update.is_updated_geometry):
+            continue
+        updated_id = update.id
+        if isinstance(updated_id, bpy.types.Object) and updated_id.type not in _IGNORED_UPDATE_TYPES:
+            uids.add(updated_id.original.session_uid)
+    return uids
+
+
+@persistent
+def _on_depsgraph_update_post(_scene: bpy.types.Scene, depsgraph: Depsgraph) -> None:
+    BOUNDS_CACHE.invalidate_objects(_updated_object_uids(depsgraph))
+
+
+@persistent
+def _on_cache_reset(*_args) -> None:
+    # Frame changes re-evaluate animated objects without reporting them as depsgraph updates.
+    BOUNDS_CACHE.clear()
+
+
+_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update_post),
+    (bpy.app.handlers.frame_change_post, _on_cache_reset),
+    (bpy.app.handlers.load_post, _on_cache_reset),
+)
+
+
+def register_handlers() -> None:
+    for handler_list, callback in _HANDLERS:
+        if callback not in handler_list:
+            handler_list.append(callback)
+
+
+def unregister_handlers() -> None:
+    for handler_list, callback in _HANDLERS:
+        if callback in handler_list:
+            handler_list.remove(callback)
+    BOUNDS_CACHE.clear()
@@ -0,0 +1,1189 @@
+"""Capture sessions and the in-memory Python capture API.
+
+``capture_views`` renders views straight into NumPy arrays without touching disk::
+
+    from cube_capture.utils.capture import capture_views
+
+    result = capture_views(bpy.data.collections["Asset"], ("FRONT", "TOP"), (512, 512), dtype="uint8")
+    front = result.images["FRONT"]  # (512, 512, 4) top-down RGBA
+
+The UI operators drive the same :class:`CaptureSession` and only add file output on top.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import bpy
+import numpy as np
+from bpy.types import Depsgraph
+
+from . import bounds_cache
+from .bounding_box import Bounds, renderable_objects, split_bounds, union_bounds
+from .cubemap import assemble_layout, equirectangular
+from .fingerprint import (
+    CaptureManifest,
+    collection_fingerprint,
+    options_fingerprint,
+    surroundings_fingerprint,
+    view_fingerprint,
+    world_fingerprint,
+)
+from .image_io import (
+    AsyncImageWriter,
+    file_dtype,
+    linear_to_display,
+    quantize,
+    supports_display_transform,
+    supports_format,
+    to_file_pixels,
+    unpremultiply,
+    write_atomically,
+    write_pixels,
+)
+from .profiling import CaptureProfile, append_timing_log
+from .render_passes import (
+    PASS_KEYS,
+    add_pass_file_outputs,
+    aim_pass_outputs,
+    assign_object_indices,
+    collect_pass_files,
+    enable_view_layer_passes,
+    object_index_supported,
+    pass_filepath,
+)
+from .render_setup import (
+    CameraParameters,
+    RenderSettingsBackup,
+    acquire_capture_camera,
+    apply_quality,
+    apply_render_resolution,
+    atlas_view_suffix,
+    backup_scene_settings,
+    configure_camera_for_tile,
+    configure_camera_for_view,
+    cube_ortho_scale,
+    density_resolution,
+    enable_multiview_atlas,
+    enable_render_readback,
+    ensure_flat_lighting,
+    fit_ortho_scale,
+    isolate_collection_for_render,
+    load_image_pixels,
+    prepare_output_path,
+    read_render_pixels,
+    restore_scene_settings,
+    view_axes,
+)
+from .resample import downsample, downsample_rows
+from .simplify import apply_subdivision_limit, pixel_footprints, subdivision_level, subpixel_objects
+from .tiling import Tile, TiledImageBuffer, crop_tile, tile_frame, tile_layout
+
+VIEW_ORDER = ("FRONT", "BACK", "RIGHT", "LEFT", "TOP", "BOTTOM")
+EXTENSION_MAP = {
+    "PNG": ".png",
+    "OPEN_EXR": ".exr",
+    "OPEN_EXR_MULTILAYER": ".exr",
+}
+
+
+# Options that only change how outputs are produced, never their content.
+_NON_OUTPUT_OPTIONS = frozenset(
+    {
+        "async_write",
+        "write_threads",
+        "skip_unchanged",
+        "cubemap_layout",
+        "timing_log",
+        "python_profile",
+        "frames",
+        "framing_frames",
+        "batch_children",
+    }
+)
+
+
+def _parse_sizes(text: str) -> Tuple[int, ...]:
+    """Parse comma- or space-separated sizes, largest first, ignoring anything but positive integers."""
+
+    sizes = {int(token) for token in text.replace(",", " ").split() if token.isdigit() and int(token) > 0}
+    return tuple(sorted(sizes, reverse=True))
+
+
+def pyramid_filepath(filepath: str, size: int) -> str:
+    """Return the file the ``size`` px copy of the image at ``filepath`` is written to."""
+
+    stem, extension = os.path.splitext(filepath)
+    return f"{stem}_{size}px{extension}"
+
+
+def _frame_range(settings) -> Tuple[int, ...]:
+    frame_end = max(settings.frame_end, settings.frame_start)
+    return tuple(range(settings.frame_start, frame_end + 1, settings.frame_step))
+
+
+@dataclass(frozen=True)
+class CaptureOptions:
+    """Everything a capture needs, decoupled from the ``CubeCaptureSettings`` property group."""
+
+    resolution: Tuple[int, int] = (2048, 2048)
+    padding: float = 0.05
+    use_scene_lighting: bool = False
+    isolate_collection: bool = False
+    output_directory: str = "//renders"
+    base_filename: str = "cube_capture"
+    image_format: str = "PNG"
+    async_write: bool = False
+    write_threads: int = 2
+    skip_unchanged: bool = False
+    tile_size: int = 0
+    pixels_per_unit: float = 0.0
+    use_atlas: bool = False
+    cube_framing: bool = False
+    cubemap_layout: str = "NONE"
+    passes: Tuple[str, ...] = ()
+    quality: str = "STANDARD"
+    cull_threshold: float = 0.0
+    timing_log: bool = False
+    python_profile: bool = False
+    # Frames to render; empty captures the current frame only.
+    frames: Tuple[int, ...] = ()
+    # Frames the stable framing covers when a worker renders only part of the range.
+    framing_frames: Tuple[int, ...] = ()
+    per_frame_bounds: bool = False
+    # Longest sides of the downsampled copies, largest first.
+    pyramid_sizes: Tuple[int, ...] = ()
+    pyramid_filter: str = "LANCZOS"
+    # Capture each child of the collection on its own instead of the collection as a whole.
+    batch_children: bool = False
+
+    @classmethod
+    def from_settings(cls, settings) -> "CaptureOptions":
+        cube_framing = settings.framing_mode == "CUBE"
+        return cls(
+            # Cube faces are square; the width sets the face size.
+            resolution=(settings.resolution_x, settings.resolution_x if cube_framing else settings.resolution_y),
+            padding=max(settings.padding_ratio, 0.0),
+            use_scene_lighting=settings.use_scene_lighting,
+            isolate_collection=settings.isolate_collection,
+            output_directory=settings.output_directory,
+            base_filename=settings.base_filename,
+            image_format=settings.image_format,
+            async_write=settings.async_write,
+            write_threads=settings.write_threads,
+            skip_unchanged=settings.skip_unchanged,
+            tile_size=settings.tile_size if settings.use_tiled_render else 0,
+            pixels_per_unit=settings.pixels_per_unit if settings.framing_mode == "DENSITY" else 0.0,
+            use_atlas=settings.use_atlas,
+            cube_framing=cube_framing,
+            cubemap_layout=settings.cubemap_layout,
+            passes=tuple(pass_key for pass_key in PASS_KEYS if getattr(settings, f"pass_{pass_key.lower()}")),
+            quality=settings.quality,
+            cull_threshold=settings.cull_threshold if settings.use_screen_size_culling else 0.0,
+            timing_log=settings.timing_log,
+            python_profile=settings.python_profile,
+            frames=_frame_range(settings) if settings.use_frame_range else (),
+            per_frame_bounds=settings.sequence_framing == "PER_FRAME",
+            pyramid_sizes=_parse_sizes(settings.pyramid_sizes) if settings.use_pyramid else (),
+            pyramid_filter=settings.pyramid_filter,
+            batch_children=settings.batch_children,
+        )
+
+    def output_values(self) -> Tuple:
+        """Option values that can change rendered pixels, for fingerprinting."""
+
+        return tuple(
+            getattr(self, item.name) for item in fields(self) if item.name not in _NON_OUTPUT_OPTIONS
+        )
+
+
+class CaptureSession:
+    """Scene setup shared by every view rendered in one capture.
+
+    :meth:`begin` backs up the scene and builds the camera and lighting once, :meth:`prepare_view`
+    points the camera at a single view, and :meth:`end` restores everything.
+    """
+
+    def __init__(
+        self,
+        scene: bpy.types.Scene,
+        view_layer: bpy.types.ViewLayer,
+        collection: bpy.types.Collection,
+        options: CaptureOptions,
+    ) -> None:
+        self.scene = scene
+        self.view_layer = view_layer
+        self.collection = collection
+        self.options = options
+        self.bounds: Bounds | None = None
+        self.frame: int | None = None
+        self.backup: RenderSettingsBackup | None = None
+        self.camera: bpy.types.Object | None = None
+        self.writer: AsyncImageWriter | None = None
+        self.readback = False
+        self.tiling = False
+        self.atlas = False
+        self.pass_files: Tuple[str, ...] = ()
+        self.pass_filepaths: List[str] = []
+        self.pyramid_filepaths: List[str] = []
+        # Tiled views whose levels were filtered from the tile buffer, and sizes none of them could take.
+        self._pyramid_written: Set[str] = set()
+        self._pyramid_too_large: Set[int] = set()
+        self.object_ids: Dict[int, str] = {}
+        self.culled_objects: List[str] = []
+        self.cubemap_filepaths: List[str] = []
+        # Children captured one after another by a batch capture, with their bounds.
+        self.targets: List[Tuple[bpy.types.Collection, Bounds]] = []
+        self.target_index: int | None = None
+        self.profile = CaptureProfile()
+        self._root: Tuple[bpy.types.Collection, CaptureOptions] = (collection, options)
+        # Output, skipped-view and culled-object counts when each batch child was selected.
+        self._target_starts: List[Tuple[int, int, int]] = []
+        self._finished_manifests: List[CaptureManifest] = []
+        self._culled_now: List[str] = []
+        # Renderable objects linked straight to a batch's parent, shown only with a child that also links them.
+        self._batch_loose: List[bpy.types.Object] = []
+        self._simplify_base: Tuple[bool, int] = (False, 0)
+        self._view_parameters: CameraParameters | None = None
+        self._tiled_view: Tuple[CameraParameters, TiledImageBuffer] | None = None
+        self.manifest: CaptureManifest | None = None
+        self.fingerprints: Dict[str, str] = {}
+        self.output_filepaths: List[str] = []
+        self.skipped_views: List[str] = []
+        self.warnings: List[str] = []
+        self.errors: List[str] = []
+
+    @property
+    def write_still(self) -> bool:
+        """Whether Blender itself should write each render, rather than the background writer."""
+
+        return self.writer is None and not self.readback
+
+    def compute_bounds(self, depsgraph: Depsgraph | None = None) -> Optional[Bounds]:
+        with self.profile.phase("bounds"):
+            if self.options.frames and not self.options.per_frame_bounds:
+                self.bounds = self._sequence_bounds()
+            else:
+                self.bounds = bounds_cache.BOUNDS_CACHE.collection_bounds(
+                    self.collection, depsgraph=depsgraph, view_layer=self.view_layer
+                )
+        return self.bounds
+
+    def _sequence_bounds(self) -> Optional[Bounds]:
+        """Return the bounds enclosing the collection on every frame of the range."""
+
+        scene = self.scene
+        original_frame = scene.frame_current
+        frame_bounds = []
+        try:
+            for frame in self.options.framing_frames or self.options.frames:
+                self._set_scene_frame(frame)
+                frame_bounds.append(
+                    bounds_cache.BOUNDS_CACHE.collection_bounds(
+                        self.collection, depsgraph=self.view_layer.depsgraph, view_layer=self.view_layer
+                    )
+                )
+        finally:
+            self._set_scene_frame(original_frame)
+        return union_bounds(frame_bounds)
+
+    def compute_targets(self, depsgraph: Depsgraph | None = None) -> List[Tuple[bpy.types.Collection, Bounds]]:
+        """Measure every child collection for a batch capture, in one pass over the collection.
+
+        Children disabled in renders or without renderable geometry are left out. Use instead of
+        :meth:`compute_bounds`; :meth:`render_to_files` then captures the children one by one.
+        """
+
+        options = self.options
+        children = [child for child in self.collection.children if not child.hide_render]
+        frames = () if options.per_frame_bounds else options.framing_frames or options.frames
+        scene = self.scene
+        original_frame = scene.frame_current
+        child_bounds: List[List[Optional[Bounds]]] = [[] for _child in children]
+        with self.profile.phase("bounds"):
+            try:
+                for frame in frames or (None,):
+                    if frame is not None:
+                        self._set_scene_frame(frame)
+                    uids, aabbs = bounds_cache.BOUNDS_CACHE.collection_aabbs(
+                        self.collection,
+                        depsgraph=depsgraph if frame is None else self.view_layer.depsgraph,
+                        view_layer=self.view_layer,
+                    )
+                    for boxes, bounds in zip(child_bounds, split_bounds(uids, aabbs, children)):
+                        boxes.append(bounds)
+            finally:
+                if scene.frame_current != original_frame:
+                    self._set_scene_frame(original_frame)
+        self.targets = [
+            (child, bounds)
+            for child, bounds in zip(children, (union_bounds(boxes) for boxes in child_bounds))
+            if bounds is not None
+        ]
+        return self.targets
+
+    def _target_options(self, collection: bpy.types.Collection) -> CaptureOptions:
+        root_options = self._root[1]
+        return replace(root_options, base_filename=f"{root_options.base_filename}_{collection.name}")
+
+    def select_target(self, index: int, view_keys: Sequence[str]) -> None:
+        """Point a begun batch capture at child ``index`` of :attr:`targets`.
+
+        Only that child stays visible in renders, the camera frames it and its outputs are named
+        ``<base_filename>_<child>_<view>``. Scene setup, camera, lighting and backup are shared.
+        """
+
+        collection, bounds = self.targets[index]
+        if self.target_index is not None:
+            self.targets[self.target_index][0].hide_render = True
+            if self.manifest is not None:
+                self._finished_manifests.append(self.manifest)
+                self.manifest = None
+        collection.hide_render = False
+        members = set(collection.all_objects.keys())
+        for obj in self._batch_loose:
+            if obj.name in members:
+                obj.hide_render = False
+        self.target_index = index
+        self.collection = collection
+        self.bounds = bounds
+        self.options = self._target_options(collection)
+        self._target_starts.append((len(self.output_filepaths), len(self.skipped_views), len(self.culled_objects)))
+        if self.options.per_frame_bounds and self.frame is not None:
+            with self.profile.phase("bounds"):
+                self.bounds = (
+                    bounds_cache.BOUNDS_CACHE.collection_bounds(
+                        collection, depsgraph=self.view_layer.depsgraph, view_layer=self.view_layer
+                    )
+                    or bounds
+                )
+        if self.options.cull_threshold > 0:
+            self._apply_screen_size_limits()
+        # After culling, which shows the previous child's culled objects again.
+        for obj in self._batch_loose:
+            if obj.name not in members:
+                obj.hide_render = True
+        if self.options.skip_unchanged:
+            self.load_manifest(self.view_layer.depsgraph, view_keys)
+
+    def _set_scene_frame(self, frame: int) -> None:
+        self.scene.frame_set(frame)
+        # Animated objects move without depsgraph updates, so drop every cached box explicitly
+        # instead of relying on the frame-change handler.
+        bounds_cache.BOUNDS_CACHE.clear()
+
+    def set_frame(self, frame: int) -> None:
+        """Move the scene to ``frame`` and number the following outputs with it."""
+
+        with self.profile.phase("sync"):
+            self._set_scene_frame(frame)
+        self.frame = frame
+        if self.options.per_frame_bounds:
+            with self.profile.phase("bounds"):
+                # A frame where the collection is empty keeps the previous framing.
+                self.bounds = (
+                    bounds_cache.BOUNDS_CACHE.collection_bounds(
+                        self.collection, depsgraph=self.view_layer.depsgraph, view_layer=self.view_layer
+                    )
+                    or self.bounds
+                )
+
+    def load_manifest(self, depsgraph: Depsgraph, view_keys: Sequence[str]) -> None:
+        """Fingerprint ``view_keys`` and load the manifest used by :meth:`is_up_to_date`."""
+
+        if self.options.frames:
+            self.warnings.append("Skipping unchanged views only applies to single-frame captures.")
+            return
+        with self.profile.phase("fingerprint"):
+            content = collection_fingerprint(self.collection, depsgraph, self.view_layer)
+            if not self.options.isolate_collection:
+                # Everything else visible renders into the views too.
+                content += surroundings_fingerprint(self.scene, self.collection, depsgraph, self.view_layer)
+            if self.options.use_scene_lighting:
+                content += world_fingerprint(self.scene)
+            options = options_fingerprint(self.options.output_values(), self.scene)
+            self.fingerprints = {view_key: view_fingerprint(content, options, view_key) for view_key in view_keys}
+        manifest_name = f"{self.options.base_filename}.manifest.json"
+        self.manifest = CaptureManifest(prepare_output_path(self.options.output_directory, manifest_name))
+
+    def is_up_to_date(self, view_key: str) -> bool:
+        """Whether ``view_key`` was rendered before from identical inputs and its file still exists."""
+
+        fingerprint = self.fingerprints.get(view_key)
+        if self.manifest is None or fingerprint is None:
+            return False
+        output_filepath = self.output_filepath(view_key)
+        if not all(os.path.exists(pass_filepath(output_filepath, pass_key)) for pass_key in self.pass_files):
+            return False
+        longest = max(self.view_resolution(view_key))
+        levels = [pyramid_filepath(output_filepath, size) for size in self.options.pyramid_sizes if size < longest]
+        if not all(os.path.exists(path) for path in levels):
+            return False
+        return self.manifest.is_current(view_key, fingerprint, output_filepath)
+
+    def begin(self, readback: bool = False) -> None:
+        """Set up the scene; with ``readback`` the renders are kept in memory instead of written."""
+
+        if self.options.python_profile and not self.profile.start_profiler():
+            self.warnings.append("Another Python profiler is active; skipping the cProfile dump.")
+        with self.profile.phase("setup"):
+            self._begin(readback)
+
+    def _begin(self, readback: bool) -> None:
+        scene = self.scene
+        options = self.options
+        isolate = self.collection if options.isolate_collection else None
+        indexed = self.collection if "OBJECT_ID" in options.passes and not readback else None
+        # Culling may hide any of these, and a batch capture re-picks them for every child.
+        cull_candidates = renderable_objects(self.collection, self.view_layer) if options.cull_threshold > 0 else []
+        batch = [collection for collection, _bounds in self.targets]
+        # Hiding the children alone would leave these in every child's renders.
+        loose = []
+        if batch:
+            direct = set(self.collection.objects.keys())
+            loose = [obj for obj in renderable_objects(self.collection, self.view_layer) if obj.name in direct]
+        self.backup = backup_scene_settings(
+            scene,
+            self.view_layer,
+            isolate=isolate,
+            indexed=indexed,
+            hidden=list(dict.fromkeys(cull_candidates + loose)),
+            hidden_collections=batch,
+        )
+        self.camera = acquire_capture_camera(scene)
+
+        if isolate is not None:
+            isolate_collection_for_render(scene, self.view_layer, isolate)
+        # Draft renders with Workbench's own flat shading, so it needs neither Eevee nor the flat world.
+        if not options.use_scene_lighting and options.quality != "DRAFT":
+            with self.profile.phase("lighting"):
+                ensure_flat_lighting(scene)
+        apply_quality(scene, options.quality)
+        self._simplify_base = (scene.render.use_simplify, scene.render.simplify_subdivision_render)
+        # Each child is shown again by select_target while it is captured.
+        for collection in batch:
+            collection.hide_render = True
+        for obj in loose:
+            obj.hide_render = True
+        self._batch_loose = loose
+        if options.cull_threshold > 0 and not batch:
+            self._apply_screen_size_limits()
+        apply_render_resolution(scene, *options.resolution)
+        scene.render.image_settings.file_format = options.image_format
+        scene.render.image_settings.color_mode = "RGBA"
+        scene.render.image_settings.color_depth = {"OPEN_EXR": "16", "OPEN_EXR_MULTILAYER": "32"}.get(
+            options.image_format, "8"
+        )
+        scene.camera = self.camera
+        if readback:
+            enable_render_readback(scene, self.view_layer)
+            self.readback = True
+            return
+
+        if options.passes:
+            self._begin_passes()
+        self.atlas = options.use_atlas and self._can_use_atlas()
+        if self.atlas:
+            return
+        tile_size = options.tile_size
+        self.tiling = tile_size > 0 and self._can_tile() and self._can_encode(
+            "Tiled rendering", "rendering each view in one piece"
+        )
+        use_writer = options.async_write and self._can_encode("Background writing", "writing on the main thread")
+        if self.tiling or use_writer:
+            enable_render_readback(scene, self.view_layer)
+        if use_writer:
+            self.writer = AsyncImageWriter(max_workers=options.write_threads)
+
+    def _begin_passes(self) -> None:
+        """Enable the requested view-layer passes and, outside multilayer EXR, their file outputs."""
+
+        scene = self.scene
+        options = self.options
+        passes = list(options.passes)
+        multilayer = options.image_format == "OPEN_EXR_MULTILAYER"
+        if "OBJECT_ID" in passes and not multilayer and not object_index_supported(scene):
+            self.warnings.append("Object ID maps need Cycles unless the format is OpenEXR Multilayer; skipping them.")
+            passes.remove("OBJECT_ID")
+        if "OBJECT_ID" in passes and object_index_supported(scene):
+            self.object_ids = assign_object_indices(self.collection)
+            ids_path = prepare_output_path(options.output_directory, f"{options.base_filename}_object_ids.json")
+            with open(ids_path, "w", encoding="utf-8") as handle:
+                json.dump({str(index): name for index, name in self.object_ids.items()}, handle, indent=2)
+        enable_view_layer_passes(scene, self.view_layer, passes)
+        # Multilayer EXR stores the passes, and the mask is its combined alpha.
+        if not multilayer and passes:
+            add_pass_file_outputs(scene, self.view_layer, passes, options.image_format)
+            self.pass_files = tuple(passes)
+
+    def _apply_screen_size_limits(self) -> None:
+        """Hide the collection's sub-pixel objects and cap subdivision for its pixel density.
+
+        Objects hidden for a previous batch child are shown again first.
+        """
+
+        for name in self._culled_now:
+            obj = bpy.data.objects.get(name)
+            if obj is not None:
+                obj.hide_render = False
+        culled, subdivision = self._screen_size_limits()
+        for obj in culled:
+            obj.hide_render = True
+        self._culled_now = [obj.name for obj in culled]
+        self.culled_objects.extend(self._culled_now)
+        apply_subdivision_limit(self.scene, subdivision, self._simplify_base)
+
+    def _screen_size_limits(self) -> Tuple[List[bpy.types.Object], Optional[int]]:
+        """Return the sub-pixel objects to hide and the subdivision level the pixel density calls for.
+
+        Footprints use the finest density of all six views, so nothing culled is visible in any of them.
+        """
+
+        # Evaluated boxes, like every other caller's; original ones would poison the shared cache.
+        uids, aabbs = bounds_cache.BOUNDS_CACHE.collection_aabbs(
+            self.collection,
+            depsgraph=self.view_layer.depsgraph,
+            view_layer=self.view_layer,
+            include_instances=False,
+        )
+        footprints = pixel_footprints(aabbs, max(self._pixel_density(view_key) for view_key in VIEW_ORDER))
+        objects = renderable_objects(self.collection, self.view_layer)
+        culled = subpixel_objects(objects, uids, footprints, self.options.cull_threshold)
+        remaining = [obj for obj in objects if obj not in culled]
+        return culled, subdivision_level(remaining, uids, footprints)
+
+    def _can_tile(self) -> bool:
+        if not self.pass_files:
+            return True
+        self.warnings.append("Tiled rendering cannot write extra pass files; rendering each view in one piece.")
+        return False
+
+    def _can_use_atlas(self) -> bool:
+        """Whether all views can share one multiview render, warning why not otherwise."""
+
+        options = self.options
+        reason = None
+        if options.frames:
+            reason = "cannot number frame sequences"
+        elif options.pixels_per_unit:
+            reason = "needs one resolution for every view"
+        elif 0 < options.tile_size < max(options.resolution):
+            reason = "cannot be combined with tiles"
+        elif self.pass_files:
+            reason = "cannot write extra pass files"
+        if reason is None:
+            return True
+        self.warnings.append(f"The single-render atlas {reason}; rendering views one at a time.")
+        return False
+
+    def _can_encode(self, feature: str, fallback: str) -> bool:
+        """Whether the add-on's own encoder can write the output, warning with ``fallback`` if not."""
+
+        view_settings = self.scene.view_settings
+        display_device = self.scene.display_settings.display_device
+        if not supports_format(self.options.image_format):
+            self.warnings.append(f"{feature} is unavailable for this format; {fallback}.")
+            return False
+        if self.options.image_format == "PNG" and not supports_display_transform(
+            view_settings.view_transform, view_settings.look, display_device
+        ):
+            self.warnings.append(
+                f"{feature} does not support the '{view_settings.view_transform}' view transform "
+                f"on the '{display_device}' display; {fallback}."
+            )
+            return False
+        return True
+
+    def _encode_settings(self) -> Dict[str, object]:
+        render_image = self.scene.render.image_settings
+        view_settings = self.scene.view_settings
+        return {
+            "file_format": render_image.file_format,
+            "color_depth": render_image.color_depth,
+            "view_transform": view_settings.view_transform,
+            "exposure": view_settings.exposure,
+            "gamma": view_settings.gamma,
+        }
+
+    def _view_framing(self, view_key: str) -> Tuple[Tuple[int, int], Optional[float]]:
+        """Return the render size and orthographic scale of ``view_key``; ``None`` keeps the default fit."""
+
+        options = self.options
+        if options.pixels_per_unit:
+            resolution, density = density_resolution(self.bounds, view_key, options.padding, options.pixels_per_unit)
+            # Derive the scale from the rounded resolution so a pixel covers exactly 1 / density.
+            return resolution, max(resolution) / density
+        if options.cube_framing:
+            return tuple(options.resolution), cube_ortho_scale(self.bounds, options.padding)
+        return tuple(options.resolution), None
+
+    def _pixel_density(self, view_key: str) -> float:
+        resolution, ortho_scale = self._view_framing(view_key)
+        if ortho_scale is None:
+            ortho_scale = fit_ortho_scale(self.bounds, view_key, self.options.padding)
+        return max(resolution) / ortho_scale
+
+    def view_resolution(self, view_key: str) -> Tuple[int, int]:
+        """Return the render size of ``view_key``, which varies per view with pixel-density framing."""
+
+        return self._view_framing(view_key)[0]
+
+    def uses_tiles(self, view_key: str) -> bool:
+        return self.tiling and max(self.view_resolution(view_key)) > self.options.tile_size
+
+    def prepare_view(self, view_key: str) -> CameraParameters:
+        """Aim the camera at ``view_key``, size the render and sync the scene for rendering."""
+
+        options = self.options
+        resolution, ortho_scale = self._view_framing(view_key)
+        if options.pixels_per_unit:
+            density = max(resolution) / ortho_scale
+            if density < options.pixels_per_unit * (1.0 - 1e-6):
+                self.warnings.append(
+                    f"{view_key.title()} view would exceed the maximum resolution; "
+                    f"rendered at {density:.4g} pixels per unit."
+                )
+        apply_render_resolution(self.scene, *resolution)
+        parameters = configure_camera_for_view(self.camera, self.bounds, view_key, options.padding, ortho_scale)
+        with self.profile.phase("sync"):
+            self.view_layer.update()
+        self._view_parameters = replace(parameters, resolution=resolution)
+        return self._view_parameters
+
+    def output_filepath(self, view_key: str) -> str:
+        options = self.options
+        filename = f"{options.base_filename}_{view_key.lower()}"
+        if self.frame is not None:
+            filename = f"{filename}_{self.frame:04d}"
+        target_path = prepare_output_path(options.output_directory, filename)
+        return bpy.path.ensure_ext(target_path, EXTENSION_MAP.get(options.image_format, ""))
+
+    def target_filepath(self, view_key: str) -> str:
+        """Point the render output at the file for ``view_key`` and return its path."""
+
+        output_filepath = self.output_filepath(view_key)
+        self.scene.render.filepath = output_filepath
+        if self.pass_files:
+            aim_pass_outputs(self.scene, output_filepath, self.pass_files, self._view_parameters)
+        return output_filepath
+
+    def complete_view(self, output_filepath: str, view_key: str | None = None) -> None:
+        """Record a finished render, handing its pixels to the background writer when enabled."""
+
+        with self.profile.phase("encode"):
+            if self.writer is not None:
+                self.writer.submit_render(output_filepath, read_render_pixels(), **self._encode_settings())
+            if self.pass_files:
+                self.pass_filepaths.extend(collect_pass_files(self.scene, output_filepath, self.pass_files))
+        self._record_output(output_filepath, view_key)
+
+    def _record_output(self, output_filepath: str, view_key: str | None) -> None:
+        self.output_filepaths.append(output_filepath)
+        if self.manifest is not None and view_key in self.fingerprints:
+            self.manifest.record(view_key, self.fingerprints[view_key], output_filepath)
+
+    def begin_tiled_view(self, view_key: str) -> Tuple[Tile, ...]:
+        """Aim the camera at ``view_key``, allocate its stitching buffer and return the tiles to render."""
+
+        parameters = self.prepare_view(view_key)
+        width, height = parameters.resolution
+        encode = self._encode_settings()
+        buffer = TiledImageBuffer(
+            width,
+            height,
+            file_dtype(encode["file_format"], encode["color_depth"]),
+            directory=bpy.path.abspath(self.options.output_directory),
+        )
+        self._tiled_view = (parameters, buffer)
+        return tile_layout(width, height, self.options.tile_size)
+
+    def prepare_tile(self, tile: Tile) -> None:
+        parameters, _buffer = self._tiled_view
+        frame = tile_frame(parameters.ortho_scale, parameters.resolution, tile)
+        configure_camera_for_tile(self.scene, self.camera, frame)
+        with self.profile.phase("sync"):
+            self.view_layer.update()
+
+    def store_tile(self, tile: Tile) -> None:
+        """Convert the last render to file values and stream it into the view's buffer."""
+
+        _parameters, buffer = self._tiled_view
+        with self.profile.phase("encode"):
+            pixels = crop_tile(read_render_pixels(), tile)[::-1]
+            buffer.paste(tile, to_file_pixels(pixels, **self._encode_settings()))
+
+    def finish_tiled_view(self, view_key: str) -> str:
+        """Write the stitched view, on the background writer when enabled, and return its path."""
+
+        _parameters, buffer = self._tiled_view
+        self._tiled_view = None
+        output_filepath = self.output_filepath(view_key)
+        file_format = self.scene.render.image_settings.file_format
+        if self.options.pyramid_sizes and supports_format(self.options.image_format):
+            # Saving releases the buffer, and the full view would not fit in memory once read back.
+            with self.profile.phase("pyramid"):
+                self._write_tiled_pyramid(buffer.pixels, output_filepath)
+        with self.profile.phase("encode"):
+            if self.writer is not None:
+                self.writer.submit(buffer.save, output_filepath, file_format)
+            else:
+                buffer.save(output_filepath, file_format)
+        self._record_output(output_filepath, view_key)
+        return output_filepath
+
+    def prepare_atlas(self, view_keys: Sequence[str]) -> None:
+        """Aim one rig camera per view and set up a single multiview render writing all of them."""
+
+        options = self.options
+        for view_key in view_keys:
+            camera = acquire_capture_camera(self.scene, atlas_view_suffix(view_key))
+            configure_camera_for_view(camera, self.bounds, view_key, options.padding, self._view_framing(view_key)[1])
+        apply_render_resolution(self.scene, *options.resolution)
+        self.camera = enable_multiview_atlas(self.scene, view_keys)
+        # Blender inserts each view's suffix before the extension, giving the per-view file names.
+        base_path = prepare_output_path(options.output_directory, options.base_filename)
+        self.scene.render.filepath = bpy.path.ensure_ext(base_path, EXTENSION_MAP.get(options.image_format, ""))
+        with self.profile.phase("sync"):
+            self.view_layer.update()
+
+    def complete_atlas(self, view_keys: Sequence[str]) -> None:
+        for view_key in view_keys:
+            self._record_output(self.output_filepath(view_key), view_key)
+
+    def _render(self, write_still: bool) -> bool:
+        """Render the prepared frame in the foreground; return ``False`` if it was cancelled."""
+
+        with self.profile.phase("render"):
+            render_call = bpy.ops.render.render(animation=False, write_still=write_still, use_viewport=False)
+        render_result = render_call if isinstance(render_call, set) else {render_call}
+        return "CANCELLED" not in render_result
+
+    def render_atlas(self, view_keys: Sequence[str]) -> Optional[List[str]]:
+        """Render every view that is not up to date in one job; return the paths, or ``None`` if cancelled."""
+
+        pending = [view_key for view_key in view_keys if not self.is_up_to_date(view_key)]
+        self.skipped_views.extend(view_key for view_key in view_keys if view_key not in pending)
+        if not pending:
+            return []
+        self.prepare_atlas(pending)
+        if not self._render(write_still=True):
+            return None
+        self.complete_atlas(pending)
+        return [self.output_filepath(view_key) for view_key in pending]
+
+    def _render_tiled_view(self, view_key: str) -> Optional[str]:
+        for tile in self.begin_tiled_view(view_key):
+            self.prepare_tile(tile)
+            if not self._render(write_still=False):
+                return None
+            self.store_tile(tile)
+        return self.finish_tiled_view(view_key)
+
+    def render_view_to_file(self, view_key: str) -> Optional[str]:
+        """Render ``view_key`` in the foreground and return its output path, or ``None`` if cancelled.
+
+        Views that are up to date according to the manifest are skipped without rendering.
+        """
+
+        if self.is_up_to_date(view_key):
+            self.skipped_views.append(view_key)
+            return self.output_filepath(view_key)
+        if self.uses_tiles(view_key):
+            return self._render_tiled_view(view_key)
+        self.prepare_view(view_key)
+        output_filepath = self.target_filepath(view_key)
+        if not self._render(write_still=self.write_still):
+            return None
+        self.complete_view(output_filepath, view_key)
+        return output_filepath
+
+    def render_to_files(self, view_keys: Sequence[str]) -> bool:
+        """Render ``view_keys`` in the foreground; return ``False`` if a render was cancelled.
+
+        A batch capture renders them for every child in :attr:`targets`.
+        """
+
+        if not self.targets:
+            return self._render_target_to_files(view_keys)
+        for index in range(len(self.targets)):
+            self.select_target(index, view_keys)
+            if not self._render_target_to_files(view_keys):
+                return False
+        return True
+
+    def _render_target_to_files(self, view_keys: Sequence[str]) -> bool:
+        if self.atlas:
+            return self.render_atlas(view_keys) is not None
+        for frame in self.options.frames or (None,):
+            if frame is not None:
+                self.set_frame(frame)
+            if not all(self.render_view_to_file(view_key) is not None for view_key in view_keys):
+                return False
+        return True
+
+    def write_cubemap(self) -> List[str]:
+        """Assemble the six written views into ``options.cubemap_layout`` and return the paths.
+
+        Call after :meth:`end`, once every view file is complete. A batch capture writes one cube
+        map per child. Returns an empty list with a warning when the layout cannot be built.
+        """
+
+        options = self.options
+        if options.cubemap_layout == "NONE" or self.errors:
+            return []
+        if options.frames:
+            self.warnings.append("Cube maps are only assembled for single-frame captures.")
+            return []
+        with self.profile.phase("cubemap"):
+            if not self.targets:
+                output_filepath = self._write_cubemap()
+                self.cubemap_filepaths = [output_filepath] if output_filepath else []
+                return self.cubemap_filepaths
+            for collection, _bounds in self.targets[: len(self._target_starts)]:
+                self.options = self._target_options(collection)
+                try:
+                    output_filepath = self._write_cubemap()
+                finally:
+                    self.options = options
+                # Whatever stopped one child, such as missing views, stops them all.
+                if output_filepath is None:
+                    break
+                self.cubemap_filepaths.append(output_filepath)
+        return self.cubemap_filepaths
+
+    def _write_cubemap(self) -> Optional[str]:
+        options = self.options
+        face_paths = [self.output_filepath(view_key) for view_key in VIEW_ORDER]
+        if not all(os.path.exists(path) for path in face_paths):
+            self.warnings.append("Cube maps need all six views; render the 'All Views' set first.")
+            return None
+        if not supports_format(options.image_format):
+            self.warnings.append("Cube maps are unavailable for this format.")
+            return None
+        if 0 < options.tile_size < max(options.resolution):
+            self.warnings.append(
+                "Cube maps are not assembled from tiled views; they would need every full face in memory."
+            )
+            return None
+        faces = np.stack([load_image_pixels(path) for path in face_paths])
+        if faces.shape[1] != faces.shape[2]:
+            self.warnings.append("Cube maps need square views; use the Cube framing.")
+            return None
+        if not options.cube_framing:
+            self.warnings.append("Views were not framed as a cube, so the cube-map faces will not line up.")
+
+        axes = np.stack([view_axes(view_key) for view_key in VIEW_ORDER])
+        self._premultiply_loaded(faces)
+        if options.cubemap_layout == "EQUIRECT":
+            pixels = equirectangular(faces, axes)
+        else:
+            pixels = assemble_layout(faces, axes, options.cubemap_layout)
+
+        filename = f"{options.base_filename}_{options.cubemap_layout.lower()}"
+        target_path = prepare_output_path(options.output_directory, filename)
+        output_filepath = bpy.path.ensure_ext(target_path, EXTENSION_MAP.get(options.image_format, ""))
+        self._write_derived(pixels, output_filepath)
+        return output_filepath
+
+    def write_pyramid(self) -> List[str]:
+        """Write the downsampled copies of every view this capture rendered and return their paths.
+
+        Call after :meth:`end`, like :meth:`write_cubemap`. Each size is filtered from the next
+        larger one, so only the full-size file is read back. Tiled views already wrote their
+        levels from the tile buffer as they finished.
+        """
+
+        options = self.options
+        if not options.pyramid_sizes or self.errors:
+            return self.pyramid_filepaths
+        if not supports_format(options.image_format):
+            self.warnings.append("Downsampled copies are unavailable for this format.")
+            return []
+        with self.profile.phase("pyramid"):
+            for output_filepath in self.output_filepaths:
+                if output_filepath in self._pyramid_written:
+                    continue
+                pixels = load_image_pixels(output_filepath)
+                self._premultiply_loaded(pixels)
+                self._write_levels(output_filepath, pixels, options.pyramid_sizes)
+        if self._pyramid_too_large:
+            sizes = ", ".join(str(size) for size in sorted(self._pyramid_too_large, reverse=True))
+            self.warnings.append(f"Downsampled sizes {sizes} px are not smaller than the render; skipped them.")
+        return self.pyramid_filepaths
+
+    def _write_tiled_pyramid(self, file_pixels: np.ndarray, output_filepath: str) -> None:
+        """Write the levels of a stitched view from its top-down file values, a band of rows at a time."""
+
+        options = self.options
+        height, width = file_pixels.shape[:2]
+        sizes = [size for size in options.pyramid_sizes if size < max(height, width)]
+        self._pyramid_too_large.update(size for size in options.pyramid_sizes if size >= max(height, width))
+        self._pyramid_written.add(output_filepath)
+        if not sizes:
+            return
+        scale = 1.0 / np.iinfo(file_pixels.dtype).max if file_pixels.dtype.kind in "iu" else 1.0
+
+        def read_rows(start: int, stop: int) -> np.ndarray:
+            rows = file_pixels[start:stop].astype(np.float32)
+            if scale != 1.0:
+                rows *= scale
+            self._premultiply_loaded(rows)
+            return rows
+
+        pixels = downsample_rows(read_rows, height, width, sizes[0], options.pyramid_filter)
+        self._write_level(output_filepath, pixels, sizes[0])
+        self._write_levels(output_filepath, pixels, sizes[1:])
+
+    def _write_levels(self, output_filepath: str, pixels: np.ndarray, sizes: Sequence[int]) -> None:
+        """Filter each of ``sizes`` from the previous level, starting at ``pixels``, and write it."""
+
+        for size in sizes:
+            if size >= max(pixels.shape[:2]):
+                self._pyramid_too_large.add(size)
+                continue
+            pixels = downsample(pixels, size, self.options.pyramid_filter)
+            self._write_level(output_filepath, pixels, size)
+
+    def _write_level(self, output_filepath: str, pixels: np.ndarray, size: int) -> None:
+        level_filepath = pyramid_filepath(output_filepath, size)
+        self._write_derived(pixels, level_filepath)
+        self.pyramid_filepaths.append(level_filepath)
+
+    def _premultiply_loaded(self, pixels: np.ndarray) -> None:
+        # PNG stores straight alpha; filter premultiplied values so edges do not fringe.
+        if self.options.image_format != "OPEN_EXR":
+            pixels[..., :3] *= pixels[..., 3:4]
+
+    def _write_derived(self, pixels: np.ndarray, output_filepath: str) -> None:
+        """Store premultiplied pixels derived from the written views in the capture's format."""
+
+        image_format = self.options.image_format
+        if image_format == "OPEN_EXR":
+            file_pixels = pixels.astype(file_dtype(image_format, "16"))
+        else:
+            file_pixels = quantize(unpremultiply(pixels), 8)
+        write_atomically(output_filepath, write_pixels, file_pixels, image_format)
+
+    def render_pixels(self) -> Optional[np.ndarray]:
+        """Render the prepared view in the foreground and return its bottom-up linear pixels."""
+
+        if not self._render(write_still=False):
+            return None
+        return read_render_pixels()
+
+    def end(self) -> None:
+        if self._tiled_view is not None:
+            self._tiled_view[1].close()
+            self._tiled_view = None
+        writer = self.writer
+        self.writer = None
+        self.readback = False
+        self.tiling = False
+        self.atlas = False
+        self.pass_files = ()
+        if writer is not None:
+            # Waits for the outstanding encodes.
+            with self.profile.phase("encode"):
+                self.errors.extend(str(error) for error in writer.shutdown())
+        manifests = self._finished_manifests + ([self.manifest] if self.manifest is not None else [])
+        self.manifest = None
+        self._finished_manifests = []
+        # A failed write may leave an older file behind, so only trust fully successful runs.
+        if not self.errors:
+            for manifest in manifests:
+                manifest.save()
+        self.camera = None
+        self.frame = None
+        self._culled_now = []
+        self._batch_loose = []
+        self.collection, self.options = self._root
+        if self.backup is not None:
+            with self.profile.phase("restore"):
+                restore_scene_settings(self.scene, self.backup)
+            self.backup = None
+        self.profile.stop_profiler()
+
+    def write_index(self, view_keys: Sequence[str]) -> Optional[str]:
+        """Write ``<base_filename>_index.json`` listing every child of a batch capture and its files.
+
+        Call after :meth:`write_cubemap` and :meth:`write_pyramid`. File names are relative to
+        the index. Returns its path, or ``None`` outside batch captures.
+        """
+
+        if not self.targets:
+            return None
+        options = self.options
+        index_path = prepare_output_path(options.output_directory, f"{options.base_filename}_index.json")
+        directory = os.path.dirname(index_path)
+        totals = (len(self.output_filepaths), len(self.skipped_views), len(self.culled_objects))
+        ends = self._target_starts[1:] + [totals]
+        children = []
+        for index, ((collection, bounds), start, end) in enumerate(zip(self.targets, self._target_starts, ends)):
+            outputs = self.output_filepaths[start[0] : end[0]]
+            levels = [pyramid_filepath(path, size) for path in outputs for size in options.pyramid_sizes]
+            children.append(
+                {
+                    "collection": collection.name,
+                    "base_filename": self._target_options(collection).base_filename,
+                    "bounds": {"min": list(bounds.minimum), "max": list(bounds.maximum)},
+                    "outputs": [os.path.relpath(path, directory) for path in outputs],
+                    "downsampled": [os.path.relpath(path, directory) for path in levels if os.path.exists(path)],
+                    "cube_map": (
+                        os.path.relpath(self.cubemap_filepaths[index], directory)
+                        if index < len(self.cubemap_filepaths)
+                        else None
+                    ),
+                    "unchanged_views": self.skipped_views[start[1] : end[1]],
+                    "culled_objects": end[2] - start[2],
+                }
+            )
+        summary = {
+            "collection": self.collection.name,
+            "views": list(view_keys),
+            "complete": len(children) == len(self.targets) and not self.errors,
+            "children": children,
+        }
+        write_atomically(index_path, _write_json, summary)
+        return index_path
+
+    def write_profile(self, view_keys: Sequence[str]) -> Optional[str]:
+        """Append this capture's timings to ``<base_filename>.timings.jsonl`` next to the outputs.
+
+        With ``options.python_profile`` the cProfile stats are also written to ``<base_filename>.prof``.
+        Call last, after :meth:`write_cubemap`; returns the log path, or ``None`` when logging is off.
+        """
+
+        options = self.options
+        self.profile.finish()
+        if options.python_profile:
+            self.profile.dump_profiler(prepare_output_path(options.output_directory, f"{options.base_filename}.prof"))
+        if not options.timing_log:
+            return None
+        record = self.profile.record(
+            collection=self.collection.name,
+            views=list(view_keys),
+            resolution=list(options.resolution),
+            quality=options.quality,
+            frames=len(options.frames) or 1,
+            outputs=len(self.output_filepaths),
+            skipped=len(self.skipped_views),
+            errors=len(self.errors),
+        )
+        log_path = prepare_output_path(options.output_directory, f"{options.base_filename}.timings.jsonl")
+        append_timing_log(log_path, record)
+        return log_path
+
+
+def _write_json(path: str, data: Dict) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2)
+
+
+@dataclass
+class CaptureResult:
+    """Pixels and framing returned by :func:`capture_views`."""
+
+    images: Dict[str, np.ndarray]
+    bounds: Bounds
+    cameras: Dict[str, CameraParameters]
+    resolution: Tuple[int, int]
+    warnings: List[str] = field(default_factory=list)
+
+
+def to_output_pixels(
+    pixels: np.ndarray,
+    dtype: str,
+    view_settings: bpy.types.ColorManagedViewSettings,
+) -> np.ndarray:
+    """Convert bottom-up render pixels to top-down ``float32`` (linear) or ``uint8`` (display) RGBA."""
+
+    top_down = np.ascontiguousarray(pixels[::-1])
+    if dtype == "float32":
+        return top_down
+    display = linear_to_display(
+        unpremultiply(top_down),
+        view_settings.view_transform,
+        view_settings.exposure,
+        view_settings.gamma,
+    )
+    return quantize(display, 8)
+
+
+def capture_views(
+    collection: bpy.types.Collection,
+    views: Sequence[str] = VIEW_ORDER,
+    resolution: Tuple[int, int] = (2048, 2048),
+    *,
+    padding: float = 0.05,
+    pixels_per_unit: float | None = None,
+    dtype: str = "float32",
+    scene: bpy.types.Scene | None = None,
+    view_layer: bpy.types.ViewLayer | None = None,
+    use_scene_lighting: bool = False,
+    isolate_collection: bool = False,
+    cull_threshold: float = 0.0,
+) -> CaptureResult:
+    """Render ``views`` of ``collection`` and return the pixels as NumPy arrays.
+
+    ``dtype="float32"`` returns scene-linear, premultiplied RGBA as Blender stores it in EXR.
+    ``dtype="uint8"`` returns display-referred, straight-alpha RGBA as Blender writes to PNG,
+    which requires the "Standard" or "Raw" view transform. Arrays are top-down ``(H, W, 4)``.
+    With ``pixels_per_unit`` each view is framed tightly at that density and ``resolution`` is
+    ignored; the per-view size is in ``CaptureResult.cameras[view].resolution``.
+    A ``cull_threshold`` above zero hides objects smaller than that many pixels in every view.
+    The scene is restored before returning, also when an error is raised.
+    """
+
+    scene = scene or bpy.context.scene
+    view_layer = view_layer or bpy.context.view_layer
+    if dtype not in {"float32", "uint8"}:
+        raise ValueError(f"Unsupported dtype {dtype!r}; expected 'float32' or 'uint8'.")
+    unknown = [view_key for view_key in views if view_key not in VIEW_ORDER]
+    if unknown:
+        raise ValueError(f"Unsupported views: {', '.join(unknown)}")
+    view_settings = scene.view_settings
+    display_device = scene.display_settings.display_device
+    if dtype == "uint8" and not supports_display_transform(
+        view_settings.view_transform, view_settings.look, display_device
+    ):
+        raise ValueError(
+            f"uint8 output does not support the '{view_settings.view_transform}' view transform "
+            f"on the '{display_device}' display."
+        )
+
+    options = CaptureOptions(
+        resolution=resolution,
+        padding=max(padding, 0.0),
+        pixels_per_unit=pixels_per_unit or 0.0,
+        use_scene_lighting=use_scene_lighting,
+        isolate_collection=isolate_collection,
+        cull_threshold=max(cull_threshold, 0.0),
+    )
+    session = CaptureSession(scene, view_layer, collection, options)
+    bounds = session.compute_bounds(bpy.context.evaluated_depsgraph_get())
+    if bounds is None:
+        raise ValueError(f"Collection '{collection.name}' does not contain renderable geometry.")
+
+    images: Dict[str, np.ndarray] = {}
+    cameras: Dict[str, CameraParameters] = {}
+    try:
+        session.begin(readback=True)
+        for view_key in views:
+            cameras[view_key] = session.prepare_view(view_key)
+            pixels = session.render_pixels()
+            if pixels is None:
+                raise RuntimeError(f"Render of view {view_key} was cancelled.")
+            images[view_key] = to_output_pixels(pixels, dtype, view_settings)
+    finally:
+        session.end()
+
+    return CaptureResult(
+        images=images,
+        bounds=bounds,
+        cameras=cameras,
+        resolution=tuple(resolution),
+        warnings=session.warnings,
+    )
@@ -0,0 +1,213 @@
+"""Vectorized cube-map layouts and equirectangular projection of the six captured faces.
+
+Faces are top-down ``(S, S, C)`` arrays in ``VIEW_ORDER``, described by ``axes``: one ``(3, 3)``
+row-stack per face holding the image right, image up and outward normal directions in world
+space (see ``render_setup.view_axes``). Every layout is produced by sampling the unit cube at
+world-space points, so faces land where their texels physically sit on the box regardless of how
+each view's camera is rolled.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+CUBEMAP_LAYOUTS = ("HORIZONTAL_CROSS", "VERTICAL_CROSS", "STRIP", "EQUIRECT")
+# Output pixels sampled per pass; small enough that the per-pixel temporaries stay in cache.
+_BAND_PIXELS = 1 << 15
+
+# Unfolded net cells as (column, row, matrix). The matrix maps cell coordinates ``(s, t, 1)``,
+# with ``s`` running left to right and ``t`` bottom to top over ``[-1, 1]``, to coefficients of the
+# centre face's right, up and normal axes, i.e. a point on the cube surface.
+_CENTER = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+_RIGHT = ((0, 0, 1), (0, 1, 0), (-1, 0, 0))
+_LEFT = ((0, 0, -1), (0, 1, 0), (1, 0, 0))
+_TOP = ((1, 0, 0), (0, 0, 1), (0, -1, 0))
+_BOTTOM = ((1, 0, 0), (0, 0, -1), (0, 1, 0))
+_BACK_BESIDE_RIGHT = ((-1, 0, 0), (0, 1, 0), (0, 0, -1))
+_BACK_BELOW_BOTTOM = ((1, 0, 0), (0, -1, 0), (0, 0, -1))
+
+_NETS: Dict[str, Tuple[int, int, Tuple]] = {
+    "HORIZONTAL_CROSS": (
+        4,
+        3,
+        ((1, 0, _TOP), (0, 1, _LEFT), (1, 1, _CENTER), (2, 1, _RIGHT), (3, 1, _BACK_BESIDE_RIGHT), (1, 2, _BOTTOM)),
+    ),
+    "VERTICAL_CROSS": (
+        3,
+        4,
+        ((1, 0, _TOP), (0, 1, _LEFT), (1, 1, _CENTER), (2, 1, _RIGHT), (1, 2, _BOTTOM), (1, 3, _BACK_BELOW_BOTTOM)),
+    ),
+}
+
+
+def _validate_faces(faces: np.ndarray, axes: np.ndarray) -> int:
+    if faces.ndim != 4 or faces.shape[0] != 6 or faces.shape[1] != faces.shape[2]:
+        raise ValueError(f"Expected six square faces shaped (6, S, S, C), got {faces.shape}.")
+    if axes.shape != (6, 3, 3):
+        raise ValueError(f"Expected face axes shaped (6, 3, 3), got {axes.shape}.")
+    return faces.shape[1]
+
+
+def _axis_lookup(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split axis-aligned unit vectors into their world axis index and sign."""
+
+    index = np.abs(vectors).argmax(axis=-1)
+    sign = np.take_along_axis(vectors, index[..., None], axis=-1)[..., 0]
+    return index, np.sign(sign).astype(np.float32)
+
+
+def sample_cube(
+    faces: np.ndarray,
+    axes: np.ndarray,
+    points: np.ndarray,
+    bilinear: bool = True,
+) -> np.ndarray:
+    """Sample ``faces`` in the directions ``points`` (``(..., 3)``, world space, any length).
+
+    Callers sampling large images should pass them in bands; every temporary here is per point.
+    """
+
+    size = _validate_faces(faces, axes)
+    points = np.asarray(points, dtype=np.float32)
+    shape = points.shape[:-1]
+    channels = faces.shape[-1]
+    # Contiguous components; arithmetic on strided (N, 3) columns is several times slower.
+    components = [np.ascontiguousarray(points[..., axis]).reshape(-1) for axis in range(3)]
+    magnitudes = [np.abs(component) for component in components]
+    along_x = (magnitudes[0] >= magnitudes[1]) & (magnitudes[0] >= magnitudes[2])
+    along_y = ~along_x & (magnitudes[1] >= magnitudes[2])
+    major = np.where(along_x, 0, np.where(along_y, 1, 2)).astype(np.int8)
+
+    right_axis, right_sign = _axis_lookup(axes[:, 0])
+    up_axis, up_sign = _axis_lookup(axes[:, 1])
+    normal_axis, normal_sign = _axis_lookup(axes[:, 2])
+    u = np.zeros_like(components[0])
+    v = np.zeros_like(components[0])
+    depth = np.zeros_like(components[0])
+    face = np.zeros(u.shape, dtype=np.int32)
+    for index in range(6):
+        normal = components[normal_axis[index]]
+        facing = (normal > 0) if normal_sign[index] > 0 else (normal <= 0)
+        selected = (major == normal_axis[index]) & facing
+        face[selected] = index
+        np.copyto(u, components[right_axis[index]] * right_sign[index], where=selected)
+        np.copyto(v, components[up_axis[index]] * up_sign[index], where=selected)
+        np.copyto(depth, normal * normal_sign[index], where=selected)
+    scale = np.divide(np.float32(1.0), depth, out=np.zeros_like(depth), where=depth > 0)
+
+    # Texel centres sit at half-pixel offsets; rows run top-down.
+    half = np.float32(0.5 * size)
+    x = np.clip((u * scale + 1.0) * half - 0.5, 0.0, size - 1)
+    y = np.clip((1.0 - v * scale) * half - 0.5, 0.0, size - 1)
+    rows = np.ascontiguousarray(faces).reshape(6 * size * size, channels)
+    # Whole texels as opaque items: one ``take`` per tap instead of a 2-D fancy index.
+    texels = rows.view(np.dtype((np.void, rows.strides[0]))).reshape(-1)
+    index_type = np.int32 if rows.shape[0] < 2**31 else np.int64
+    base = face.astype(index_type) * (size * size)
+
+    def fetch(index: np.ndarray) -> np.ndarray:
+        return np.take(texels, index).view(rows.dtype).reshape(-1)
+
+    if not bilinear:
+        nearest = fetch(base + np.rint(y).astype(index_type) * size + np.rint(x).astype(index_type))
+        return nearest.reshape(shape + (channels,))
+
+    x0 = x.astype(index_type)
+    y0 = y.astype(index_type)
+    x1 = np.minimum(x0 + 1, size - 1)
+    # Per-channel weights as flat arrays; broadcasting an (N, 1) weight over (N, C) is far slower.
+    wx = np.repeat(x - x0, channels)
+    wy = np.repeat(y - y0, channels)
+
+    def lerp_row(row: np.ndarray) -> np.ndarray:
+        left = fetch(row + x0)
+        right = fetch(row + x1)
+        right -= left
+        right *= wx
+        left += right
+        return left
+
+    top = lerp_row(base + y0 * size)
+    bottom = lerp_row(base + np.minimum(y0 + 1, size - 1) * size)
+    bottom -= top
+    bottom *= wy
+    top += bottom
+    return top.reshape(shape + (channels,))
+
+
+def _bands(height: int, width: int) -> Iterator[Tuple[int, int]]:
+    """Yield ``(start, stop)`` row ranges covering about :data:`_BAND_PIXELS` output pixels each."""
+
+    step = max(_BAND_PIXELS // max(width, 1), 1)
+    for start in range(0, height, step):
+        yield start, min(start + step, height)
+
+
+def _cell_points(size: int, matrix: Tuple, center_axes: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Return the cube points of rows ``start:stop`` of a net cell."""
+
+    coords = (np.arange(size, dtype=np.float32) + 0.5) * (2.0 / size) - 1.0
+    s, t = np.meshgrid(coords, coords[::-1][start:stop])
+    cell = np.stack((s, t, np.ones_like(s)), axis=-1)
+    return cell @ np.asarray(matrix, dtype=np.float32).T @ center_axes
+
+
+def assemble_layout(faces: np.ndarray, axes: np.ndarray, layout: str, center: int = 0) -> np.ndarray:
+    """Arrange the faces as a cross or strip, with face ``center`` in the middle of a cross.
+
+    Empty cells of a cross are zero, i.e. transparent.
+    """
+
+    size = _validate_faces(faces, axes)
+    if layout == "STRIP":
+        return np.concatenate(list(faces), axis=1)
+    if layout not in _NETS:
+        raise ValueError(f"Unsupported cube-map layout {layout!r}.")
+    columns, rows, cells = _NETS[layout]
+    output = np.zeros((rows * size, columns * size, faces.shape[-1]), dtype=faces.dtype)
+    center_axes = axes[center].astype(np.float32)
+    for column, row, matrix in cells:
+        for start, stop in _bands(size, size):
+            points = _cell_points(size, matrix, center_axes, start, stop)
+            output[row * size + start : row * size + stop, column * size : (column + 1) * size] = sample_cube(
+                faces, axes, points, bilinear=False
+            )
+    return output
+
+
+def equirect_directions(width: int, height: int, start: int = 0, stop: int | None = None) -> np.ndarray:
+    """Return the world directions of rows ``start:stop`` of an equirectangular image.
+
+    The result is ``(rows, W, 3)`` float32 in Blender's convention: the image centre looks along
+    +X and the top row looks along +Z, matching the Environment Texture node, so the result can be
+    used directly as a world texture.
+    """
+
+    stop = height if stop is None else stop
+    longitude = (0.5 - (np.arange(width, dtype=np.float32) + 0.5) / width) * np.float32(2.0 * np.pi)
+    rows = np.arange(start, stop, dtype=np.float32)
+    latitude = (0.5 - (rows + 0.5) / height) * np.float32(np.pi)
+    cos_latitude = np.cos(latitude)[:, None]
+    directions = np.empty((stop - start, width, 3), dtype=np.float32)
+    directions[..., 0] = cos_latitude * np.cos(longitude)[None, :]
+    directions[..., 1] = cos_latitude * np.sin(longitude)[None, :]
+    directions[..., 2] = np.sin(latitude)[:, None]
+    return directions
+
+
+def equirectangular(faces: np.ndarray, axes: np.ndarray, width: int | None = None) -> np.ndarray:
+    """Project the faces to a ``width`` x ``width / 2`` equirectangular image (default ``2 * S``).
+
+    Rows are sampled in bands, so memory stays bounded by the output image, not its temporaries.
+    """
+
+    size = _validate_faces(faces, axes)
+    width = width or size * 2
+    height = max(width // 2, 1)
+    faces = faces.astype(np.float32, copy=False)
+    output = np.empty((height, width, faces.shape[-1]), dtype=np.float32)
+    for start, stop in _bands(height, width):
+        output[start:stop] = sample_cube(faces, axes, equirect_directions(width, height, start, stop))
+    return output
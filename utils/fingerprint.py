@@ -0,0 +1,271 @@
+"""Content fingerprints and the output manifest used to skip unchanged views."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+import bpy
+import numpy as np
+from bpy.types import Depsgraph, ViewLayer
+
+from . import bounds_cache
+from .bounding_box import RENDERABLE_TYPES
+from .render_setup import _VIEW_DIRECTIONS
+
+MANIFEST_VERSION = 1
+_SIMPLE_PROPERTY_TYPES = frozenset({"BOOLEAN", "INT", "FLOAT", "STRING", "ENUM"})
+# Editor-only node state that never changes a render.
+_IGNORED_NODE_PROPERTIES = frozenset(
+    {
+        "rna_type",
+        "name",
+        "label",
+        "location",
+        "width",
+        "height",
+        "dimensions",
+        "select",
+        "show_options",
+        "show_preview",
+        "show_texture",
+        "hide",
+        "color",
+        "use_custom_color",
+        "parent",
+        "internal_links",
+        "inputs",
+        "outputs",
+    }
+)
+
+
+def _rna_value(value: Any) -> Any:
+    if isinstance(value, bpy.types.ID):
+        return value.name_full
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    try:
+        return [_rna_value(item) for item in value]
+    except TypeError:
+        # Nested structs have no stable value representation; their type is the best proxy.
+        return type(value).__name__
+
+
+def _file_signature(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _image_signature(image: bpy.types.Image) -> str:
+    """Identify an image by its source and the files behind it, so re-exported textures are noticed."""
+
+    path = bpy.path.abspath(image.filepath_raw, library=image.library)
+    if image.source == "TILED":
+        files = [_file_signature(path.replace("<UDIM>", str(tile.number))) for tile in image.tiles]
+    else:
+        files = [_file_signature(path)]
+    packed = image.packed_file.size if image.packed_file is not None else None
+    return f"{image.filepath_raw}|{image.source}|{image.is_dirty}|{files}|{packed}"
+
+
+def _node_tree_digest(node_tree: bpy.types.NodeTree, hasher, seen: set) -> None:
+    if node_tree is None or node_tree.name_full in seen:
+        return
+    seen.add(node_tree.name_full)
+    for node in sorted(node_tree.nodes, key=lambda item: item.name):
+        values = [node.bl_idname, node.name, node.mute]
+        for prop in node.bl_rna.properties:
+            if prop.identifier in _IGNORED_NODE_PROPERTIES or prop.identifier.startswith("bl_"):
+                continue
+            value = getattr(node, prop.identifier, None)
+            if prop.type in _SIMPLE_PROPERTY_TYPES or isinstance(value, bpy.types.ID):
+                values.append((prop.identifier, _rna_value(value)))
+        for socket in node.inputs:
+            if hasattr(socket, "default_value"):
+                values.append((socket.identifier, _rna_value(socket.default_value)))
+        hasher.update(repr(values).encode())
+        sub_tree = getattr(node, "node_tree", None)
+        if sub_tree is not None:
+            _node_tree_digest(sub_tree, hasher, seen)
+        image = getattr(node, "image", None)
+        if image is not None:
+            hasher.update(_image_signature(image).encode())
+    links = sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier, link.is_muted)
+        for link in node_tree.links
+    )
+    hasher.update(repr(links).encode())
+
+
+def material_digest(material: Optional[bpy.types.Material], hasher, seen: set) -> None:
+    if material is None:
+        hasher.update(b"<none>")
+        return
+    hasher.update(material.name_full.encode())
+    hasher.update(repr(_rna_value(material.diffuse_color)).encode())
+    if material.use_nodes:
+        _node_tree_digest(material.node_tree, hasher, seen)
+
+
+def _mesh_digest(mesh: bpy.types.Mesh) -> bytes:
+    hasher = hashlib.blake2b(digest_size=16)
+    for collection, attribute, dtype, width in (
+        (mesh.vertices, "co", np.float32, 3),
+        (mesh.loops, "vertex_index", np.int32, 1),
+        (mesh.polygons, "loop_total", np.int32, 1),
+        (mesh.polygons, "material_index", np.int32, 1),
+    ):
+        buffer = np.empty(len(collection) * width, dtype=dtype)
+        collection.foreach_get(attribute, buffer)
+        hasher.update(buffer.tobytes())
+    for uv_layer in mesh.uv_layers:
+        hasher.update(f"{uv_layer.name}|{uv_layer.active_render}".encode())
+        buffer = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", buffer)
+        hasher.update(buffer.tobytes())
+    return hasher.digest()
+
+
+def _object_digest(
+    obj: bpy.types.Object,
+    depsgraph: Depsgraph,
+    hasher,
+    mesh_digests: Dict[int, bytes],
+    seen_trees: set,
+) -> None:
+    evaluated = obj.evaluated_get(depsgraph)
+    hasher.update(obj.name_full.encode())
+    hasher.update(np.asarray(evaluated.matrix_world, dtype=np.float32).tobytes())
+    data = evaluated.data
+    if isinstance(data, bpy.types.Mesh):
+        key = data.as_pointer()
+        if key not in mesh_digests:
+            mesh_digests[key] = _mesh_digest(data)
+        hasher.update(mesh_digests[key])
+    elif isinstance(data, bpy.types.Light):
+        values = [
+            (prop.identifier, _rna_value(getattr(data, prop.identifier)))
+            for prop in data.bl_rna.properties
+            if prop.type in _SIMPLE_PROPERTY_TYPES and prop.identifier != "rna_type"
+        ]
+        hasher.update(repr(values).encode())
+        if data.use_nodes:
+            _node_tree_digest(data.node_tree, hasher, seen_trees)
+    elif data is not None:
+        hasher.update(data.name_full.encode())
+        hasher.update(np.asarray(evaluated.bound_box, dtype=np.float32).tobytes())
+    for slot in evaluated.material_slots:
+        material_digest(slot.material, hasher, seen_trees)
+
+
+def _renders(obj: bpy.types.Object, view_layer: ViewLayer | None) -> bool:
+    return not obj.hide_render and (view_layer is None or obj.visible_get(view_layer=view_layer))
+
+
+def collection_fingerprint(
+    collection: bpy.types.Collection,
+    depsgraph: Depsgraph,
+    view_layer: ViewLayer | None = None,
+) -> str:
+    """Hash transforms, evaluated geometry and materials of everything a capture would frame."""
+
+    hasher = hashlib.blake2b(digest_size=20)
+    uids, aabbs = bounds_cache.BOUNDS_CACHE.collection_aabbs(collection, depsgraph=depsgraph, view_layer=view_layer)
+    hasher.update(uids.tobytes())
+    hasher.update(np.round(aabbs, 6).tobytes())
+
+    mesh_digests: Dict[int, bytes] = {}
+    seen_trees: set = set()
+    for obj in sorted(collection.all_objects, key=lambda item: item.name_full):  # type: ignore[attr-defined]
+        if _renders(obj, view_layer):
+            _object_digest(obj, depsgraph, hasher, mesh_digests, seen_trees)
+    return hasher.hexdigest()
+
+
+def surroundings_fingerprint(
+    scene: bpy.types.Scene,
+    collection: bpy.types.Collection,
+    depsgraph: Depsgraph,
+    view_layer: ViewLayer | None = None,
+) -> str:
+    """Hash the renderable objects and lights outside ``collection`` that also appear in its views."""
+
+    members = {obj.session_uid for obj in collection.all_objects}  # type: ignore[attr-defined]
+    hasher = hashlib.blake2b(digest_size=20)
+    mesh_digests: Dict[int, bytes] = {}
+    seen_trees: set = set()
+    for obj in sorted(scene.objects, key=lambda item: item.name_full):
+        if obj.session_uid in members or (obj.type not in RENDERABLE_TYPES and obj.type != "LIGHT"):
+            continue
+        if _renders(obj, view_layer):
+            _object_digest(obj, depsgraph, hasher, mesh_digests, seen_trees)
+    return hasher.hexdigest()
+
+
+def options_fingerprint(values: Iterable[Any], scene: bpy.types.Scene) -> str:
+    """Hash capture option values together with the render engine and the scene's color management."""
+
+    view_settings = scene.view_settings
+    payload = [
+        list(values),
+        scene.render.engine,
+        scene.display_settings.display_device,
+        view_settings.view_transform,
+        view_settings.look,
+        view_settings.exposure,
+        view_settings.gamma,
+    ]
+    return hashlib.blake2b(repr(payload).encode(), digest_size=20).hexdigest()
+
+
+def view_fingerprint(content: str, options: str, view_key: str) -> str:
+    direction, up, depth_axis, plane_axes = _VIEW_DIRECTIONS[view_key]
+    payload = [content, options, view_key, tuple(direction), tuple(up), depth_axis, plane_axes]
+    return hashlib.blake2b(repr(payload).encode(), digest_size=20).hexdigest()
+
+
+def world_fingerprint(scene: bpy.types.Scene) -> str:
+    hasher = hashlib.blake2b(digest_size=20)
+    world = scene.world
+    if world is not None:
+        hasher.update(world.name_full.encode())
+        if world.use_nodes:
+            _node_tree_digest(world.node_tree, hasher, set())
+    return hasher.hexdigest()
+
+
+class CaptureManifest:
+    """Per-view fingerprints stored next to the outputs as ``<base_filename>.manifest.json``."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.views: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") == MANIFEST_VERSION:
+                self.views = dict(data.get("views", {}))
+
+    def is_current(self, view_key: str, fingerprint: str, filepath: str) -> bool:
+        entry = self.views.get(view_key)
+        return bool(entry and entry.get("fingerprint") == fingerprint and os.path.exists(filepath))
+
+    def record(self, view_key: str, fingerprint: str, filepath: str) -> None:
+        self.views[view_key] = {"fingerprint": fingerprint, "file": os.path.basename(filepath)}
+
+    def save(self) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": MANIFEST_VERSION, "views": self.views}, handle, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
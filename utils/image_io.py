@@ -0,0 +1,240 @@
+"""Pixel conversion and image encoding that can run off Blender's main thread.
+
+Nothing in this module touches ``bpy``; callers read pixels on the main thread and hand the
+NumPy buffers over, so encoding and file I/O can overlap with the next render.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+try:  # Bundled with recent Blender builds; only needed for EXR output.
+    import OpenImageIO as oiio
+except ImportError:  # pragma: no cover - depends on the Blender build
+    oiio = None
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_ROWS_PER_CHUNK = 256
+_DISPLAY_TRANSFORMS = frozenset({"Standard", "Raw"})
+
+
+def supports_display_transform(view_transform: str, look: str = "None", display_device: str = "sRGB") -> bool:
+    """Return whether :func:`linear_to_display` reproduces Blender's output for this view.
+
+    The encoder only knows the sRGB curve, so other display devices need Blender's own writer.
+    """
+
+    return display_device == "sRGB" and view_transform in _DISPLAY_TRANSFORMS and look in {"None", ""}
+
+
+def supports_format(file_format: str) -> bool:
+    return file_format == "PNG" or (file_format == "OPEN_EXR" and oiio is not None)
+
+
+def unpremultiply(pixels: np.ndarray) -> np.ndarray:
+    """Convert premultiplied RGBA floats to straight alpha, leaving transparent pixels black."""
+
+    alpha = pixels[..., 3:4]
+    rgb = np.divide(pixels[..., :3], alpha, out=np.zeros_like(pixels[..., :3]), where=alpha > 0.0)
+    return np.concatenate((rgb, alpha), axis=-1)
+
+
+def linear_to_display(
+    pixels: np.ndarray,
+    view_transform: str = "Standard",
+    exposure: float = 0.0,
+    gamma: float = 1.0,
+) -> np.ndarray:
+    """Apply the sRGB display transform Blender uses for "Standard" (or none for "Raw")."""
+
+    rgb = pixels[..., :3] * (2.0**exposure)
+    if view_transform != "Raw":
+        rgb = np.clip(rgb, 0.0, 1.0)
+        rgb = np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * np.power(rgb, 1.0 / 2.4) - 0.055)
+    if gamma != 1.0:
+        rgb = np.power(np.clip(rgb, 0.0, None), 1.0 / gamma)
+    return np.concatenate((rgb, pixels[..., 3:4]), axis=-1)
+
+
+def quantize(pixels: np.ndarray, bit_depth: int = 8) -> np.ndarray:
+    scale = (1 << bit_depth) - 1
+    dtype = np.uint8 if bit_depth == 8 else np.uint16
+    return np.rint(np.clip(pixels, 0.0, 1.0) * scale).astype(dtype)
+
+
+def _png_chunk(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+
+def write_png(path: str, pixels: np.ndarray, compress_level: int = 6) -> None:
+    """Write a top-down ``(H, W, C)`` uint8/uint16 array as PNG, streaming rows through zlib.
+
+    ``pixels`` may be a memory-mapped array; only ``_ROWS_PER_CHUNK`` rows are held in memory
+    at a time.
+    """
+
+    height, width, channels = pixels.shape
+    bit_depth = 16 if pixels.dtype == np.uint16 else 8
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    compressor = zlib.compressobj(compress_level)
+    header = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+
+    with open(path, "wb") as handle:
+        handle.write(_PNG_SIGNATURE)
+        handle.write(_png_chunk(b"IHDR", header))
+        for start in range(0, height, _ROWS_PER_CHUNK):
+            rows = np.ascontiguousarray(pixels[start : start + _ROWS_PER_CHUNK])
+            if bit_depth == 16:
+                rows = rows.astype(">u2")
+            rows = rows.reshape(rows.shape[0], -1).view(np.uint8)
+            # Filter type 0 (None) prefixes every scanline.
+            filtered = np.concatenate((np.zeros((rows.shape[0], 1), dtype=np.uint8), rows), axis=1)
+            data = compressor.compress(filtered.tobytes())
+            if data:
+                handle.write(_png_chunk(b"IDAT", data))
+        handle.write(_png_chunk(b"IDAT", compressor.flush()))
+        handle.write(_png_chunk(b"IEND", b""))
+
+
+def write_exr(path: str, pixels: np.ndarray, half: bool = True) -> None:
+    """Write a top-down ``(H, W, C)`` float array as OpenEXR through OpenImageIO.
+
+    Like :func:`write_png`, scanlines are written in chunks so ``pixels`` may be memory-mapped.
+    """
+
+    if oiio is None:
+        raise RuntimeError("OpenEXR output off the main thread requires the OpenImageIO module.")
+    height, width, channels = pixels.shape
+    output = oiio.ImageOutput.create(path)
+    if output is None:
+        raise RuntimeError(f"Could not create an EXR writer for {path}: {oiio.geterror()}")
+    spec = oiio.ImageSpec(width, height, channels, "half" if half else "float")
+    spec.attribute("compression", "zip")
+    try:
+        if not output.open(path, spec):
+            raise RuntimeError(f"Failed to write {path}: {output.geterror()}")
+        for start in range(0, height, _ROWS_PER_CHUNK):
+            rows = np.ascontiguousarray(pixels[start : start + _ROWS_PER_CHUNK], dtype=np.float32)
+            if not output.write_scanlines(start, start + rows.shape[0], 0, rows):
+                raise RuntimeError(f"Failed to write {path}: {output.geterror()}")
+    finally:
+        output.close()
+
+
+def encode_render(
+    path: str,
+    pixels: np.ndarray,
+    file_format: str,
+    view_transform: str = "Standard",
+    exposure: float = 0.0,
+    gamma: float = 1.0,
+    color_depth: str = "8",
+) -> None:
+    """Encode bottom-up, premultiplied linear RGBA render pixels the way Blender would save them."""
+
+    file_pixels = to_file_pixels(pixels[::-1], file_format, view_transform, exposure, gamma, color_depth)
+    write_pixels(path, file_pixels, file_format)
+
+
+def file_dtype(file_format: str, color_depth: str = "8") -> np.dtype:
+    """Return the dtype :func:`to_file_pixels` produces for ``file_format``."""
+
+    if file_format == "OPEN_EXR":
+        return np.dtype(np.float16 if color_depth == "16" else np.float32)
+    return np.dtype(np.uint16 if color_depth == "16" else np.uint8)
+
+
+def to_file_pixels(
+    pixels: np.ndarray,
+    file_format: str,
+    view_transform: str = "Standard",
+    exposure: float = 0.0,
+    gamma: float = 1.0,
+    color_depth: str = "8",
+) -> np.ndarray:
+    """Convert top-down, premultiplied linear RGBA to the values stored in ``file_format``."""
+
+    dtype = file_dtype(file_format, color_depth)
+    if file_format == "OPEN_EXR":
+        return pixels.astype(dtype)
+    display = linear_to_display(unpremultiply(pixels), view_transform, exposure, gamma)
+    return quantize(display, dtype.itemsize * 8)
+
+
+def write_pixels(path: str, file_pixels: np.ndarray, file_format: str) -> None:
+    """Write top-down pixels produced by :func:`to_file_pixels`."""
+
+    if file_format == "OPEN_EXR":
+        write_exr(path, file_pixels, half=file_pixels.dtype == np.float16)
+    else:
+        write_png(path, file_pixels)
+
+
+class AsyncImageWriter:
+    """Bounded thread pool for image encoding and file writes.
+
+    :meth:`submit` blocks once ``max_pending`` writes are queued, which caps how many full-size
+    pixel buffers are alive at once. :meth:`wait` returns the errors of failed writes.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: Optional[int] = None) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix="CubeCaptureWrite")
+        self._slots = threading.BoundedSemaphore(max_pending or max(max_workers, 1) * 2)
+        self._futures: List[Future] = []
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        self._slots.acquire()
+
+        def run():
+            try:
+                func(*args, **kwargs)
+            finally:
+                self._slots.release()
+
+        future = self._executor.submit(run)
+        self._futures.append(future)
+        return future
+
+    def submit_render(self, path: str, pixels: np.ndarray, **encode_kwargs) -> Future:
+        return self.submit(_encode_atomically, path, pixels, **encode_kwargs)
+
+    def wait(self) -> List[BaseException]:
+        errors = [error for error in (future.exception() for future in self._futures) if error is not None]
+        self._futures.clear()
+        return errors
+
+    def shutdown(self) -> List[BaseException]:
+        errors = self.wait()
+        self._executor.shutdown(wait=True)
+        return errors
+
+
+def temporary_path(path: str) -> str:
+    """Return a hidden sibling of ``path`` with the same extension, for write-then-rename."""
+
+    directory, filename = os.path.split(path)
+    stem, extension = os.path.splitext(filename)
+    return os.path.join(directory, f".{stem}.tmp{extension}")
+
+
+def write_atomically(path: str, write, *args, **kwargs) -> None:
+    """Call ``write(temp_path, *args, **kwargs)`` and move the result over ``path`` on success."""
+
+    temp_path = temporary_path(path)
+    try:
+        write(temp_path, *args, **kwargs)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _encode_atomically(path: str, pixels: np.ndarray, **encode_kwargs) -> None:
+    write_atomically(path, encode_render, pixels, **encode_kwargs)
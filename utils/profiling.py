@@ -0,0 +1,111 @@
+"""Phase timing for captures and the structured timing log.
+
+A :class:`CaptureProfile` collects wall time per phase of one capture. Phases may nest; each
+phase is charged only the time not spent in the phases inside it, so the breakdown adds up to
+the time the capture spent in timed code. Operators that render in the background add the
+render phase themselves with :meth:`CaptureProfile.add`, since those renders finish outside any
+Python call.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Display order of the known phases; anything else follows in the order it was first timed.
+PHASES = ("bounds", "fingerprint", "setup", "lighting", "sync", "render", "encode", "restore", "cubemap", "pyramid")
+
+
+class CaptureProfile:
+    """Wall-clock breakdown of one capture, with an optional cProfile of the same span."""
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.wall = 0.0
+        self._started = time.perf_counter()
+        # Time spent in nested phases, per open phase.
+        self._stack: List[float] = []
+        self._profiler: cProfile.Profile | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.add(name, elapsed - nested)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def finish(self) -> None:
+        """Stop the wall clock; the gap to the timed phases is reported as ``other``."""
+
+        self.wall = time.perf_counter() - self._started
+
+    def breakdown(self) -> List[Tuple[str, float, int]]:
+        """Return ``(phase, seconds, count)`` rows in display order."""
+
+        names = [name for name in PHASES if name in self.seconds]
+        names += [name for name in self.seconds if name not in PHASES]
+        rows = [(name, self.seconds[name], self.counts[name]) for name in names]
+        other = self.wall - sum(self.seconds.values())
+        if other > 0.0005:
+            rows.append(("other", other, 1))
+        return rows
+
+    def record(self, **context: Any) -> Dict[str, Any]:
+        """Return a JSON-serialisable record of the breakdown, merged with ``context``."""
+
+        return {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **context,
+            "wall": round(self.wall, 6),
+            "phases": {
+                name: {"seconds": round(seconds, 6), "count": count} for name, seconds, count in self.breakdown()
+            },
+        }
+
+    def start_profiler(self) -> bool:
+        """Start collecting a cProfile; returns ``False`` if another profiler is already active."""
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return False
+        self._profiler = profiler
+        return True
+
+    def stop_profiler(self) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    def dump_profiler(self, path: str) -> bool:
+        """Write the collected cProfile stats to ``path``, readable with :mod:`pstats` or snakeviz."""
+
+        profiler = self._profiler
+        if profiler is None:
+            return False
+        profiler.disable()
+        profiler.dump_stats(path)
+        self._profiler = None
+        return True
+
+
+def append_timing_log(path: str, record: Dict[str, Any]) -> None:
+    """Append ``record`` to the JSON-lines log at ``path``."""
+
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record, sort_keys=False) + "\n")
@@ -0,0 +1,167 @@
+"""Extra render passes (depth, normal, object ID, mask) written from the same render as the image.
+
+Multilayer EXR output stores the enabled view-layer passes itself. For PNG and single-layer EXR,
+a temporary File Output node writes one extra file per pass next to the main image; it is
+removed with the other ``CubeCapture`` compositor nodes by ``restore_scene_settings``.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Sequence
+
+import bpy
+
+from .render_setup import _TEMP_NODE_PREFIX, CameraParameters, render_layers_node
+
+PASS_KEYS = ("DEPTH", "NORMAL", "OBJECT_ID", "MASK")
+_PASS_SOCKETS = {"DEPTH": "Depth", "NORMAL": "Normal", "OBJECT_ID": "IndexOB", "MASK": "Alpha"}
+_PASS_COLOR_MODES = {"DEPTH": "BW", "NORMAL": "RGB", "OBJECT_ID": "BW", "MASK": "BW"}
+_PASS_NODE_NAME = f"{_TEMP_NODE_PREFIX}Passes"
+_DEPTH_RANGE_NODE_NAME = f"{_TEMP_NODE_PREFIX}DepthRange"
+# 16-bit PNG stores object indices exactly when scaled by this factor.
+_PNG_INDEX_SCALE = 65535.0
+
+
+def object_index_supported(scene: bpy.types.Scene) -> bool:
+    """Whether the engine renders the Object Index pass; Eevee only offers Cryptomatte."""
+
+    return scene.render.engine == "CYCLES"
+
+
+def assign_object_indices(collection: bpy.types.Collection) -> Dict[int, str]:
+    """Give every object in ``collection`` a unique pass index and return the index to name map.
+
+    Take the backup with ``indexed=collection`` first so the original indices are restored.
+    """
+
+    names = sorted(obj.name for obj in collection.all_objects)  # type: ignore[attr-defined]
+    mapping = {}
+    for index, name in enumerate(names, start=1):
+        bpy.data.objects[name].pass_index = index
+        mapping[index] = name
+    return mapping
+
+
+def enable_view_layer_passes(scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer, passes: Sequence[str]) -> None:
+    if "DEPTH" in passes:
+        view_layer.use_pass_z = True
+    if "NORMAL" in passes:
+        view_layer.use_pass_normal = True
+    if "OBJECT_ID" in passes:
+        if object_index_supported(scene):
+            view_layer.use_pass_object_index = True
+        else:
+            view_layer.use_pass_cryptomatte_object = True
+
+
+def _configure_format(image_format, file_format: str, color_mode: str) -> None:
+    image_format.file_format = file_format
+    image_format.color_mode = color_mode
+    image_format.color_depth = "16" if file_format == "PNG" else "32"
+    # Pass values are data, never display colors.
+    image_format.color_management = "OVERRIDE"
+    image_format.view_settings.view_transform = "Raw"
+    image_format.view_settings.look = "None"
+
+
+def _png_pass_socket(node_tree: bpy.types.NodeTree, pass_key: str, socket: bpy.types.NodeSocket):
+    """Remap a pass into the 0-1 range PNG can store; depth limits are set per view."""
+
+    nodes = node_tree.nodes
+    links = node_tree.links
+    if pass_key == "DEPTH":
+        depth_range = nodes.new(type="CompositorNodeMapRange")
+        depth_range.name = _DEPTH_RANGE_NODE_NAME
+        depth_range.use_clamp = True
+        links.new(socket, depth_range.inputs["Value"])
+        return depth_range.outputs[0]
+    if pass_key == "NORMAL":
+        # n * 0.5 + 0.5, the usual normal-map encoding.
+        scale = nodes.new(type="CompositorNodeMixRGB")
+        scale.name = f"{_TEMP_NODE_PREFIX}NormalScale"
+        scale.blend_type = "MULTIPLY"
+        scale.inputs[2].default_value = (0.5, 0.5, 0.5, 1.0)
+        offset = nodes.new(type="CompositorNodeMixRGB")
+        offset.name = f"{_TEMP_NODE_PREFIX}NormalOffset"
+        offset.blend_type = "ADD"
+        offset.inputs[2].default_value = (0.5, 0.5, 0.5, 1.0)
+        links.new(socket, scale.inputs[1])
+        links.new(scale.outputs[0], offset.inputs[1])
+        return offset.outputs[0]
+    if pass_key == "OBJECT_ID":
+        divide = nodes.new(type="CompositorNodeMath")
+        divide.name = f"{_TEMP_NODE_PREFIX}IndexScale"
+        divide.operation = "DIVIDE"
+        divide.inputs[1].default_value = _PNG_INDEX_SCALE
+        links.new(socket, divide.inputs[0])
+        return divide.outputs[0]
+    return socket
+
+
+def add_pass_file_outputs(
+    scene: bpy.types.Scene,
+    view_layer: bpy.types.ViewLayer,
+    passes: Sequence[str],
+    file_format: str,
+) -> None:
+    """Write ``passes`` as extra files through a temporary File Output node.
+
+    PNG passes are 16-bit: depth is mapped from the view's clip range to 0-1, normals are
+    encoded as ``n * 0.5 + 0.5`` and object indices are divided by 65535. EXR passes are raw.
+    """
+
+    render_layers = render_layers_node(scene, view_layer)
+    node_tree = scene.node_tree
+    output = node_tree.nodes.new(type="CompositorNodeOutputFile")
+    output.name = _PASS_NODE_NAME
+    _configure_format(output.format, file_format, "RGB")
+    output.file_slots.clear()
+    for pass_key in passes:
+        socket = render_layers.outputs[_PASS_SOCKETS[pass_key]]
+        if file_format == "PNG":
+            socket = _png_pass_socket(node_tree, pass_key, socket)
+        output.file_slots.new(pass_key.lower())
+        slot = output.file_slots[-1]
+        slot.use_node_format = False
+        _configure_format(slot.format, file_format, _PASS_COLOR_MODES[pass_key])
+        node_tree.links.new(socket, output.inputs[-1])
+
+
+def pass_filepath(filepath: str, pass_key: str) -> str:
+    """Return the file a pass of the image at ``filepath`` is written to."""
+
+    stem, extension = os.path.splitext(filepath)
+    return f"{stem}_{pass_key.lower()}{extension}"
+
+
+def aim_pass_outputs(scene: bpy.types.Scene, filepath: str, passes: Sequence[str], camera: CameraParameters) -> None:
+    """Point the pass outputs at siblings of ``filepath`` and fit depth to the view's clip range."""
+
+    nodes = scene.node_tree.nodes
+    output = nodes[_PASS_NODE_NAME]
+    directory, filename = os.path.split(filepath)
+    stem = os.path.splitext(filename)[0]
+    output.base_path = directory
+    for slot, pass_key in zip(output.file_slots, passes):
+        slot.path = f"{stem}_{pass_key.lower()}_"
+    depth_range = nodes.get(_DEPTH_RANGE_NODE_NAME)
+    if depth_range is not None:
+        depth_range.inputs["From Min"].default_value = camera.clip_start
+        depth_range.inputs["From Max"].default_value = camera.clip_end
+
+
+def collect_pass_files(scene: bpy.types.Scene, filepath: str, passes: Sequence[str]) -> List[str]:
+    """Rename the frame-numbered files the File Output node wrote to their final pass names."""
+
+    stem, extension = os.path.splitext(filepath)
+    # Without '#' in the slot path, Blender appends the frame number padded to four digits.
+    frame = f"{scene.frame_current:04d}"
+    collected = []
+    for pass_key in passes:
+        written = f"{stem}_{pass_key.lower()}_{frame}{extension}"
+        if os.path.exists(written):
+            target = pass_filepath(filepath, pass_key)
+            os.replace(written, target)
+            collected.append(target)
+    return collected
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import math
 import os
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
 
 import bpy
+import numpy as np
 from mathutils import Matrix, Vector
 
 from .bounding_box import Bounds
+from .tiling import TileFrame
 
 _VIEW_DIRECTIONS: Dict[str, Tuple[Vector, Vector, int, Tuple[int, int]]] = {
     "FRONT": (Vector((0.0, -1.0, 0.0)), Vector((0.0, 0.0, 1.0)), 1, (0, 2)),
@@ -20,8 +23,68 @@ _VIEW_DIRECTIONS: Dict[str, Tuple[Vector, Vector, int, Tuple[int, int]]] = {
     "BOTTOM": (Vector((0.0, 0.0, 1.0)), Vector((0.0, 1.0, 0.0)), 2, (0, 1)),
 }
 
-_TEMP_WORLD_BASENAME = "CubeCaptureFlatWorld"
-_TEMP_WORLD_ASSIGNMENTS: Dict[int, str] = {}
+# The capture rig is created on first use and reused afterwards. The leading dot keeps both
+# datablocks out of Blender's ID selectors; they only have users while a capture is running.
+_RIG_CAMERA_NAME = ".CubeCaptureCamera"
+_RIG_WORLD_NAME = ".CubeCaptureFlatWorld"
+_VIEW_LAYER_PASS_FLAGS = ("use_pass_z", "use_pass_normal", "use_pass_object_index", "use_pass_cryptomatte_object")
+_EEVEE_FLAT_FLAGS = ("use_gtao", "use_ssr", "use_screen_space_reflections", "use_soft_shadows")
+_TEMP_NODE_PREFIX = "CubeCapture"
+_TEMP_VIEW_PREFIX = "CubeCapture"
+# Blender's render size limits per axis.
+_MIN_RESOLUTION = 4
+MAX_RESOLUTION = 65536
+_VIEWER_IMAGE_NAME = "Viewer Node"
+
+
+@dataclass(frozen=True)
+class QualityPreset:
+    """Engine and sampling settings of one quality tier, as ``(owner, attribute, value)`` triples.
+
+    Owners are resolved by :func:`_quality_owners`; an ``engine`` of ``None`` keeps the engine
+    chosen by the lighting setup.
+    """
+
+    engine: str | None
+    settings: Tuple[Tuple[str, str, Any], ...]
+
+
+QUALITY_PRESETS: Dict[str, QualityPreset] = {
+    "DRAFT": QualityPreset(
+        engine="BLENDER_WORKBENCH",
+        settings=(
+            ("display", "render_aa", "FXAA"),
+            ("shading", "light", "FLAT"),
+            ("shading", "color_type", "TEXTURE"),
+            ("shading", "show_shadows", False),
+            ("shading", "show_cavity", False),
+            ("render", "filter_size", 1.0),
+            ("render", "use_simplify", True),
+            ("render", "simplify_subdivision_render", 1),
+            ("render", "simplify_child_particles_render", 0.1),
+        ),
+    ),
+    "STANDARD": QualityPreset(
+        engine=None,
+        settings=(
+            ("eevee", "taa_render_samples", 16),
+            ("cycles", "samples", 64),
+            ("render", "filter_size", 1.5),
+        ),
+    ),
+    "FINAL": QualityPreset(
+        engine=None,
+        settings=(
+            ("eevee", "taa_render_samples", 128),
+            ("cycles", "samples", 512),
+            ("render", "filter_size", 1.5),
+        ),
+    ),
+}
+# Every setting a preset may change, so one backup covers switching between tiers.
+_QUALITY_ATTRIBUTES = tuple(
+    dict.fromkeys((owner, attribute) for preset in QUALITY_PRESETS.values() for owner, attribute, _ in preset.settings)
+)
 
 
 @dataclass(frozen=True)
@@ -34,25 +97,124 @@ class RenderSettingsBackup:
     film_transparent: bool
     image_settings: Tuple[str, str, str]
     camera_name: str | None
-    use_nodes: bool
-    background_color: Tuple[float, float, float]
-    background_strength: float
     world_name: str | None
+    use_compositing: bool
+    compositor_use_nodes: bool
+    eevee_flags: Tuple[Tuple[str, bool], ...] = ()
+    quality_settings: Tuple[Tuple[str, str, Any], ...] = ()
+    multiview: Tuple[bool, str, str] = (False, "STEREO_3D", "INDIVIDUAL")
+    render_view_use: Tuple[Tuple[str, bool], ...] = ()
+    view_layer_name: str | None = None
+    view_layer_passes: Tuple[Tuple[str, bool], ...] = ()
+    object_pass_indices: Tuple[Tuple[str, int], ...] = ()
+    layer_collection_excludes: Tuple[Tuple[str, bool], ...] = ()
+    object_hide_render: Tuple[Tuple[str, bool], ...] = ()
+    collection_hide_render: Tuple[Tuple[str, bool], ...] = ()
+    frame_current: int | None = None
 
 
-def backup_scene_settings(scene: bpy.types.Scene) -> RenderSettingsBackup:
-    world = scene.world
-    background_color = (0.0, 0.0, 0.0)
-    background_strength = 1.0
-    use_nodes = False
-    world_name = world.name if world else None
-    if world is not None:
-        use_nodes = world.use_nodes
-        if use_nodes and world.node_tree:
-            background = world.node_tree.nodes.get("Background")
-            if background:
-                background_color = tuple(background.inputs[0].default_value[:3])
-                background_strength = background.inputs[1].default_value
+@dataclass(frozen=True)
+class CameraParameters:
+    """Orthographic camera placement used to render one view."""
+
+    view_key: str
+    matrix_world: Tuple[Tuple[float, ...], ...]
+    ortho_scale: float
+    clip_start: float
+    clip_end: float
+    resolution: Tuple[int, int] | None = None
+
+
+def _iter_layer_collections(layer_collection: bpy.types.LayerCollection) -> Iterator[bpy.types.LayerCollection]:
+    yield layer_collection
+    for child in layer_collection.children:
+        yield from _iter_layer_collections(child)
+
+
+def _isolation_targets(
+    scene: bpy.types.Scene,
+    view_layer: bpy.types.ViewLayer,
+    collection: bpy.types.Collection,
+) -> Tuple[List[bpy.types.LayerCollection], List[bpy.types.Object]]:
+    """Return the layer collections to exclude and loose objects to hide so only ``collection`` renders.
+
+    Sibling branches are excluded at their top-most layer collection. Objects linked directly to
+    the scene collection or to ancestors of ``collection`` cannot be excluded that way and are
+    hidden from rendering instead; cameras are left alone so the capture camera keeps working.
+    """
+
+    if collection == scene.collection:
+        return [], []
+
+    members = set(collection.all_objects)  # type: ignore[attr-defined]
+    excluded: List[bpy.types.LayerCollection] = []
+    loose: List[bpy.types.Object] = list(scene.collection.objects)
+
+    def visit(layer_collection: bpy.types.LayerCollection) -> None:
+        for child in layer_collection.children:
+            child_collection = child.collection
+            if child_collection == collection:
+                continue
+            if collection in child_collection.children_recursive:
+                loose.extend(child_collection.objects)
+                visit(child)
+            elif not child.exclude:
+                excluded.append(child)
+
+    visit(view_layer.layer_collection)
+    hidden = [obj for obj in loose if obj.type != "CAMERA" and obj not in members and not obj.hide_render]
+    return excluded, hidden
+
+
+def isolate_collection_for_render(
+    scene: bpy.types.Scene,
+    view_layer: bpy.types.ViewLayer,
+    collection: bpy.types.Collection,
+) -> None:
+    """Exclude everything outside ``collection`` from ``view_layer`` until the scene is restored.
+
+    Take the backup with ``isolate=collection`` first so the changed states are recorded.
+    """
+
+    excluded, hidden = _isolation_targets(scene, view_layer, collection)
+    for layer_collection in excluded:
+        layer_collection.exclude = True
+    for obj in hidden:
+        obj.hide_render = True
+
+
+def backup_scene_settings(
+    scene: bpy.types.Scene,
+    view_layer: bpy.types.ViewLayer | None = None,
+    isolate: bpy.types.Collection | None = None,
+    indexed: bpy.types.Collection | None = None,
+    hidden: Sequence[bpy.types.Object] = (),
+    hidden_collections: Sequence[bpy.types.Collection] = (),
+) -> RenderSettingsBackup:
+    """Record everything a capture may change.
+
+    ``indexed`` also records its objects' pass indices, and ``hidden`` and ``hidden_collections``
+    the render visibility of objects and collections the capture is about to hide.
+    """
+
+    layer_collection_excludes: Tuple[Tuple[str, bool], ...] = ()
+    object_hide_render: Tuple[Tuple[str, bool], ...] = ()
+    if view_layer is not None and isolate is not None:
+        layer_collection_excludes = tuple(
+            (layer_collection.name, layer_collection.exclude)
+            for layer_collection in _iter_layer_collections(view_layer.layer_collection)
+        )
+        _excluded, outside = _isolation_targets(scene, view_layer, isolate)
+        object_hide_render = tuple((obj.name, obj.hide_render) for obj in outside)
+    object_hide_render += tuple((obj.name, obj.hide_render) for obj in hidden)
+
+    eevee_settings = _get_eevee_settings(scene)
+    eevee_flags: Tuple[Tuple[str, bool], ...] = ()
+    if eevee_settings is not None:
+        eevee_flags = tuple(
+            (flag, getattr(eevee_settings, flag)) for flag in _EEVEE_FLAT_FLAGS if hasattr(eevee_settings, flag)
+        )
+    owners = _quality_owners(scene)
     return RenderSettingsBackup(
         engine=scene.render.engine,
         filepath=scene.render.filepath,
@@ -66,41 +228,140 @@ def backup_scene_settings(scene: bpy.types.Scene) -> RenderSettingsBackup:
             scene.render.image_settings.color_depth,
         ),
         camera_name=scene.camera.name if scene.camera else None,
-        use_nodes=use_nodes,
-        background_color=background_color,
-        background_strength=background_strength,
-        world_name=world_name,
+        world_name=scene.world.name if scene.world else None,
+        use_compositing=scene.render.use_compositing,
+        compositor_use_nodes=scene.use_nodes,
+        eevee_flags=eevee_flags,
+        quality_settings=tuple(
+            (owner, attribute, getattr(owners[owner], attribute))
+            for owner, attribute in _QUALITY_ATTRIBUTES
+            if owner in owners and hasattr(owners[owner], attribute)
+        ),
+        multiview=(
+            scene.render.use_multiview,
+            scene.render.views_format,
+            scene.render.image_settings.views_format,
+        ),
+        render_view_use=tuple(
+            (view.name, view.use) for view in scene.render.views if not view.name.startswith(_TEMP_VIEW_PREFIX)
+        ),
+        view_layer_name=view_layer.name if view_layer is not None else None,
+        view_layer_passes=(
+            tuple((flag, getattr(view_layer, flag)) for flag in _VIEW_LAYER_PASS_FLAGS if hasattr(view_layer, flag))
+            if view_layer is not None
+            else ()
+        ),
+        object_pass_indices=(
+            tuple((obj.name, obj.pass_index) for obj in indexed.all_objects)  # type: ignore[attr-defined]
+            if indexed is not None
+            else ()
+        ),
+        layer_collection_excludes=layer_collection_excludes,
+        object_hide_render=object_hide_render,
+        collection_hide_render=tuple((collection.name, collection.hide_render) for collection in hidden_collections),
+        frame_current=scene.frame_current,
     )
 
 
+def _set_if_changed(owner, attribute: str, value) -> None:
+    # Writing an unchanged RNA value still tags the owner for a depsgraph update.
+    if getattr(owner, attribute) != value:
+        setattr(owner, attribute, value)
+
+
+def _restore_isolation(scene: bpy.types.Scene, backup: RenderSettingsBackup) -> None:
+    view_layer = scene.view_layers.get(backup.view_layer_name) if backup.view_layer_name else None
+    if view_layer is not None and backup.layer_collection_excludes:
+        layer_collections = {
+            layer_collection.name: layer_collection
+            for layer_collection in _iter_layer_collections(view_layer.layer_collection)
+        }
+        # Parents come first, so re-including a branch happens before its children are restored.
+        for name, exclude in backup.layer_collection_excludes:
+            layer_collection = layer_collections.get(name)
+            if layer_collection is not None:
+                _set_if_changed(layer_collection, "exclude", exclude)
+    for name, hide_render in backup.object_hide_render:
+        obj = bpy.data.objects.get(name)
+        if obj is not None:
+            _set_if_changed(obj, "hide_render", hide_render)
+    for name, hide_render in backup.collection_hide_render:
+        collection = bpy.data.collections.get(name)
+        if collection is not None:
+            _set_if_changed(collection, "hide_render", hide_render)
+
+
+def _restore_compositor(scene: bpy.types.Scene, backup: RenderSettingsBackup) -> None:
+    node_tree = scene.node_tree
+    if node_tree is not None:
+        for node in [node for node in node_tree.nodes if node.name.startswith(_TEMP_NODE_PREFIX)]:
+            node_tree.nodes.remove(node)
+    _set_if_changed(scene, "use_nodes", backup.compositor_use_nodes)
+    _set_if_changed(scene.render, "use_compositing", backup.use_compositing)
+
+
+def _restore_passes(scene: bpy.types.Scene, backup: RenderSettingsBackup) -> None:
+    view_layer = scene.view_layers.get(backup.view_layer_name) if backup.view_layer_name else None
+    if view_layer is not None:
+        for flag, value in backup.view_layer_passes:
+            _set_if_changed(view_layer, flag, value)
+    for name, pass_index in backup.object_pass_indices:
+        obj = bpy.data.objects.get(name)
+        if obj is not None:
+            _set_if_changed(obj, "pass_index", pass_index)
+
+
+def _restore_multiview(scene: bpy.types.Scene, backup: RenderSettingsBackup) -> None:
+    render = scene.render
+    for name, use in backup.render_view_use:
+        view = render.views.get(name)
+        if view is not None:
+            _set_if_changed(view, "use", use)
+    for view in [view for view in render.views if view.name.startswith(_TEMP_VIEW_PREFIX)]:
+        render.views.remove(view)
+    use_multiview, views_format, image_views_format = backup.multiview
+    _set_if_changed(render.image_settings, "views_format", image_views_format)
+    _set_if_changed(render, "views_format", views_format)
+    _set_if_changed(render, "use_multiview", use_multiview)
+
+
 def restore_scene_settings(scene: bpy.types.Scene, backup: RenderSettingsBackup) -> None:
-    scene.render.engine = backup.engine
-    scene.render.filepath = backup.filepath
-    scene.render.resolution_x = backup.resolution_x
-    scene.render.resolution_y = backup.resolution_y
-    scene.render.resolution_percentage = backup.resolution_percentage
-    scene.render.film_transparent = backup.film_transparent
-    scene.render.image_settings.file_format = backup.image_settings[0]
-    scene.render.image_settings.color_mode = backup.image_settings[1]
-    scene.render.image_settings.color_depth = backup.image_settings[2]
-    if backup.camera_name and backup.camera_name in bpy.data.objects:
-        scene.camera = bpy.data.objects[backup.camera_name]
-    original_world = bpy.data.worlds.get(backup.world_name) if backup.world_name else None
-    scene.world = original_world
-    scene_key = scene.as_pointer()
-    temp_world_name = _TEMP_WORLD_ASSIGNMENTS.pop(scene_key, None)
-    world = scene.world
-    if world and world.use_nodes and world.node_tree:
-        background = world.node_tree.nodes.get("Background")
-        if background:
-            background.inputs[0].default_value = (*backup.background_color, 1.0)
-            background.inputs[1].default_value = backup.background_strength
-    elif world and not backup.use_nodes:
-        world.use_nodes = False
-    if temp_world_name:
-        temp_world = bpy.data.worlds.get(temp_world_name)
-        if temp_world and temp_world.users == 0:
-            bpy.data.worlds.remove(temp_world, do_unlink=True)
+    """Put back every setting a capture changed, leaving the capture rig in place for reuse."""
+
+    render = scene.render
+    _set_if_changed(render, "engine", backup.engine)
+    _set_if_changed(render, "filepath", backup.filepath)
+    _set_if_changed(render, "resolution_x", backup.resolution_x)
+    _set_if_changed(render, "resolution_y", backup.resolution_y)
+    _set_if_changed(render, "resolution_percentage", backup.resolution_percentage)
+    _set_if_changed(render, "film_transparent", backup.film_transparent)
+    image_settings = render.image_settings
+    _set_if_changed(image_settings, "file_format", backup.image_settings[0])
+    _set_if_changed(image_settings, "color_mode", backup.image_settings[1])
+    _set_if_changed(image_settings, "color_depth", backup.image_settings[2])
+    eevee_settings = _get_eevee_settings(scene)
+    if eevee_settings is not None:
+        for flag, value in backup.eevee_flags:
+            _set_if_changed(eevee_settings, flag, value)
+    owners = _quality_owners(scene)
+    for owner, attribute, value in backup.quality_settings:
+        if owner in owners:
+            _set_if_changed(owners[owner], attribute, value)
+
+    camera = bpy.data.objects.get(backup.camera_name) if backup.camera_name else None
+    if scene.camera != camera:
+        scene.camera = camera
+    world = bpy.data.worlds.get(backup.world_name) if backup.world_name else None
+    if scene.world != world:
+        scene.world = world
+    release_capture_camera(scene)
+    _restore_isolation(scene, backup)
+    _restore_compositor(scene, backup)
+    _restore_multiview(scene, backup)
+    _restore_passes(scene, backup)
+    # Last, so the scene is re-evaluated once with everything else already restored.
+    if backup.frame_current is not None and scene.frame_current != backup.frame_current:
+        scene.frame_set(backup.frame_current)
 
 
 def _select_eevee_engine() -> str | None:
@@ -129,26 +390,66 @@ def ensure_flat_lighting(scene: bpy.types.Scene) -> None:
 
     eevee_settings = _get_eevee_settings(scene)
     if eevee_settings is not None:
-        eevee_settings.use_gtao = False
-        if hasattr(eevee_settings, "use_ssr"):
-            eevee_settings.use_ssr = False
-        if hasattr(eevee_settings, "use_screen_space_reflections"):
-            eevee_settings.use_screen_space_reflections = False
-        if hasattr(eevee_settings, "use_soft_shadows"):
-            eevee_settings.use_soft_shadows = False
-
-    temp_world = bpy.data.worlds.new(_TEMP_WORLD_BASENAME)
-    temp_world.use_nodes = True
-    node_tree = temp_world.node_tree
+        for flag in _EEVEE_FLAT_FLAGS:
+            if hasattr(eevee_settings, flag):
+                _set_if_changed(eevee_settings, flag, False)
+
+    world = _flat_world()
+    if scene.world != world:
+        scene.world = world
+
+
+def _quality_owners(scene: bpy.types.Scene) -> Dict[str, Any]:
+    owners = {"render": scene.render, "display": scene.display, "shading": scene.display.shading}
+    eevee_settings = _get_eevee_settings(scene)
+    if eevee_settings is not None:
+        owners["eevee"] = eevee_settings
+    # Only present while the Cycles add-on is enabled.
+    cycles_settings = getattr(scene, "cycles", None)
+    if cycles_settings is not None:
+        owners["cycles"] = cycles_settings
+    return owners
+
+
+def apply_quality(scene: bpy.types.Scene, quality: str) -> None:
+    """Apply the engine and sampling settings of a :data:`QUALITY_PRESETS` tier."""
+
+    preset = QUALITY_PRESETS[quality]
+    if preset.engine is not None:
+        _set_if_changed(scene.render, "engine", preset.engine)
+        _set_if_changed(scene.render, "film_transparent", True)
+    owners = _quality_owners(scene)
+    for owner, attribute, value in preset.settings:
+        if owner in owners and hasattr(owners[owner], attribute):
+            _set_if_changed(owners[owner], attribute, value)
+
+
+def _flat_world() -> bpy.types.World:
+    """Return the shared flat-white capture world, (re)building it if missing or edited."""
+
+    world = bpy.data.worlds.get(_RIG_WORLD_NAME)
+    if world is None:
+        world = bpy.data.worlds.new(_RIG_WORLD_NAME)
+    node_tree = world.node_tree if world.use_nodes else None
+    background = node_tree.nodes.get("Background") if node_tree is not None else None
+    if (
+        background is not None
+        and tuple(background.inputs[0].default_value) == (1.0, 1.0, 1.0, 1.0)
+        and background.inputs[1].default_value == 1.0
+        and background.outputs[0].is_linked
+    ):
+        return world
+
+    world.use_nodes = True
+    node_tree = world.node_tree
     node_tree.nodes.clear()
     background = node_tree.nodes.new(type="ShaderNodeBackground")
+    background.name = "Background"
     background.inputs[0].default_value = (1.0, 1.0, 1.0, 1.0)
     background.inputs[1].default_value = 1.0
     output = node_tree.nodes.new(type="ShaderNodeOutputWorld")
     node_tree.links.new(background.outputs[0], output.inputs[0])
-
-    scene.world = temp_world
-    _TEMP_WORLD_ASSIGNMENTS[scene.as_pointer()] = temp_world.name
+    return world
 
 
 def _orthographic_camera_matrix(location: Vector, direction: Vector, up: Vector) -> Matrix:
@@ -161,12 +462,119 @@ def _orthographic_camera_matrix(location: Vector, direction: Vector, up: Vector)
     return Matrix.Translation(location) @ rotation.to_4x4()
 
 
-def create_temporary_camera(scene: bpy.types.Scene) -> bpy.types.Object:
-    camera_data = bpy.data.cameras.new("CubeCaptureTempCamera")
-    camera_data.type = "ORTHO"
-    camera_obj = bpy.data.objects.new(camera_data.name, camera_data)
-    scene.collection.objects.link(camera_obj)
-    return camera_obj
+def view_axes(view_key: str) -> np.ndarray:
+    """Return the world-space image right, image up and outward face normal of ``view_key`` as rows."""
+
+    direction, up, _depth_axis, _plane_axes = _VIEW_DIRECTIONS[view_key]
+    rotation = _orthographic_camera_matrix(Vector((0.0, 0.0, 0.0)), direction, up).to_3x3()
+    # The camera looks along ``direction``, so the box face it sees points the other way.
+    return np.array((rotation.col[0], rotation.col[1], -direction.normalized()), dtype=np.float32)
+
+
+def acquire_capture_camera(scene: bpy.types.Scene, suffix: str = "") -> bpy.types.Object:
+    """Return a shared orthographic capture camera, linked into ``scene`` for rendering.
+
+    The camera is created on first use and kept between captures; :func:`restore_scene_settings`
+    unlinks it again so it never shows up in the user's outliner. ``suffix`` selects one of the
+    per-view cameras used by :func:`enable_multiview_atlas`.
+    """
+
+    name = f"{_RIG_CAMERA_NAME}{suffix}"
+    camera = bpy.data.objects.get(name)
+    if camera is None or camera.type != "CAMERA":
+        camera_data = bpy.data.cameras.get(name) or bpy.data.cameras.new(name)
+        if camera is not None:
+            bpy.data.objects.remove(camera, do_unlink=True)
+        camera = bpy.data.objects.new(name, camera_data)
+    camera.data.type = "ORTHO"
+    if camera.name not in scene.collection.objects:
+        scene.collection.objects.link(camera)
+    return camera
+
+
+def release_capture_camera(scene: bpy.types.Scene) -> None:
+    objects = scene.collection.objects
+    for camera in [obj for obj in objects if obj.name.startswith(_RIG_CAMERA_NAME)]:
+        objects.unlink(camera)
+
+
+def atlas_view_suffix(view_key: str) -> str:
+    """Return the multiview camera and file suffix for ``view_key``, e.g. ``"_front"``."""
+
+    return f"_{view_key.lower()}"
+
+
+def enable_multiview_atlas(scene: bpy.types.Scene, view_keys: Sequence[str]) -> bpy.types.Object:
+    """Render ``view_keys`` in one job through Blender's multiview, writing one file per view.
+
+    Each view renders through the rig camera carrying its :func:`atlas_view_suffix`, and Blender
+    inserts the same suffix before the extension of ``render.filepath``. Aim those cameras first;
+    the returned camera becomes the scene camera.
+    """
+
+    render = scene.render
+    render.use_multiview = True
+    render.views_format = "MULTIVIEW"
+    render.image_settings.views_format = "INDIVIDUAL"
+    enabled = set()
+    for view_key in view_keys:
+        name = f"{_TEMP_VIEW_PREFIX}{view_key.title()}"
+        view = render.views.get(name) or render.views.new(name)
+        view.camera_suffix = atlas_view_suffix(view_key)
+        view.use = True
+        enabled.add(name)
+    # Disable other views only after ours are on; Blender expects at least one active view.
+    for view in render.views:
+        if view.name not in enabled:
+            _set_if_changed(view, "use", False)
+    camera = bpy.data.objects[f"{_RIG_CAMERA_NAME}{atlas_view_suffix(view_keys[0])}"]
+    scene.camera = camera
+    return camera
+
+
+def _view_extent(bounds: Bounds, view_key: str, padding: float) -> Tuple[float, float]:
+    """Return the padded world-space width and height of ``bounds`` as seen from ``view_key``."""
+
+    _direction, _up, _depth_axis, plane_axes = _VIEW_DIRECTIONS[view_key]
+    size = bounds.size
+    width = max(size[plane_axes[0]], 0.01)
+    height = max(size[plane_axes[1]], 0.01)
+    margin = max(width, height) * padding
+    return width + 2.0 * margin, height + 2.0 * margin
+
+
+def density_resolution(
+    bounds: Bounds,
+    view_key: str,
+    padding: float,
+    pixels_per_unit: float,
+) -> Tuple[Tuple[int, int], float]:
+    """Return the render size that frames ``view_key`` tightly at ``pixels_per_unit``.
+
+    The density is lowered when the view would exceed ``MAX_RESOLUTION``; the density actually
+    used is returned alongside the resolution.
+    """
+
+    width, height = _view_extent(bounds, view_key, padding)
+    density = min(pixels_per_unit, MAX_RESOLUTION / max(width, height))
+    resolution = (
+        max(math.ceil(width * density), _MIN_RESOLUTION),
+        max(math.ceil(height * density), _MIN_RESOLUTION),
+    )
+    return resolution, density
+
+
+def fit_ortho_scale(bounds: Bounds, view_key: str, padding: float) -> float:
+    """Return the square orthographic scale framing ``bounds`` from ``view_key``."""
+
+    return max(_view_extent(bounds, view_key, padding))
+
+
+def cube_ortho_scale(bounds: Bounds, padding: float) -> float:
+    """Return one orthographic scale framing ``bounds`` from every side, so the views form a cube."""
+
+    size = bounds.size
+    return max(size.x, size.y, size.z, 0.01) * (1.0 + padding * 2.0)
 
 
 def configure_camera_for_view(
@@ -174,8 +582,15 @@ def configure_camera_for_view(
     bounds: Bounds,
     view_key: str,
     padding: float,
-) -> None:
-    direction, up, depth_axis, plane_axes = _VIEW_DIRECTIONS[view_key]
+    ortho_scale: float | None = None,
+) -> CameraParameters:
+    """Aim ``camera`` at ``bounds`` from ``view_key``.
+
+    ``ortho_scale`` overrides the square framing, e.g. with the scale matching a resolution from
+    :func:`density_resolution`.
+    """
+
+    direction, up, depth_axis, _plane_axes = _VIEW_DIRECTIONS[view_key]
     size = bounds.size
     center = bounds.center
     max_dimension = max(size.x, size.y, size.z, 1.0)
@@ -186,9 +601,8 @@ def configure_camera_for_view(
     if distance < 0.5:
         distance = 0.5 + padding_distance
 
-    plane_width = size[plane_axes[0]]
-    plane_height = size[plane_axes[1]]
-    ortho_scale = max(plane_width, plane_height, 0.01) * (1.0 + padding * 2.0)
+    if ortho_scale is None:
+        ortho_scale = fit_ortho_scale(bounds, view_key, padding)
 
     location = center - direction.normalized() * distance
     camera.matrix_world = _orthographic_camera_matrix(location, direction, up)
@@ -196,8 +610,82 @@ def configure_camera_for_view(
     camera_data = camera.data
     camera_data.type = "ORTHO"
     camera_data.ortho_scale = ortho_scale
+    camera_data.shift_x = 0.0
+    camera_data.shift_y = 0.0
     camera_data.clip_start = max(distance * 0.1, 0.1)
     camera_data.clip_end = distance + max_dimension * 4.0 + padding_distance
+    return CameraParameters(
+        view_key=view_key,
+        matrix_world=tuple(tuple(row) for row in camera.matrix_world),
+        ortho_scale=camera_data.ortho_scale,
+        clip_start=camera_data.clip_start,
+        clip_end=camera_data.clip_end,
+    )
+
+
+def configure_camera_for_tile(scene: bpy.types.Scene, camera: bpy.types.Object, frame: TileFrame) -> None:
+    """Narrow the view set up by :func:`configure_camera_for_view` to a single tile."""
+
+    camera_data = camera.data
+    camera_data.ortho_scale = frame.ortho_scale
+    camera_data.shift_x = frame.shift_x
+    camera_data.shift_y = frame.shift_y
+    apply_render_resolution(scene, *frame.resolution)
+
+
+def render_layers_node(scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer) -> bpy.types.Node:
+    """Enable compositing and return the temporary Render Layers node shared by all capture nodes."""
+
+    scene.render.use_compositing = True
+    scene.use_nodes = True
+    node_tree = scene.node_tree
+    render_layers = node_tree.nodes.get(f"{_TEMP_NODE_PREFIX}RenderLayers")
+    if render_layers is None:
+        render_layers = node_tree.nodes.new(type="CompositorNodeRLayers")
+        render_layers.name = f"{_TEMP_NODE_PREFIX}RenderLayers"
+    render_layers.scene = scene
+    render_layers.layer = view_layer.name
+    return render_layers
+
+
+def enable_render_readback(scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer) -> None:
+    """Route the render result through a temporary Viewer node so :func:`read_render_pixels` works.
+
+    Blender keeps the "Render Result" image pixels out of Python's reach, while the Viewer image
+    is a regular float buffer. The nodes are removed by :func:`restore_scene_settings`.
+    """
+
+    render_layers = render_layers_node(scene, view_layer)
+    node_tree = scene.node_tree
+    viewer = node_tree.nodes.new(type="CompositorNodeViewer")
+    viewer.name = f"{_TEMP_NODE_PREFIX}Viewer"
+    node_tree.links.new(render_layers.outputs["Image"], viewer.inputs[0])
+    node_tree.nodes.active = viewer
+
+
+def read_render_pixels() -> np.ndarray:
+    """Return the last render as a bottom-up ``(H, W, 4)`` premultiplied linear float array."""
+
+    image = bpy.data.images.get(_VIEWER_IMAGE_NAME)
+    if image is None:
+        raise RuntimeError("No render readback available; call enable_render_readback() first.")
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+
+def load_image_pixels(filepath: str) -> np.ndarray:
+    """Load an image file as top-down ``(H, W, 4)`` float32 pixels, exactly as stored in the file."""
+
+    image = bpy.data.images.load(filepath, check_existing=False)
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return pixels.reshape(height, width, 4)[::-1]
 
 
 def prepare_output_path(base_directory: str, filename: str) -> str:
@@ -0,0 +1,174 @@
+"""Separable, alpha-aware downsampling for the output pyramid.
+
+Pixels are premultiplied ``(H, W, C)`` floats, so transparent texels never bleed their colour
+into visible ones. Each axis is filtered by gathering a fixed number of source rows (or columns)
+per output one, so the cost grows with the filter width and the output size, not with a dense
+weight matrix.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Tuple
+
+import numpy as np
+
+RESAMPLE_FILTERS = ("BOX", "LANCZOS")
+# Lobes of the Lanczos window.
+_LANCZOS_LOBES = 3
+# Lanczos runs on at least this much reduction after the cheap integer box pre-pass.
+_REDUCING_GAP = 2
+
+
+def level_shape(height: int, width: int, size: int) -> Tuple[int, int]:
+    """Return the ``(height, width)`` whose longer side is ``size``, keeping the aspect ratio."""
+
+    scale = size / max(height, width)
+    return max(int(round(height * scale)), 1), max(int(round(width * scale)), 1)
+
+
+def _filter_taps(source: int, target: int, resample_filter: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(indices, weights)``, each ``(target, taps)``, mapping ``source`` samples to ``target``."""
+
+    scale = source / target
+    centers = (np.arange(target, dtype=np.float64) + 0.5) * scale - 0.5
+    support = scale * 0.5 if resample_filter == "BOX" else _LANCZOS_LOBES * max(scale, 1.0)
+    taps = int(math.ceil(support * 2.0)) + 2
+    positions = np.floor(centers - support)[:, None] + np.arange(taps)[None, :]
+    if resample_filter == "BOX":
+        # Exact overlap of each source pixel with the output pixel's footprint.
+        weights = np.minimum(positions + 0.5, centers[:, None] + support) - np.maximum(
+            positions - 0.5, centers[:, None] - support
+        )
+        weights = np.clip(weights, 0.0, None)
+    elif resample_filter == "LANCZOS":
+        distance = (positions - centers[:, None]) / max(scale, 1.0)
+        weights = np.sinc(distance) * np.sinc(distance / _LANCZOS_LOBES)
+        weights[np.abs(distance) >= _LANCZOS_LOBES] = 0.0
+    else:
+        raise ValueError(f"Unsupported resample filter {resample_filter!r}.")
+    weights /= weights.sum(axis=1, keepdims=True)
+    # Edge pixels repeat past the border.
+    indices = np.clip(positions, 0, source - 1).astype(np.intp)
+    return indices, weights.astype(np.float32)
+
+
+def _resample_axis(pixels: np.ndarray, axis: int, target: int, resample_filter: str) -> np.ndarray:
+    source = pixels.shape[axis]
+    if source == target:
+        return pixels
+    indices, weights = _filter_taps(source, target, resample_filter)
+    return np.moveaxis(_apply_taps(np.moveaxis(pixels, axis, 0), indices, weights), 0, axis)
+
+
+def _apply_taps(samples: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weight and sum the leading-axis ``samples`` that each output one gathers."""
+
+    broadcast = (-1,) + (1,) * (samples.ndim - 1)
+    output = np.zeros((indices.shape[0],) + samples.shape[1:], dtype=np.float32)
+    for tap in range(indices.shape[1]):
+        output += weights[:, tap].reshape(broadcast) * samples[indices[:, tap]]
+    return output
+
+
+def _box_reduce(pixels: np.ndarray, factor: int) -> np.ndarray:
+    """Average ``factor`` x ``factor`` blocks, repeating edge pixels to fill the last partial block."""
+
+    height, width = pixels.shape[:2]
+    pad_y = -height % factor
+    pad_x = -width % factor
+    if pad_y or pad_x:
+        pixels = np.pad(pixels, ((0, pad_y), (0, pad_x), (0, 0)), mode="edge")
+    # Strided adds stay contiguous in memory, unlike a mean over a reshaped block axis.
+    rows = pixels[0::factor].astype(np.float32)
+    for offset in range(1, factor):
+        rows += pixels[offset::factor]
+    output = rows[:, 0::factor].copy()
+    for offset in range(1, factor):
+        output += rows[:, offset::factor]
+    output *= 1.0 / (factor * factor)
+    return output
+
+
+def downsample(pixels: np.ndarray, size: int, resample_filter: str = "LANCZOS") -> np.ndarray:
+    """Shrink premultiplied ``(H, W, C)`` pixels so the longer side is ``size``.
+
+    Whole-number box reductions are plain block averages. Large Lanczos reductions first
+    average blocks down to :data:`_REDUCING_GAP` times the target, which is far cheaper than
+    wide filter kernels and visually identical. Lanczos overshoot is clipped so alpha stays in
+    ``[0, 1]`` and colour never goes negative.
+    """
+
+    height, width = level_shape(pixels.shape[0], pixels.shape[1], size)
+    factor = _block_factor(pixels.shape[0], pixels.shape[1], height, width, resample_filter)
+    if factor > 1:
+        pixels = _box_reduce(pixels, factor)
+    if pixels.shape[:2] == (height, width):
+        return pixels
+    # Filter the axis that shrinks most first, so the second pass touches the fewest pixels.
+    if pixels.shape[0] / height >= pixels.shape[1] / width:
+        output = _resample_axis(_resample_axis(pixels, 0, height, resample_filter), 1, width, resample_filter)
+    else:
+        output = _resample_axis(_resample_axis(pixels, 1, width, resample_filter), 0, height, resample_filter)
+    _clip_overshoot(output, resample_filter)
+    return output
+
+
+def _block_factor(height: int, width: int, target_height: int, target_width: int, resample_filter: str) -> int:
+    """Return the block size averaged before filtering: the whole box reduction, or Lanczos headroom."""
+
+    scale = min(height / target_height, width / target_width)
+    if resample_filter == "BOX":
+        factor = int(round(scale))
+        if factor > 1 and (height, width) == (target_height * factor, target_width * factor):
+            return factor
+    elif resample_filter == "LANCZOS" and scale >= 2 * _REDUCING_GAP:
+        return int(scale // _REDUCING_GAP)
+    return 1
+
+
+def _clip_overshoot(pixels: np.ndarray, resample_filter: str) -> None:
+    if resample_filter == "LANCZOS" and pixels.shape[-1] == 4:
+        np.clip(pixels[..., 3], 0.0, 1.0, out=pixels[..., 3])
+        np.clip(pixels[..., :3], 0.0, None, out=pixels[..., :3])
+
+
+def downsample_rows(
+    read_rows: Callable[[int, int], np.ndarray],
+    height: int,
+    width: int,
+    size: int,
+    resample_filter: str = "LANCZOS",
+    band_pixels: int = 1 << 22,
+) -> np.ndarray:
+    """Like :func:`downsample`, for a ``height`` x ``width`` image too large to hold in memory.
+
+    ``read_rows(start, stop)`` returns premultiplied float32 rows ``start:stop``. Output rows are
+    filtered a band at a time from just the source rows their taps reach, so only about
+    ``band_pixels`` source pixels and the output are resident, whatever the reduction.
+    """
+
+    target_height, target_width = level_shape(height, width, size)
+    factor = _block_factor(height, width, target_height, target_width, resample_filter)
+    # Rows and columns left after the block average, which bands can apply independently.
+    source_height = -(-height // factor)
+    if source_height == target_height:
+        indices = np.arange(target_height)[:, None]
+        weights = np.ones((target_height, 1), dtype=np.float32)
+    else:
+        indices, weights = _filter_taps(source_height, target_height, resample_filter)
+    output_rows = max(band_pixels * target_height // (height * width), 1)
+    output = None
+    for start in range(0, target_height, output_rows):
+        stop = min(start + output_rows, target_height)
+        first, last = int(indices[start:stop].min()), int(indices[start:stop].max()) + 1
+        rows = read_rows(first * factor, min(last * factor, height))
+        if factor > 1:
+            rows = _box_reduce(rows, factor)
+        band = _apply_taps(rows, indices[start:stop] - first, weights[start:stop])
+        band = _resample_axis(band, 1, target_width, resample_filter)
+        _clip_overshoot(band, resample_filter)
+        if output is None:
+            output = np.empty((target_height, target_width) + band.shape[2:], dtype=np.float32)
+        output[start:stop] = band
+    return output
@@ -0,0 +1,95 @@
+"""Screen-size culling and subdivision limits derived from a capture's pixel density.
+
+An orthographic view has one pixel density over the whole frame, so the world-space size of an
+object gives its footprint in pixels directly, before anything is rendered. Objects whose
+footprint stays below the threshold are hidden from rendering, and subdivision is capped at the
+level where faces shrink to about a pixel. Both are recorded by ``backup_scene_settings`` and
+undone by ``restore_scene_settings``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import bpy
+import numpy as np
+
+from .render_setup import _set_if_changed
+
+# Highest level the Simplify panel offers for subdivision surfaces.
+_MAX_SUBDIVISION = 6
+
+
+def pixel_footprints(aabbs: np.ndarray, density: float) -> np.ndarray:
+    """Return the largest projected size in pixels of each ``(N, 2, 3)`` box at ``density``.
+
+    The longest side of an axis-aligned box is the widest it appears from any of the six views.
+    """
+
+    return (aabbs[:, 1] - aabbs[:, 0]).max(axis=1) * density
+
+
+def _may_cull(obj: bpy.types.Object) -> bool:
+    # Hiding an instancer also hides everything it instances, however large that is.
+    if obj.instance_type != "NONE" or len(obj.particle_systems):
+        return False
+    return not any(modifier.type == "NODES" for modifier in obj.modifiers)
+
+
+def subpixel_objects(
+    objects: Sequence[bpy.types.Object],
+    uids: np.ndarray,
+    footprints: np.ndarray,
+    threshold: float,
+) -> List[bpy.types.Object]:
+    """Return the objects whose footprint is below ``threshold`` pixels in every view."""
+
+    small = set(uids[footprints < threshold].tolist())
+    culled = [obj for obj in objects if obj.session_uid in small and _may_cull(obj)]
+    # A collection made only of tiny parts is still the subject of the capture.
+    return culled if len(culled) < len(objects) else []
+
+
+def subdivision_level(
+    objects: Sequence[bpy.types.Object],
+    uids: np.ndarray,
+    footprints: np.ndarray,
+) -> Optional[int]:
+    """Return the subdivision level at which every subdivided object's faces reach about a pixel.
+
+    Returns ``None`` when no object uses a Subdivision Surface modifier for rendering.
+    """
+
+    footprint_of = dict(zip(uids.tolist(), footprints.tolist()))
+    level: Optional[int] = None
+    for obj in objects:
+        if obj.type != "MESH" or not any(
+            modifier.type == "SUBSURF" and modifier.show_render for modifier in obj.modifiers
+        ):
+            continue
+        # A closed surface spanning ``L`` has roughly ``6 L^2`` of area to share between its base faces.
+        face_pixels = footprint_of.get(obj.session_uid, 0.0) * math.sqrt(6.0 / max(len(obj.data.polygons), 1))
+        # Each level halves the face size.
+        needed = min(math.ceil(math.log2(face_pixels)), _MAX_SUBDIVISION) if face_pixels > 1.0 else 0
+        level = needed if level is None else max(level, needed)
+    return level
+
+
+def apply_subdivision_limit(scene: bpy.types.Scene, level: Optional[int], base: Tuple[bool, int]) -> None:
+    """Cap render subdivision at ``level``, keeping a lower limit the scene or quality tier already set.
+
+    ``base`` is ``(use_simplify, simplify_subdivision_render)`` before any limit was applied, so a
+    batch capture can move the cap between collections; a ``level`` of ``None`` restores it.
+    """
+
+    render = scene.render
+    use_simplify, base_level = base
+    if level is None:
+        _set_if_changed(render, "use_simplify", use_simplify)
+        _set_if_changed(render, "simplify_subdivision_render", base_level)
+        return
+    if use_simplify:
+        level = min(level, base_level)
+    _set_if_changed(render, "use_simplify", True)
+    _set_if_changed(render, "simplify_subdivision_render", level)
@@ -0,0 +1,128 @@
+"""Tile layout and disk-backed stitching for views too large to render in one piece.
+
+Tiles are rendered by shifting and narrowing the orthographic frame of a view, so every tile
+maps onto an exact pixel rectangle of the full image and can be streamed into a memory-mapped
+buffer.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from .image_io import write_atomically, write_pixels
+
+# Extra pixels rendered around each tile and cropped away, so the pixel filter and
+# screen-space effects see real neighbours at tile borders instead of the frame edge.
+TILE_MARGIN = 8
+
+
+@dataclass(frozen=True)
+class Tile:
+    """Pixel rectangle of the full image, with ``y`` counted from the bottom like Blender."""
+
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class TileFrame:
+    """Orthographic camera settings and render size that reproduce one tile."""
+
+    ortho_scale: float
+    shift_x: float
+    shift_y: float
+    resolution: Tuple[int, int]
+
+
+def tile_layout(width: int, height: int, tile_size: int) -> Tuple[Tile, ...]:
+    """Split a ``width`` x ``height`` image into near-equal tiles no larger than ``tile_size``."""
+
+    columns = max(math.ceil(width / tile_size), 1)
+    rows = max(math.ceil(height / tile_size), 1)
+    xs = np.linspace(0, width, columns + 1).round().astype(int)
+    ys = np.linspace(0, height, rows + 1).round().astype(int)
+    return tuple(
+        Tile(int(xs[column]), int(ys[row]), int(xs[column + 1] - xs[column]), int(ys[row + 1] - ys[row]))
+        for row in range(rows)
+        for column in range(columns)
+    )
+
+
+def tile_frame(ortho_scale: float, resolution: Tuple[int, int], tile: Tile, margin: int = TILE_MARGIN) -> TileFrame:
+    """Return the camera frame rendering ``tile`` plus ``margin`` of a view framed by ``ortho_scale``.
+
+    Blender fits ``ortho_scale`` and the shift values to the larger render dimension, so keeping
+    ``ortho_scale / max(width, height)`` constant keeps the world size of a pixel unchanged.
+    """
+
+    width, height = resolution
+    render_width = tile.width + 2 * margin
+    render_height = tile.height + 2 * margin
+    tile_extent = max(render_width, render_height)
+    center_x = tile.x + tile.width * 0.5 - width * 0.5
+    center_y = tile.y + tile.height * 0.5 - height * 0.5
+    return TileFrame(
+        ortho_scale=ortho_scale * tile_extent / max(width, height),
+        shift_x=center_x / tile_extent,
+        shift_y=center_y / tile_extent,
+        resolution=(render_width, render_height),
+    )
+
+
+def crop_tile(pixels: np.ndarray, tile: Tile, margin: int = TILE_MARGIN) -> np.ndarray:
+    """Crop the margin from bottom-up render pixels of ``tile``."""
+
+    return pixels[margin : margin + tile.height, margin : margin + tile.width]
+
+
+class TiledImageBuffer:
+    """Top-down ``(H, W, C)`` image backed by a temporary memory-mapped file.
+
+    Only the tile being pasted and the rows being encoded are resident, so peak memory is
+    bounded by the tile size rather than the final resolution.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        dtype: np.dtype,
+        channels: int = 4,
+        directory: str | None = None,
+    ) -> None:
+        # The buffer is allocated before the first output path creates the output directory.
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle, self.path = tempfile.mkstemp(prefix=".cube_capture_", suffix=".tiles", dir=directory)
+        os.close(handle)
+        self.pixels: np.memmap | None = np.memmap(self.path, dtype=dtype, mode="w+", shape=(height, width, channels))
+
+    def paste(self, tile: Tile, pixels: np.ndarray) -> None:
+        """Store top-down ``pixels`` for ``tile``."""
+
+        top = self.pixels.shape[0] - tile.y - tile.height
+        self.pixels[top : top + tile.height, tile.x : tile.x + tile.width] = pixels
+
+    def save(self, path: str, file_format: str) -> None:
+        """Write the stitched image to ``path`` and release the buffer."""
+
+        try:
+            self.pixels.flush()
+            write_atomically(path, write_pixels, self.pixels, file_format)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.pixels = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass